@@ -0,0 +1,420 @@
+import time
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Any, Tuple
+from loguru import logger
+from retry_policy import get_circuit_breaker
+
+# Gecikmeler mikrosaniye tam sayı olarak saklanır
+LOWEST_TRACKABLE_US = 1
+HIGHEST_TRACKABLE_US = 120_000_000  # 120 saniye; üstü bu değere sıkıştırılır
+SIGNIFICANT_DIGITS = 2  # Yaklaşık %1 göreli hassasiyet
+SLOW_CALL_THRESHOLD = 2.0  # Bu süreyi aşan çağrılar uyarı olarak loglanır (saniye)
+RATE_WINDOW_SECONDS = 60  # İstek hızı halka tamponunun uzunluğu
+
+class LatencyHistogram:
+    """
+    Sabit bellekli HDR tarzı gecikme histogramı
+
+    Değer aralığı 2'nin kuvvetlerine göre kovalara, her kova da eşit
+    genişlikte alt kovalara bölünür; böylece her değer SIGNIFICANT_DIGITS
+    basamak göreli hassasiyetle tek bir sayaçta tutulur. Sayaç dizisinin
+    boyutu kayıt sayısından bağımsızdır (120 saniyeye kadar ~2700 sayaç).
+    """
+
+    def __init__(self, highest_us: int = HIGHEST_TRACKABLE_US, significant_digits: int = SIGNIFICANT_DIGITS):
+        """
+        Args:
+            highest_us: Takip edilen en büyük değer (mikrosaniye)
+            significant_digits: Korunan anlamlı basamak sayısı (1-3)
+        """
+        largest_single_unit = 2 * 10 ** significant_digits
+        self._sub_bucket_count = 1 << (largest_single_unit - 1).bit_length()
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_half_magnitude = self._sub_bucket_half_count.bit_length() - 1
+        self._sub_bucket_mask = self._sub_bucket_count - 1
+        self.highest_us = highest_us
+
+        # En büyük değeri kapsayan kova sayısı
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count
+        while smallest_untrackable <= highest_us:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self._counts = [0] * ((bucket_count + 1) * self._sub_bucket_half_count)
+
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        bucket_index = (value | self._sub_bucket_mask).bit_length() - (self._sub_bucket_half_magnitude + 1)
+        sub_bucket_index = value >> bucket_index
+        return ((bucket_index + 1) << self._sub_bucket_half_magnitude) + sub_bucket_index - self._sub_bucket_half_count
+
+    def _value_range(self, index: int) -> Tuple[int, int]:
+        """
+        Sayaç indeksinin kapsadığı [alt, üst] değer aralığını döndürür
+        """
+        bucket_index = (index >> self._sub_bucket_half_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        low = sub_bucket_index << bucket_index
+        return low, low + (1 << bucket_index) - 1
+
+    def record(self, seconds: float):
+        """
+        Süreyi histograma ekler
+
+        Args:
+            seconds: Ölçülen süre (saniye)
+        """
+        value = min(max(int(seconds * 1e6), LOWEST_TRACKABLE_US), self.highest_us)
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_us += value
+            if self.min_us is None or value < self.min_us:
+                self.min_us = value
+            if value > self.max_us:
+                self.max_us = value
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Yüzdelik değeri döndürür (saniye)
+
+        Args:
+            percentile: 0-100 arası yüzdelik
+
+        Returns:
+            float: Kovanın üst sınırı, kayıt yoksa 0.0
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, int(self.count * percentile / 100.0 + 0.5))
+            cumulative = 0
+            for index, count in enumerate(self._counts):
+                if not count:
+                    continue
+                cumulative += count
+                if cumulative >= target:
+                    return min(self._value_range(index)[1], self.max_us) / 1e6
+            return self.max_us / 1e6
+
+    def cumulative_counts(self, bounds: List[float]) -> List[int]:
+        """
+        Verilen üst sınırlara (saniye) kadar olan kayıt sayılarını döndürür
+
+        Prometheus tarzı 'le' kovaları için kullanılır. Sınırın düştüğü
+        sayaç tamamen sayılır; hata en fazla bir alt kova genişliğidir.
+        """
+        limits = [int(bound * 1e6) for bound in bounds]
+        result = [0] * len(limits)
+        with self._lock:
+            cumulative = 0
+            position = 0
+            for index, count in enumerate(self._counts):
+                if not count:
+                    continue
+                low = self._value_range(index)[0]
+                while position < len(limits) and low > limits[position]:
+                    result[position] = cumulative
+                    position += 1
+                if position == len(limits):
+                    break
+                cumulative += count
+            for i in range(position, len(limits)):
+                result[i] = cumulative
+        return result
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        Aynı yapılandırmadaki başka bir histogramı bu histograma ekler
+        """
+        if len(other._counts) != len(self._counts):
+            raise ValueError("Histogram yapılandırmaları farklı")
+        with other._lock:
+            counts = list(other._counts)
+            count, total, low, high = other.count, other.total_us, other.min_us, other.max_us
+        with self._lock:
+            for index, value in enumerate(counts):
+                if value:
+                    self._counts[index] += value
+            self.count += count
+            self.total_us += total
+            if low is not None and (self.min_us is None or low < self.min_us):
+                self.min_us = low
+            self.max_us = max(self.max_us, high)
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self.count = 0
+            self.total_us = 0
+            self.min_us = None
+            self.max_us = 0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Özet istatistikleri milisaniye cinsinden döndürür
+        """
+        count = self.count
+        return {
+            'count': count,
+            'mean_ms': self.total_us / count / 1000 if count else 0.0,
+            'min_ms': (self.min_us or 0) / 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'p999_ms': self.percentile(99.9) * 1000,
+            'max_ms': self.max_us / 1000
+        }
+
+class RateMeter:
+    """
+    Saniyelik sayaçlardan oluşan sabit boyutlu halka tampon ile istek hızı ölçer
+    """
+
+    def __init__(self, window: int = RATE_WINDOW_SECONDS):
+        self.window = window
+        self._counts = [0] * window
+        self._seconds = [0] * window
+        self._lock = threading.Lock()
+
+    def mark(self, now: float = None):
+        second = int(now if now is not None else time.time())
+        slot = second % self.window
+        with self._lock:
+            if self._seconds[slot] != second:
+                self._seconds[slot] = second
+                self._counts[slot] = 0
+            self._counts[slot] += 1
+
+    def rate(self, seconds: int = 10, now: float = None) -> float:
+        """
+        Son N saniyedeki ortalama istek/saniye değerini döndürür (içinde bulunulan saniye hariç)
+        """
+        seconds = min(seconds, self.window - 1)
+        current = int(now if now is not None else time.time())
+        with self._lock:
+            total = sum(count for second, count in zip(self._seconds, self._counts)
+                        if current - seconds <= second < current)
+        return total / seconds if seconds > 0 else 0.0
+
+class EndpointMetrics:
+    """
+    Tek bir API uç noktasının gecikme, hata ve hız ölçümleri
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyHistogram()
+        self.error_latency = LatencyHistogram()
+        self.rate = RateMeter()
+        self.calls = 0
+        self.errors = Counter()
+        self.last_error = None
+        self.last_call_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, error: BaseException = None):
+        now = time.time()
+        self.rate.mark(now)
+        if error is None:
+            self.latency.record(duration)
+        else:
+            # Hatalı çağrılar (zaman aşımı vb.) başarılı çağrı dağılımını bozmasın
+            self.error_latency.record(duration)
+        with self._lock:
+            self.calls += 1
+            self.last_call_at = now
+            if error is not None:
+                self.errors[type(error).__name__] += 1
+                self.last_error = str(error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            errors = dict(self.errors)
+            calls = self.calls
+            last_error = self.last_error
+        error_total = sum(errors.values())
+        return {
+            'endpoint': self.name,
+            'calls': calls,
+            'errors': error_total,
+            'error_rate': error_total / calls if calls else 0.0,
+            'errors_by_type': errors,
+            'last_error': last_error,
+            'rate_10s': self.rate.rate(10),
+            'rate_60s': self.rate.rate(RATE_WINDOW_SECONDS),
+            'latency': self.latency.summary(),
+            'error_latency': self.error_latency.summary()
+        }
+
+class MetricsRegistry:
+    """
+    Süreç içi API metrik kayıt defteri
+
+    Uç nokta başına EndpointMetrics tutar. Bellek kullanımı uç nokta
+    sayısıyla sınırlıdır; kayıt sayısı arttıkça büyümez.
+    """
+
+    def __init__(self, slow_call_threshold: float = SLOW_CALL_THRESHOLD):
+        self.slow_call_threshold = slow_call_threshold
+        self.started_at = time.time()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._endpoints.setdefault(name, EndpointMetrics(name))
+        return metrics
+
+    def record(self, name: str, duration: float, error: BaseException = None):
+        """
+        Bir API çağrısının sonucunu kaydeder
+
+        Args:
+            name: Uç nokta adı (client metot adı)
+            duration: Çağrı süresi (saniye)
+            error: Çağrı hata ile bittiyse istisna
+        """
+        self.endpoint(name).record(duration, error)
+        if duration >= self.slow_call_threshold:
+            logger.warning(f"Yavaş API çağrısı: {name} {duration:.2f}s")
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return sorted(self._endpoints)
+
+    def get_histogram(self, name: str) -> Optional[LatencyHistogram]:
+        metrics = self._endpoints.get(name)
+        return metrics.latency if metrics else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm uç noktaların metriklerini döndürür
+        """
+        with self._lock:
+            endpoints = list(self._endpoints.values())
+        return {metrics.name: metrics.snapshot() for metrics in endpoints}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+    def format_report(self) -> str:
+        """
+        Uç nokta başına özet tabloyu metin olarak döndürür
+        """
+        lines = [f"{'Uç nokta':<24} {'Çağrı':>7} {'Hata':>5} {'İstek/s':>8} "
+                 f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} (ms)"]
+        for name, stats in sorted(self.snapshot().items()):
+            latency = stats['latency']
+            lines.append(f"{name:<24} {stats['calls']:>7} {stats['errors']:>5} {stats['rate_60s']:>8.2f} "
+                         f"{latency['p50_ms']:>8.1f} {latency['p90_ms']:>8.1f} "
+                         f"{latency['p99_ms']:>8.1f} {latency['max_ms']:>8.1f}")
+            if stats['errors_by_type']:
+                errors = ", ".join(f"{k}: {v}" for k, v in sorted(stats['errors_by_type'].items()))
+                lines.append(f"{'':<24} hatalar: {errors}")
+        return "\n".join(lines)
+
+class InstrumentedClient:
+    """
+    API client'ını saran ve her metot çağrısını ölçen katman
+
+    Client'ın tüm çağrılabilir öznitelikleri metot adıyla uç nokta olarak
+    kaydedilir; çağrı sonucu ve istisnalar değiştirilmeden iletilir.
+    Çağrılabilir olmayan öznitelikler doğrudan client'tan okunur.
+
+    Her uç nokta ayrıca process genelinde paylaşılan bir devre kesiciden
+    geçer; devre açıkken çağrı API'ye gönderilmeden CircuitOpenError ile
+    reddedilir.
+    """
+
+    def __init__(self, client, registry: MetricsRegistry = None, circuit_breakers: bool = True):
+        """
+        Args:
+            client: Sarılacak client (BTCTurk Client veya SimulatedExchange)
+            registry: Metrik kayıt defteri (verilmezse global)
+            circuit_breakers: Uç nokta başına devre kesici kullanılsın mı
+        """
+        self._client = client
+        self._registry = registry or get_metrics_registry()
+        self._circuit_breakers = circuit_breakers
+        self._wrappers = {}
+
+    @property
+    def wrapped_client(self):
+        return self._client
+
+    @property
+    def metrics_registry(self) -> MetricsRegistry:
+        return self._registry
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrap(name)
+            self._wrappers[name] = wrapper
+        return wrapper
+
+    def _wrap(self, name: str):
+        client = self._client
+        registry = self._registry
+        breaker = get_circuit_breaker(name) if self._circuit_breakers else None
+
+        def call(*args, **kwargs):
+            if breaker is not None:
+                breaker.before_call()
+            started = time.perf_counter()
+            try:
+                result = getattr(client, name)(*args, **kwargs)
+            except Exception as e:
+                registry.record(name, time.perf_counter() - started, e)
+                if breaker is not None:
+                    breaker.record_result(e)
+                raise
+            registry.record(name, time.perf_counter() - started)
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+        call.__name__ = name
+        return call
+
+def instrument_client(client, registry: MetricsRegistry = None, circuit_breakers: bool = True):
+    """
+    Client'ı ölçüm katmanıyla sarar (zaten sarılmışsa olduğu gibi döndürür)
+    """
+    if isinstance(client, InstrumentedClient):
+        return client
+    return InstrumentedClient(client, registry, circuit_breakers)
+
+# Global değişkenler
+_metrics_registry = None
+_metrics_registry_lock = threading.Lock()
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Global API metrik kayıt defterini döner (yoksa oluşturur)
+    """
+    global _metrics_registry
+
+    with _metrics_registry_lock:
+        if _metrics_registry is None:
+            _metrics_registry = MetricsRegistry()
+        return _metrics_registry
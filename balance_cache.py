@@ -0,0 +1,281 @@
+import time
+import threading
+from typing import Callable, Dict, Any, Optional
+from loguru import logger
+from timer_wheel import get_timer_wheel
+
+class BalanceCache:
+    """
+    Paylaşımlı hesap bakiyesi önbelleği
+
+    Bakiye periyodik olarak API'den yenilenir, emir gönderimi ve emir
+    gerçekleşmelerinde yerel olarak güncellenir/geçersiz kılınır. Okuyucular
+    her zaman hazır sözlüğü alır; API'ye yalnızca veri eskidiğinde gidilir.
+    """
+
+    def __init__(self, fetch_func: Callable[[], Dict[str, Any]], refresh_interval: float = 15.0,
+                 timer_wheel=None):
+        """
+        Args:
+            fetch_func: Bakiyeyi API'den alıp {asset: {'asset','free','locked'}} formatında döndüren fonksiyon
+            refresh_interval: Arka plan yenileme aralığı (saniye)
+            timer_wheel: Verilirse yenileme ayrı thread yerine bu çarkta zamanlanır
+        """
+        self.fetch_func = fetch_func
+        self.refresh_interval = refresh_interval
+        self.timer_wheel = timer_wheel
+        self._timer = None
+
+        self._balances: Dict[str, Dict[str, Any]] = {}
+        self._updated_at = 0.0
+        self._dirty = True
+
+        self._lock = threading.RLock()  # Veri güncellemeleri için
+        self._refresh_lock = threading.Lock()  # Aynı anda tek API çağrısı için
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # İstatistikler
+        self.fetch_count = 0
+        self.hit_count = 0
+
+    def start(self):
+        """
+        Arka plan yenilemesini başlatır
+        """
+        if self.timer_wheel is not None:
+            if self._timer is None:
+                self._timer = self.timer_wheel.schedule(
+                    self.refresh_interval, self._refresh_if_stale,
+                    interval=self.refresh_interval, jitter=self.refresh_interval * 0.1,
+                    blocking=True, name="bakiye_yenileme"
+                )
+                logger.info(f"Bakiye önbelleği başlatıldı - Yenileme aralığı: {self.refresh_interval}s (zamanlayıcı çarkı)")
+            return
+
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Bakiye önbelleği başlatıldı - Yenileme aralığı: {self.refresh_interval}s")
+
+    def stop(self):
+        """
+        Arka plan yenilemesini durdurur
+        """
+        self._stop_event.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _refresh_loop(self):
+        """
+        Bakiyeyi periyodik olarak yeniler (ayrı thread'de çalışır)
+        """
+        while not self._stop_event.wait(self.refresh_interval):
+            self._refresh_if_stale()
+
+    def _refresh_if_stale(self):
+        """
+        Veri yenileme aralığından eskiyse yeniler
+        """
+        if self.age() >= self.refresh_interval:
+            self.refresh()
+
+    def age(self) -> float:
+        """
+        Önbellekteki verinin yaşını döndürür (saniye)
+        """
+        if not self._updated_at:
+            return float('inf')
+        return time.time() - self._updated_at
+
+    def refresh(self) -> bool:
+        """
+        Bakiyeyi API'den yeniler
+
+        Aynı anda birden fazla thread yenileme isterse yalnızca biri API'ye
+        gider, diğerleri onun sonucunu kullanır.
+
+        Returns:
+            bool: Yenileme başarılı ise True
+        """
+        requested_at = time.time()
+
+        with self._refresh_lock:
+            # Beklerken başka bir thread yenilediyse tekrar çağırma
+            if self._updated_at >= requested_at and not self._dirty:
+                return True
+
+            try:
+                balances = self.fetch_func()
+            except Exception as e:
+                logger.warning(f"Bakiye önbelleği yenilenemedi: {e}")
+                return False
+
+            if not isinstance(balances, dict):
+                logger.warning(f"Bakiye önbelleği için beklenmeyen yanıt: {type(balances)}")
+                return False
+
+            with self._lock:
+                self._balances = balances
+                self._updated_at = time.time()
+                self._dirty = False
+                self.fetch_count += 1
+
+            return True
+
+    def get(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Önbellekteki bakiyeyi döndürür
+
+        Args:
+            max_age: Kabul edilebilir maksimum veri yaşı (saniye). Verilmezse
+                yalnızca önbellek boş veya geçersiz kılınmışsa yenilenir.
+
+        Returns:
+            dict: Hesap bakiye bilgileri
+        """
+        needs_refresh = self._dirty or not self._updated_at
+        if max_age is not None and self.age() > max_age:
+            needs_refresh = True
+
+        if needs_refresh:
+            self.refresh()
+        else:
+            self.hit_count += 1
+
+        return self._balances
+
+    def get_free(self, asset: str) -> float:
+        """
+        Belirli bir varlığın serbest bakiyesini döndürür
+
+        Args:
+            asset: Varlık kodu (örn: TRY, BTC)
+
+        Returns:
+            float: Serbest bakiye
+        """
+        try:
+            return float(self.get().get(asset, {}).get('free', '0'))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def invalidate(self):
+        """
+        Önbelleği geçersiz kılar, bir sonraki okuma API'den yeniler
+        """
+        self._dirty = True
+
+    def _adjust(self, asset: str, free_delta: float = 0.0, locked_delta: float = 0.0):
+        """
+        Bir varlığın serbest/kilitli bakiyesini yerel olarak günceller
+        """
+        with self._lock:
+            # Okuyucular eski sözlüğü güvenle kullanabilsin diye kopyala-değiştir
+            balances = dict(self._balances)
+            entry = dict(balances.get(asset, {'asset': asset, 'free': '0', 'locked': '0'}))
+
+            try:
+                free = float(entry.get('free', '0')) + free_delta
+                locked = float(entry.get('locked', '0')) + locked_delta
+            except (TypeError, ValueError):
+                return
+
+            entry['free'] = str(max(0.0, free))
+            entry['locked'] = str(max(0.0, locked))
+            balances[asset] = entry
+            self._balances = balances
+
+    def apply_order_submitted(self, side: str, base_asset: str, quote_asset: str,
+                              price: float, quantity: float):
+        """
+        Gönderilen limit emrin bakiyeye etkisini yerel olarak uygular
+
+        Args:
+            side: 'buy' veya 'sell'
+            base_asset: Alınan/satılan coin (örn: BTC)
+            quote_asset: Karşı para birimi (örn: TRY)
+            price: Limit fiyat
+            quantity: Coin miktarı
+        """
+        if side == 'buy':
+            notional = price * quantity
+            self._adjust(quote_asset, free_delta=-notional, locked_delta=notional)
+        else:
+            self._adjust(base_asset, free_delta=-quantity, locked_delta=quantity)
+
+    def apply_fill(self, side: str, base_asset: str, quote_asset: str,
+                   price: float, quantity: float, observed_before: float = None) -> bool:
+        """
+        Gerçekleşen emrin bakiyeye etkisini yerel olarak uygular
+
+        Gerçekleşme bakiye okumadan (örn: emrin açık emirlerden düşmesiyle)
+        tespit edildiğinde kullanılır. Önbellek emrin en son açık görüldüğü
+        zamandan sonra API'den yenilendiyse gerçekleşme yenilenen veride
+        olabilir; çift sayılmaması için yerel güncelleme yerine önbellek
+        geçersiz kılınır.
+
+        Args:
+            side: 'buy' veya 'sell'
+            base_asset: Alınan/satılan coin (örn: BTC)
+            quote_asset: Karşı para birimi (örn: TRY)
+            price: Gerçekleşme fiyatı
+            quantity: Gerçekleşen coin miktarı
+            observed_before: Emrin en son açık görüldüğü zaman (time.time())
+
+        Returns:
+            bool: Yerel olarak uygulandıysa True, geçersiz kılındıysa False
+        """
+        notional = price * quantity
+        with self._lock:
+            if observed_before is not None and self._updated_at > observed_before:
+                self.invalidate()
+                return False
+
+            if side == 'buy':
+                self._adjust(quote_asset, locked_delta=-notional)
+                self._adjust(base_asset, free_delta=quantity)
+            else:
+                self._adjust(base_asset, locked_delta=-quantity)
+                self._adjust(quote_asset, free_delta=notional)
+            return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Önbellek istatistiklerini döndürür
+        """
+        return {
+            'fetch_count': self.fetch_count,
+            'hit_count': self.hit_count,
+            'age': self.age(),
+            'assets': len(self._balances)
+        }
+
+# Global değişkenler
+_shared_caches: Dict[str, BalanceCache] = {}
+_shared_caches_lock = threading.Lock()
+
+def get_shared_balance_cache(account_key: str, fetch_func: Callable[[], Dict[str, Any]],
+                             refresh_interval: float = 15.0) -> BalanceCache:
+    """
+    Aynı hesabı kullanan tüm botlar için ortak bakiye önbelleğini döner
+
+    Args:
+        account_key: Hesabı tanımlayan anahtar (API key)
+        fetch_func: İlk oluşturmada kullanılacak bakiye alma fonksiyonu
+        refresh_interval: Arka plan yenileme aralığı (saniye)
+
+    Returns:
+        BalanceCache: Paylaşımlı önbellek
+    """
+    with _shared_caches_lock:
+        cache = _shared_caches.get(account_key)
+        if cache is None:
+            cache = BalanceCache(fetch_func, refresh_interval, timer_wheel=get_timer_wheel())
+            cache.start()
+            _shared_caches[account_key] = cache
+        return cache
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BTCTurk Trading Bot - Mikro Benchmark Paketi
+
+Strateji, risk yönetimi, işlem geçmişi ve ayar kalıcılığı gibi sıcak
+yolları farklı veri büyüklüklerinde ölçer, sonuçları kayıtlı referans
+değerlerle (benchmark_baselines.json) karşılaştırır ve eşiği aşan
+yavaşlamalarda sıfırdan farklı çıkış kodu döner.
+
+Referans değerler makineye özgüdür. Farklı bir makinede karşılaştırma
+yapılacaksa --normalize ile sonuçlar saf Python kalibrasyon döngüsünün
+süresi oranında ölçeklenebilir; en güvenilir yol referansı aynı makinede
+--update-baseline ile yeniden almaktır.
+
+Kullanım:
+    python benchmark_suite.py                     # Çalıştır ve karşılaştır
+    python benchmark_suite.py --filter strategy   # Yalnızca adı eşleşenler
+    python benchmark_suite.py --update-baseline   # Referans değerleri yenile
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Any
+from loguru import logger
+
+DEFAULT_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+DEFAULT_THRESHOLD = 1.30  # Referansın %30 üzeri yavaşlama regresyon sayılır
+CALIBRATION_NAME = "calibration.python_loop"
+
+@dataclass
+class Benchmark:
+    """
+    Tek bir benchmark tanımı
+
+    setup çağrıldığında ölçülecek parametresiz fonksiyonu döndürür; hazırlık
+    maliyeti ölçüme dahil edilmez.
+    """
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    threshold: float = None  # Verilmezse genel eşik kullanılır
+    tags: List[str] = field(default_factory=list)
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Fonksiyonun çağrı başına süresini ölçer
+
+    Önce tek örneğin en az min_time sürmesi için gereken çağrı sayısı
+    bulunur, ardından repeat adet örnek alınır.
+
+    Returns:
+        dict: Çağrı başına mikrosaniye cinsinden median/min/stdev ve çağrı sayısı
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        # Hedef süreye bir adımda yaklaş, en fazla 10 kat büyüt
+        number = max(number + 1, min(number * 10, int(number * min_time / max(elapsed, 1e-9) * 1.2)))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'stdev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat
+    }
+
+# ---------------------------------------------------------------------------
+# Benchmark hazırlıkları
+# ---------------------------------------------------------------------------
+
+def _calibration():
+    def run():
+        total = 0
+        for i in range(1000):
+            total += i * i
+        return total
+    return run
+
+def _price_series(count: int, start_price: float = 100.0, seed: int = 42) -> List[float]:
+    rng = random.Random(seed)
+    prices, price = [], start_price
+    for _ in range(count):
+        price *= 1 + rng.gauss(0, 0.001)
+        prices.append(price)
+    return prices
+
+def _strategy_with_history(history_size: int):
+    """
+    Son birkaç dakikaya yayılmış fiyat geçmişi olan strateji oluşturur
+    """
+    from trading_strategy import TradingStrategy
+
+    strategy = TradingStrategy("BENCHTRY")
+    now = datetime.now()
+    prices = _price_series(history_size)
+    # Trend/volatilite pencerelerine düşmesi için noktalar son 2 dakikaya yayılır
+    step = 120.0 / max(history_size, 1)
+    for i, price in enumerate(prices):
+        strategy.add_price_point(price, now - timedelta(seconds=(history_size - i) * step))
+    return strategy
+
+def _strategy_add_price_point(history_size: int):
+    def setup():
+        strategy = _strategy_with_history(history_size)
+        prices = _price_series(1024, seed=7)
+        state = {'i': 0}
+
+        def run():
+            i = state['i'] = (state['i'] + 1) & 1023
+            strategy.add_price_point(prices[i])
+            # Geçmiş sınırın altındaysa büyüklüğü sabit tut
+            if history_size < 1000:
+                strategy.price_history.pop()
+        return run
+    return setup
+
+def _strategy_should_buy(history_size: int):
+    def setup():
+        strategy = _strategy_with_history(history_size)
+        current_price = strategy.price_history[-1]['price']
+        return lambda: strategy.should_buy(current_price, 1000.0)
+    return setup
+
+def _strategy_should_sell(history_size: int):
+    def setup():
+        strategy = _strategy_with_history(history_size)
+        current_price = strategy.price_history[-1]['price']
+        # Hedef ve stop loss dışında kalarak trend analizi yoluna girilir
+        buy_price = current_price / 1.009
+        return lambda: strategy.should_sell(current_price, buy_price, 1.0, -5.0)
+    return setup
+
+def _risk_manager_with_trades(trade_count: int):
+    from trading_strategy import RiskManager
+
+    risk_manager = RiskManager(max_daily_loss=1e9, max_position_size=100.0)
+    now = datetime.now()
+    rng = random.Random(3)
+    # Bugünün işlemleri günlük sınırı aşmasın diye çoğunluk geçmiş günlere yayılır
+    for i in range(trade_count):
+        timestamp = now - timedelta(days=1 + i % 30) if i % 100 else now
+        risk_manager.daily_trades.append({'profit_loss': rng.uniform(-1, 1), 'timestamp': timestamp})
+    return risk_manager
+
+def _risk_can_trade(trade_count: int):
+    def setup():
+        risk_manager = _risk_manager_with_trades(trade_count)
+        return lambda: risk_manager.can_trade(10.0, 1000.0)
+    return setup
+
+def _risk_record_trade(trade_count: int):
+    def setup():
+        risk_manager = _risk_manager_with_trades(trade_count)
+
+        def run():
+            risk_manager.record_trade(0.1)
+            risk_manager.daily_trades.pop()
+        return run
+    return setup
+
+def _trade_records(count: int) -> List[Dict[str, str]]:
+    rng = random.Random(11)
+    now = datetime.now()
+    coins = ['BTCTRY', 'ETHTRY', 'ASRTRY', 'AVAXTRY']
+    records = []
+    for i in range(count):
+        price = rng.uniform(1, 1000)
+        amount = rng.uniform(0.1, 10)
+        records.append({
+            'timestamp': (now - timedelta(minutes=i * 7)).isoformat(),
+            'type': 'Alış' if i % 2 else 'Satış',
+            'coin': coins[i % len(coins)],
+            'amount': str(amount),
+            'price': str(price),
+            'total': str(price * amount),
+            'profit_loss': str(rng.uniform(-5, 5) if i % 2 == 0 else 0),
+            'status': 'Tamamlandı'
+        })
+    return records
+
+def _history_view(trade_count: int, date_filter: str = "Tümü", type_filter: str = "Tümü",
+                  coin_filter: str = "Tümü"):
+    """
+    İşlem geçmişi metotları için GUI'siz sahte örnek oluşturur
+
+    Widget oluşturma (populate_trade_table) ekran gerektirdiği için boş
+    bırakılır; filtreleme, istatistik ve dosyaya yazma gerçek koddur.
+    """
+    from gui_main import TradingBotGUI
+
+    def var(value):
+        return SimpleNamespace(get=lambda: value)
+
+    view = SimpleNamespace(
+        trade_history=_trade_records(trade_count),
+        history_scrollable=SimpleNamespace(winfo_children=lambda: []),
+        date_filter=var(date_filter),
+        type_filter=var(type_filter),
+        coin_filter=var(coin_filter),
+        populate_trade_table=lambda trades: None
+    )
+    view.update_trade_statistics = lambda trades: TradingBotGUI.update_trade_statistics(view, trades)
+    view.apply_filters = lambda: TradingBotGUI.apply_filters(view)
+    return view
+
+def _gui_apply_filters(trade_count: int):
+    def setup():
+        from gui_main import TradingBotGUI
+        view = _history_view(trade_count, "Son 30 Gün", "Satış", "BTCTRY")
+        return lambda: TradingBotGUI.apply_filters(view)
+    return setup
+
+def _gui_add_trade_to_history(trade_count: int):
+    def setup():
+        from gui_main import TradingBotGUI
+        view = _history_view(trade_count)
+        trade = {'type': 'Alış', 'coin': 'BTCTRY', 'amount': 0.001, 'price': 2500000,
+                 'total': 2500, 'profit_loss': 0}
+
+        def run():
+            TradingBotGUI.add_trade_to_history(view, trade)
+            view.trade_history.pop()
+        return run
+    return setup
+
+def _settings_manager():
+    from settings_manager import SettingsManager
+    manager = SettingsManager("bench_settings.json")
+    manager.settings.api_key = "k" * 64
+    manager.settings.api_secret = "s" * 64
+    manager.save_settings()
+    return manager
+
+def _settings_save():
+    def setup():
+        return _settings_manager().save_settings
+    return setup
+
+def _settings_load():
+    def setup():
+        return _settings_manager().load_settings
+    return setup
+
+def get_benchmarks() -> List[Benchmark]:
+    """
+    Paketteki tüm benchmark'ları döndürür
+    """
+    benchmarks = [Benchmark(CALIBRATION_NAME, _calibration, tags=['calibration'])]
+
+    for size in (10, 100, 1000):
+        benchmarks.append(Benchmark(f"strategy.add_price_point[{size}]", _strategy_add_price_point(size),
+                                    tags=['strategy']))
+    for size in (10, 100, 1000):
+        benchmarks.append(Benchmark(f"strategy.should_buy[{size}]", _strategy_should_buy(size),
+                                    tags=['strategy']))
+    for size in (100, 1000):
+        benchmarks.append(Benchmark(f"strategy.should_sell[{size}]", _strategy_should_sell(size),
+                                    tags=['strategy']))
+
+    for count in (100, 1000, 10000):
+        benchmarks.append(Benchmark(f"risk.can_trade[{count}]", _risk_can_trade(count), tags=['risk']))
+    for count in (100, 1000, 10000):
+        benchmarks.append(Benchmark(f"risk.record_trade[{count}]", _risk_record_trade(count), tags=['risk']))
+
+    for count in (100, 1000, 10000):
+        benchmarks.append(Benchmark(f"gui.apply_filters[{count}]", _gui_apply_filters(count), tags=['gui']))
+    # Her çağrıda tüm geçmiş diske yazıldığı için disk gecikmesi sonuçları oynatır
+    for count in (100, 1000, 5000):
+        benchmarks.append(Benchmark(f"gui.add_trade_to_history[{count}]", _gui_add_trade_to_history(count),
+                                    threshold=1.6, tags=['gui', 'io']))
+
+    benchmarks.append(Benchmark("settings.save", _settings_save(), threshold=1.6, tags=['settings', 'io']))
+    benchmarks.append(Benchmark("settings.load", _settings_load(), threshold=1.6, tags=['settings', 'io']))
+    return benchmarks
+
+# ---------------------------------------------------------------------------
+# Çalıştırma ve karşılaştırma
+# ---------------------------------------------------------------------------
+
+def run_benchmarks(benchmarks: List[Benchmark], repeat: int = 5, min_time: float = 0.2,
+                   work_dir: str = None) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark'ları çalıştırır
+
+    Dosya yazan benchmark'lar çalışma dizinini kirletmesin diye geçici bir
+    dizinde çalıştırılır.
+
+    Returns:
+        dict: Benchmark adı -> ölçüm sonuçları
+    """
+    results = {}
+    previous_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as temp_dir:
+        os.chdir(work_dir or temp_dir)
+        try:
+            for bench in benchmarks:
+                try:
+                    func = bench.setup()
+                    results[bench.name] = measure(func, repeat=repeat, min_time=min_time)
+                    result = results[bench.name]
+                    print(f"  {bench.name:<40} min {result['min_us']:>12.2f} µs  "
+                          f"median {result['median_us']:>12.2f} µs", flush=True)
+                except Exception as e:
+                    logger.error(f"Benchmark çalıştırılamadı ({bench.name}): {e}")
+        finally:
+            os.chdir(previous_dir)
+
+    return results
+
+def machine_info() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'processor': platform.processor()
+    }
+
+def load_baselines(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(path: str, results: Dict[str, Dict[str, float]], benchmarks: List[Benchmark],
+                   previous: Dict[str, Any] = None):
+    """
+    Ölçümleri referans dosyasına yazar (filtrelenmiş çalıştırmada diğer kayıtlar korunur)
+    """
+    thresholds = {bench.name: bench.threshold for bench in benchmarks if bench.threshold}
+    entries = dict((previous or {}).get('benchmarks', {}))
+    for name, result in results.items():
+        entry = {'min_us': round(result['min_us'], 3), 'median_us': round(result['median_us'], 3)}
+        if name in thresholds:
+            entry['threshold'] = thresholds[name]
+        entries[name] = entry
+
+    data = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'default_threshold': DEFAULT_THRESHOLD,
+        'benchmarks': dict(sorted(entries.items()))
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+def compare(results: Dict[str, Dict[str, float]], baselines: Dict[str, Any],
+            threshold: float = None, normalize: bool = False) -> List[Dict[str, Any]]:
+    """
+    Ölçümleri referans değerlerle karşılaştırır
+
+    Karşılaştırmada en hızlı örnek kullanılır; diğer süreçlerin yarattığı
+    gürültü yalnızca süreyi uzatabildiği için minimum en kararlı değerdir.
+
+    Args:
+        results: run_benchmarks sonucu
+        baselines: Referans dosyası içeriği
+        threshold: Genel eşik (verilmezse dosyadaki varsayılan)
+        normalize: Kalibrasyon oranıyla makine hızı farkını düzelt
+
+    Returns:
+        list: Benchmark başına oran ve durum ('ok', 'regression', 'improved', 'new')
+    """
+    entries = baselines.get('benchmarks', {})
+    default_threshold = threshold or baselines.get('default_threshold', DEFAULT_THRESHOLD)
+
+    scale = 1.0
+    if normalize and CALIBRATION_NAME in results and CALIBRATION_NAME in entries:
+        scale = results[CALIBRATION_NAME]['min_us'] / entries[CALIBRATION_NAME]['min_us']
+
+    rows = []
+    for name, result in results.items():
+        if name == CALIBRATION_NAME:
+            continue
+        entry = entries.get(name)
+        if entry is None:
+            rows.append({'name': name, 'current_us': result['min_us'], 'status': 'new'})
+            continue
+
+        limit = threshold or entry.get('threshold', default_threshold)
+        expected = entry['min_us'] * scale
+        ratio = result['min_us'] / expected if expected > 0 else 1.0
+        if ratio > limit:
+            status = 'regression'
+        elif ratio < 1 / limit:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'current_us': result['min_us'], 'baseline_us': expected,
+                     'ratio': ratio, 'threshold': limit, 'status': status})
+    return rows
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    labels = {'ok': 'OK', 'regression': 'YAVAŞLAMA', 'improved': 'HIZLANMA', 'new': 'YENİ'}
+    lines = [f"{'Benchmark':<40} {'Şimdi (µs)':>12} {'Referans':>12} {'Oran':>7}  Durum"]
+    for row in rows:
+        if row['status'] == 'new':
+            lines.append(f"{row['name']:<40} {row['current_us']:>12.2f} {'-':>12} {'-':>7}  {labels['new']}")
+        else:
+            lines.append(f"{row['name']:<40} {row['current_us']:>12.2f} {row['baseline_us']:>12.2f} "
+                         f"{row['ratio']:>6.2f}x  {labels[row['status']]} (eşik {row['threshold']:.2f}x)")
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BTCTurk Trading Bot mikro benchmark paketi")
+    parser.add_argument('--filter', type=str, help="Yalnızca adında bu metin geçen benchmark'lar")
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_FILE, help="Referans dosyası")
+    parser.add_argument('--update-baseline', action='store_true', help="Ölçümleri referans olarak kaydet")
+    parser.add_argument('--threshold', type=float, help="Tüm benchmark'lar için regresyon eşiği (örn: 1.3)")
+    parser.add_argument('--normalize', action='store_true',
+                        help="Sonuçları kalibrasyon oranıyla ölçekle (farklı makinedeki referans için)")
+    parser.add_argument('--repeat', type=int, default=5, help="Örnek sayısı")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Örnek başına en az süre (saniye)")
+    parser.add_argument('--json', type=str, help="Ham sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    # Ölçülen kodun logları dosyaya/ekrana yazılıp sonucu bozmasın
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    benchmarks = get_benchmarks()
+    if args.filter:
+        benchmarks = [b for b in benchmarks if args.filter in b.name or b.name == CALIBRATION_NAME]
+
+    print(f"{len(benchmarks)} benchmark çalıştırılıyor...")
+    results = run_benchmarks(benchmarks, repeat=args.repeat, min_time=args.min_time)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, indent=2)
+
+    baselines = load_baselines(args.baseline)
+
+    if args.update_baseline:
+        save_baselines(args.baseline, results, benchmarks, baselines)
+        print(f"Referans değerler kaydedildi: {args.baseline}")
+        return 0
+
+    if baselines is None:
+        print(f"Referans dosyası bulunamadı: {args.baseline} (--update-baseline ile oluşturun)")
+        return 0
+
+    if baselines.get('machine') != machine_info():
+        print("Uyarı: Referans değerler farklı bir makinede/Python sürümünde alınmış; "
+              "--normalize kullanın veya referansı yeniden alın")
+
+    rows = compare(results, baselines, args.threshold, normalize=args.normalize)
+
+    # Anlık yük kaynaklı yanlış alarmları elemek için yavaşlayanlar bir kez daha ölçülür
+    suspects = {row['name'] for row in rows if row['status'] == 'regression'}
+    if suspects:
+        print(f"\n{len(suspects)} olası yavaşlama yeniden ölçülüyor...")
+        retry = run_benchmarks([b for b in benchmarks if b.name in suspects],
+                               repeat=args.repeat * 2, min_time=args.min_time)
+        for name, result in retry.items():
+            if result['min_us'] < results[name]['min_us']:
+                results[name] = result
+        rows = compare(results, baselines, args.threshold, normalize=args.normalize)
+
+    print()
+    print(format_comparison(rows))
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} benchmark'ta yavaşlama tespit edildi")
+        return 1
+    print("\nYavaşlama tespit edilmedi")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import time
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+from loguru import logger
+
+# Desteklenen zaman dilimleri (saniye)
+TIMEFRAMES = {
+    '1s': 1,
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600
+}
+
+# Dizi sütunları
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, TRADES = range(7)
+COLUMNS = ('open_time', 'open', 'high', 'low', 'close', 'volume', 'trades')
+
+class CandleSeries:
+    """
+    Tek bir zaman dilimi için OHLCV mum serisi
+
+    Mumlar sabit kapasiteli bir numpy halka tamponunda (satır başına 7
+    float64) tutulur; her tick yalnızca son mumu günceller ya da yeni mum
+    açar, geçmiş yeniden taranmaz.
+    """
+
+    def __init__(self, interval: int, capacity: int = 1000, fill_gaps: bool = True):
+        """
+        Args:
+            interval: Mum süresi (saniye)
+            capacity: Tutulacak maksimum mum sayısı
+            fill_gaps: İşlem olmayan aralıklar önceki kapanışla doldurulsun mu
+        """
+        self.interval = interval
+        self.capacity = capacity
+        self.fill_gaps = fill_gaps
+
+        self._data = np.zeros((capacity, len(COLUMNS)), dtype=np.float64)
+        self._head = 0  # Son mumun indeksi
+        self._count = 0
+        self.late_ticks = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def update(self, price: float, volume: float = 0.0, timestamp: float = None):
+        """
+        Tick'i seriye işler
+
+        Args:
+            price: Fiyat
+            volume: İşlem miktarı
+            timestamp: Unix zaman damgası (saniye)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        bucket = float(int(timestamp // self.interval) * self.interval)
+
+        with self._lock:
+            if self._count == 0:
+                self._open_candle(bucket, price, volume)
+                return
+
+            row = self._data[self._head]
+            current_open = row[OPEN_TIME]
+
+            if bucket == current_open:
+                if price > row[HIGH]:
+                    row[HIGH] = price
+                if price < row[LOW]:
+                    row[LOW] = price
+                row[CLOSE] = price
+                row[VOLUME] += volume
+                row[TRADES] += 1
+            elif bucket > current_open:
+                if self.fill_gaps:
+                    self._fill_gap(current_open, bucket, row[CLOSE])
+                self._open_candle(bucket, price, volume)
+            else:
+                # Kapanmış muma ait geç gelen tick
+                self.late_ticks += 1
+
+    def _open_candle(self, bucket: float, price: float, volume: float):
+        if self._count:
+            self._head = (self._head + 1) % self.capacity
+        self._data[self._head] = (bucket, price, price, price, price, volume, 1)
+        self._count = min(self._count + 1, self.capacity)
+
+    def _fill_gap(self, last_open: float, bucket: float, last_close: float):
+        missing = int((bucket - last_open) // self.interval) - 1
+        # Tamponu aşan boşluklar zaten eski mumları tamamen siler
+        missing = min(missing, self.capacity)
+        for i in range(missing):
+            gap_open = bucket - (missing - i) * self.interval
+            self._head = (self._head + 1) % self.capacity
+            self._data[self._head] = (gap_open, last_close, last_close, last_close, last_close, 0.0, 0)
+            self._count = min(self._count + 1, self.capacity)
+
+    def to_array(self, count: int = None) -> np.ndarray:
+        """
+        Mumları eskiden yeniye sıralı dizi olarak döndürür (kopya)
+
+        Args:
+            count: Son kaç mum (verilmezse tamamı)
+
+        Returns:
+            np.ndarray: (n, 7) boyutlu dizi, sütunlar COLUMNS sırasında
+        """
+        with self._lock:
+            n = self._count if count is None else min(count, self._count)
+            if n == 0:
+                return np.empty((0, len(COLUMNS)), dtype=np.float64)
+            start = (self._head - n + 1) % self.capacity
+            if start + n <= self.capacity:
+                return self._data[start:start + n].copy()
+            return np.concatenate((self._data[start:], self._data[:self._head + 1]))
+
+    def column(self, name: str, count: int = None) -> np.ndarray:
+        """
+        Tek bir sütunu döndürür (örn: 'close')
+        """
+        return self.to_array(count)[:, COLUMNS.index(name)]
+
+    def last(self) -> Optional[Dict[str, float]]:
+        """
+        Son (açık) mumu sözlük olarak döndürür
+        """
+        with self._lock:
+            if self._count == 0:
+                return None
+            return dict(zip(COLUMNS, self._data[self._head].tolist()))
+
+class CandleAggregator:
+    """
+    Tick'lerden coin çifti başına çoklu zaman dilimli mum serileri üreten sınıf
+    """
+
+    def __init__(self, timeframes: List[str] = None, capacity: int = 1000):
+        """
+        Args:
+            timeframes: Üretilecek zaman dilimleri (varsayılan: tümü)
+            capacity: Seri başına tutulacak maksimum mum sayısı
+        """
+        timeframes = timeframes or list(TIMEFRAMES.keys())
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAMES]
+        if unknown:
+            raise ValueError(f"Desteklenmeyen zaman dilimi: {unknown}")
+
+        self.timeframes = timeframes
+        self.capacity = capacity
+        self.series: Dict[str, Dict[str, CandleSeries]] = {}
+        self._lock = threading.Lock()
+
+    def _get_symbol_series(self, symbol: str) -> Dict[str, CandleSeries]:
+        series = self.series.get(symbol)
+        if series is None:
+            with self._lock:
+                series = self.series.get(symbol)
+                if series is None:
+                    series = {tf: CandleSeries(TIMEFRAMES[tf], self.capacity) for tf in self.timeframes}
+                    self.series[symbol] = series
+        return series
+
+    def add_tick(self, symbol: str, price: float, volume: float = 0.0, timestamp: float = None):
+        """
+        Tick'i coin çiftinin tüm zaman dilimlerine işler
+
+        Args:
+            symbol: Coin çifti
+            price: Fiyat
+            volume: İşlem miktarı
+            timestamp: Unix zaman damgası (saniye)
+        """
+        if price <= 0:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+
+        for candle_series in self._get_symbol_series(symbol).values():
+            candle_series.update(price, volume, timestamp)
+
+    def get_series(self, symbol: str, timeframe: str) -> Optional[CandleSeries]:
+        """
+        Coin çiftinin belirli zaman dilimindeki serisini döndürür
+        """
+        return self.series.get(symbol, {}).get(timeframe)
+
+    def get_candles(self, symbol: str, timeframe: str = '1m', count: int = None) -> List[Dict[str, float]]:
+        """
+        Mumları sözlük listesi olarak döndürür
+
+        Args:
+            symbol: Coin çifti
+            timeframe: Zaman dilimi ('1s', '1m', '5m', '15m', '1h')
+            count: Son kaç mum
+
+        Returns:
+            list: [{'open_time','open','high','low','close','volume','trades'}]
+        """
+        candle_series = self.get_series(symbol, timeframe)
+        if candle_series is None:
+            return []
+        return [dict(zip(COLUMNS, row)) for row in candle_series.to_array(count).tolist()]
+
+    def reset(self, symbol: str = None):
+        """
+        Serileri sıfırlar (symbol verilmezse tümü)
+        """
+        with self._lock:
+            if symbol is None:
+                self.series = {}
+            else:
+                self.series.pop(symbol, None)
+        logger.debug(f"Mum serileri sıfırlandı: {symbol or 'tümü'}")
@@ -1,9 +1,11 @@
 import os
 import sys
+import time
 import traceback
 import functools
+from collections import deque
 from datetime import datetime
-from typing import Optional, Callable, Any, Dict
+from typing import Optional, Callable, Any, Dict, List
 from enum import Enum
 from loguru import logger
 import customtkinter as ctk
@@ -11,6 +13,13 @@ from tkinter import messagebox
 import json
 import threading
 from pathlib import Path
+from retry_policy import RetryPolicy
+
+DEFAULT_MAX_HISTORY = 1000
+DEDUP_WINDOW = 60.0  # Aynı hata bu süre içinde tekrarlanırsa tek kayıtta sayılır (saniye)
+DEDUP_LOG_EVERY = 100  # Tekrarlanan hata her bu kadar tekrarda bir loglanır
+RATE_WINDOW_MINUTES = 60
+NOTIFICATION_WINDOW = 2.0  # Bildirimlerin tek özette birleştirildiği süre (saniye)
 
 class ErrorType(Enum):
     """
@@ -155,17 +164,180 @@ class LogManager:
                 log_file.unlink()
                 logger.info(f"Eski log dosyası silindi: {log_file}")
 
+class NotificationAggregator:
+    """
+    Hata bildirimlerini biriktirip tek bir modal olmayan özet penceresinde gösterir
+    
+    Her hata için ayrı messagebox açmak yerine bildirimler hata türüne göre
+    gruplanır; ilk bildirim NOTIFICATION_WINDOW sonrasına tek bir Tk
+    zamanlayıcısı kurar ve o süre içinde gelen tüm bildirimler aynı turda
+    gösterilir. Özet penceresi açıksa yeniden oluşturulmaz, içeriği güncellenir;
+    pencere kapatılana kadar sayılar birikir.
+    """
+    
+    SEVERITY_ORDER = [ErrorSeverity.LOW, ErrorSeverity.MEDIUM, ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]
+    
+    def __init__(self, gui_parent, window: float = NOTIFICATION_WINDOW, on_show_history: Callable = None):
+        """
+        Args:
+            gui_parent: Tk kök penceresi
+            window: Birleştirme süresi (saniye)
+            on_show_history: Özetteki "Hata Geçmişi" butonu için geri çağrı
+        """
+        self.gui_parent = gui_parent
+        self.window = window
+        self.on_show_history = on_show_history
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._flush_scheduled = False
+        
+        # Yalnızca Tk thread'inde erişilir
+        self._entries: Dict[str, Dict] = {}
+        self._toplevel = None
+        self._textbox = None
+        
+        self.notifications = 0
+        self.flushes = 0
+    
+    def notify(self, title: str, message: str, severity: ErrorSeverity, group: str = None):
+        """
+        Bildirimi kuyruğa ekler (herhangi bir thread'den çağrılabilir)
+        
+        Args:
+            title: Başlık (grup verilmezse gruplama anahtarı)
+            message: Mesaj
+            severity: Önem seviyesi
+            group: Gruplama anahtarı (örn: hata türü)
+        """
+        key = group or title
+        with self._lock:
+            self.notifications += 1
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = {"title": title, "count": 0, "severity": severity}
+            entry["count"] += 1
+            entry["message"] = message
+            entry["last_seen"] = datetime.now()
+            if self.SEVERITY_ORDER.index(severity) > self.SEVERITY_ORDER.index(entry["severity"]):
+                entry["severity"] = severity
+            
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        try:
+            self.gui_parent.after(int(self.window * 1000), self._flush)
+        except Exception as e:
+            with self._lock:
+                self._flush_scheduled = False
+            logger.debug(f"Bildirim özeti zamanlanamadı: {e}")
+    
+    def _flush(self):
+        """
+        Biriken bildirimleri özet penceresine aktarır (Tk thread'inde)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        if not pending:
+            return
+        
+        self.flushes += 1
+        for key, entry in pending.items():
+            current = self._entries.get(key)
+            if current is None:
+                self._entries[key] = entry
+            else:
+                current["count"] += entry["count"]
+                current["message"] = entry["message"]
+                current["last_seen"] = entry["last_seen"]
+                if self.SEVERITY_ORDER.index(entry["severity"]) > self.SEVERITY_ORDER.index(current["severity"]):
+                    current["severity"] = entry["severity"]
+        
+        try:
+            self._show_summary()
+        except Exception as e:
+            logger.error(f"Bildirim özeti gösterilemedi: {e}")
+    
+    def _show_summary(self):
+        if self._toplevel is None or not self._toplevel.winfo_exists():
+            self._create_window()
+        
+        total = sum(entry["count"] for entry in self._entries.values())
+        worst = max((entry["severity"] for entry in self._entries.values()), key=self.SEVERITY_ORDER.index)
+        self._toplevel.title(f"Hata Bildirimleri ({total}) - {worst.value}")
+        
+        self._textbox.configure(state="normal")
+        self._textbox.delete("1.0", "end")
+        for entry in sorted(self._entries.values(), key=lambda item: item["last_seen"], reverse=True):
+            text = f"[{entry['severity'].value}] {entry['title']}"
+            if entry["count"] > 1:
+                text += f" x{entry['count']}"
+            text += f"  (son: {entry['last_seen'].strftime('%H:%M:%S')})\n{entry['message']}\n"
+            text += "-" * 60 + "\n"
+            self._textbox.insert("end", text)
+        self._textbox.configure(state="disabled")
+        
+        # Odak çalmadan öne getir
+        self._toplevel.deiconify()
+        self._toplevel.lift()
+    
+    def _create_window(self):
+        self._toplevel = ctk.CTkToplevel(self.gui_parent)
+        self._toplevel.geometry("520x320")
+        self._toplevel.protocol("WM_DELETE_WINDOW", self.dismiss)
+        
+        self._textbox = ctk.CTkTextbox(self._toplevel)
+        self._textbox.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        
+        button_frame = ctk.CTkFrame(self._toplevel)
+        button_frame.pack(fill="x", padx=10, pady=(0, 10))
+        ctk.CTkButton(button_frame, text="Kapat", command=self.dismiss, width=80).pack(side="right", padx=5)
+        if self.on_show_history:
+            ctk.CTkButton(button_frame, text="Hata Geçmişi", command=self.on_show_history,
+                          width=110).pack(side="right", padx=5)
+    
+    def dismiss(self):
+        """
+        Özet penceresini kapatır ve sayıları sıfırlar
+        """
+        self._entries.clear()
+        if self._toplevel is not None:
+            try:
+                self._toplevel.destroy()
+            except Exception:
+                pass
+        self._toplevel = None
+        self._textbox = None
+
 class ErrorHandler:
     """
     Hata yönetim sınıfı
+    
+    Son hatalar sabit boyutlu halka tamponda tutulur. Aynı bağlam ve mesajla
+    DEDUP_WINDOW içinde tekrarlanan hatalar yeni kayıt açmaz; mevcut kaydın
+    sayacı artırılır. Tür, önem seviyesi ve dakika başına sayaçlar her hatada
+    artırılır; istatistikler için geçmiş yeniden taranmaz.
     """
     
-    def __init__(self, log_manager: LogManager, gui_parent=None):
+    def __init__(self, log_manager: LogManager, gui_parent=None, max_history: int = DEFAULT_MAX_HISTORY):
         self.log_manager = log_manager
         self.gui_parent = gui_parent
-        self.error_history = []
+        self.max_history = max_history
+        self.error_history = deque(maxlen=max_history)
         self.error_callbacks = {}
-        self.max_history = 1000
+        self._lock = threading.Lock()
+        self._dedup_index: Dict[tuple, Dict] = {}
+        
+        # Artımlı sayaçlar (tüm oturum boyunca, tampondan düşen kayıtlar dahil)
+        self.total_errors = 0
+        self.type_counts: Dict[str, int] = {}
+        self.severity_counts: Dict[str, int] = {}
+        self._minute_buckets = deque(maxlen=RATE_WINDOW_MINUTES)  # [dakika, toplam, {tür: adet}]
+        
+        self.notifier = NotificationAggregator(
+            gui_parent, on_show_history=lambda: ErrorLogViewer(gui_parent, self)
+        ) if gui_parent else None
         
         # Sistem hata yakalayıcısını ayarla
         sys.excepthook = self.handle_exception
@@ -190,7 +362,8 @@ class ErrorHandler:
             self.show_error_dialog(
                 "Kritik Hata",
                 f"{error_msg}\n\nUygulama kapatılabilir.",
-                ErrorSeverity.CRITICAL
+                ErrorSeverity.CRITICAL,
+                group="UNCAUGHT"
             )
     
     def handle_error(self, error: Exception, context: str = "", 
@@ -211,26 +384,20 @@ class ErrorHandler:
                 error_msg = str(error)
                 details = {"exception_type": type(error).__name__}
             
-            # Hata bilgilerini oluştur
-            error_info = {
-                "timestamp": datetime.now().isoformat(),
-                "message": error_msg,
-                "context": context,
-                "error_type": error_type.value,
-                "severity": severity.value,
-                "details": details,
-                "traceback": traceback.format_exc()
-            }
-            
-            # Hata geçmişine ekle
-            self.error_history.append(error_info)
-            if len(self.error_history) > self.max_history:
-                self.error_history.pop(0)
+            error_info, repeat_count = self._record_error(error_msg, context, error_type, severity, details)
+            is_repeat = repeat_count > 1
             
-            # Log'a yaz
+            # Log'a yaz (tekrarlanan hata her DEDUP_LOG_EVERY tekrarda bir)
             log_msg = f"[{error_type.value}] {context}: {error_msg}"
+            if is_repeat:
+                if repeat_count % DEDUP_LOG_EVERY:
+                    log_msg = None
+                else:
+                    log_msg += f" ({repeat_count}. tekrar)"
             
-            if severity == ErrorSeverity.CRITICAL:
+            if log_msg is None:
+                pass
+            elif severity == ErrorSeverity.CRITICAL:
                 logger.critical(log_msg)
             elif severity == ErrorSeverity.HIGH:
                 logger.error(log_msg)
@@ -247,12 +414,13 @@ class ErrorHandler:
                     except Exception as cb_error:
                         logger.error(f"Error callback hatası: {cb_error}")
             
-            # GUI dialog göster
-            if show_dialog and self.gui_parent and severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
+            # GUI dialog göster (aynı hatanın tekrarında tekrar açılmaz)
+            if show_dialog and not is_repeat and self.gui_parent and severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
                 self.show_error_dialog(
                     f"{error_type.value} Hatası",
-                    f"{context}\n\n{error_msg}",
-                    severity
+                    f"{context}: {error_msg}",
+                    severity,
+                    group=error_type.value
                 )
             
             return True
@@ -261,25 +429,120 @@ class ErrorHandler:
             logger.critical(f"Hata işleyicisinde hata: {handler_error}")
             return False
     
-    def show_error_dialog(self, title: str, message: str, severity: ErrorSeverity):
+    def _record_error(self, error_msg: str, context: str, error_type: ErrorType,
+                      severity: ErrorSeverity, details: Dict) -> tuple:
         """
-        Hata dialog'u gösterir
+        Hatayı tampona ekler veya tekrarıysa mevcut kaydı günceller, sayaçları artırır
+        
+        Returns:
+            tuple: (hata kaydı, kayıttaki tekrar sayısı)
         """
-        def show_dialog():
-            if severity == ErrorSeverity.CRITICAL:
-                messagebox.showerror(title, message)
-            elif severity == ErrorSeverity.HIGH:
-                messagebox.showerror(title, message)
-            elif severity == ErrorSeverity.MEDIUM:
-                messagebox.showwarning(title, message)
-            else:
-                messagebox.showinfo(title, message)
+        now = time.time()
+        key = (error_type.value, severity.value, context, error_msg)
+        
+        with self._lock:
+            self.total_errors += 1
+            self.type_counts[error_type.value] = self.type_counts.get(error_type.value, 0) + 1
+            self.severity_counts[severity.value] = self.severity_counts.get(severity.value, 0) + 1
+            
+            minute = int(now // 60)
+            if not self._minute_buckets or self._minute_buckets[-1][0] != minute:
+                self._minute_buckets.append([minute, 0, {}])
+            bucket = self._minute_buckets[-1]
+            bucket[1] += 1
+            bucket[2][error_type.value] = bucket[2].get(error_type.value, 0) + 1
+            
+            record = self._dedup_index.get(key)
+            if record is not None and now - record["_last_seen"] <= DEDUP_WINDOW:
+                record["count"] += 1
+                record["_last_seen"] = now
+                record["last_seen"] = datetime.fromtimestamp(now).isoformat()
+                return record, record["count"]
+            
+            record = {
+                "timestamp": datetime.fromtimestamp(now).isoformat(),
+                "message": error_msg,
+                "context": context,
+                "error_type": error_type.value,
+                "severity": severity.value,
+                "details": details,
+                "traceback": traceback.format_exc(),
+                "count": 1,
+                "last_seen": datetime.fromtimestamp(now).isoformat(),
+                "_last_seen": now
+            }
+            
+            # Tampon doluysa düşecek kaydın tekrar indeksini temizle
+            if len(self.error_history) == self.max_history:
+                evicted = self.error_history[0]
+                evicted_key = (evicted["error_type"], evicted["severity"], evicted["context"], evicted["message"])
+                if self._dedup_index.get(evicted_key) is evicted:
+                    del self._dedup_index[evicted_key]
+            
+            self.error_history.append(record)
+            self._dedup_index[key] = record
+            return record, 1
+    
+    def get_recent_errors(self, count: int = 10) -> List[Dict]:
+        """
+        Son görülme zamanına göre en yeni hata kayıtlarını döner (eskiden yeniye)
+        
+        Args:
+            count: En fazla kaç kayıt
+        """
+        with self._lock:
+            records = sorted(self.error_history, key=lambda record: record["_last_seen"])[-count:]
+            return [{k: v for k, v in record.items() if not k.startswith("_")} for record in records]
+    
+    def get_error_rates(self) -> Dict[str, float]:
+        """
+        Son 1, 5, 15 ve 60 dakikadaki dakika başına ortalama hata sayısını döner
+        """
+        current_minute = int(time.time() // 60)
+        with self._lock:
+            buckets = [(minute, total) for minute, total, _ in self._minute_buckets]
+        
+        rates = {}
+        for window in (1, 5, 15, 60):
+            total = sum(count for minute, count in buckets if current_minute - minute < window)
+            rates[f"last_{window}m"] = total / window
+        return rates
+    
+    def get_error_counts_by_minute(self, minutes: int = 15) -> List[Dict]:
+        """
+        Son dakikaların hata sayılarını türe göre döner (boş dakikalar dahil değildir)
+        """
+        current_minute = int(time.time() // 60)
+        with self._lock:
+            return [
+                {"minute": datetime.fromtimestamp(minute * 60).isoformat(), "total": total, "by_type": dict(by_type)}
+                for minute, total, by_type in self._minute_buckets
+                if current_minute - minute < minutes
+            ]
+    
+    def clear_history(self):
+        """
+        Hata geçmişini ve sayaçları sıfırlar
+        """
+        with self._lock:
+            self.error_history.clear()
+            self._dedup_index.clear()
+            self._minute_buckets.clear()
+            self.total_errors = 0
+            self.type_counts.clear()
+            self.severity_counts.clear()
+    
+    def show_error_dialog(self, title: str, message: str, severity: ErrorSeverity, group: str = None):
+        """
+        Hatayı bildirim özetine ekler
         
-        # Ana thread'de çalıştır
-        if threading.current_thread() == threading.main_thread():
-            show_dialog()
-        else:
-            self.gui_parent.after(0, show_dialog)
+        Modal messagebox yerine bildirimler NotificationAggregator ile türüne
+        göre birleştirilip tek bir modal olmayan pencerede gösterilir; çok
+        sayıda bot aynı anda hata verdiğinde arayüz kilitlenmez.
+        """
+        if self.notifier is None:
+            return
+        self.notifier.notify(title, message, severity, group)
     
     def register_error_callback(self, error_type: ErrorType, callback: Callable):
         """
@@ -293,20 +556,15 @@ class ErrorHandler:
         """
         Hata istatistiklerini döner
         """
-        stats = {
-            "total_errors": len(self.error_history),
-            "by_type": {},
-            "by_severity": {},
-            "recent_errors": self.error_history[-10:] if self.error_history else []
-        }
-        
-        for error in self.error_history:
-            error_type = error["error_type"]
-            severity = error["severity"]
-            
-            stats["by_type"][error_type] = stats["by_type"].get(error_type, 0) + 1
-            stats["by_severity"][severity] = stats["by_severity"].get(severity, 0) + 1
-        
+        with self._lock:
+            stats = {
+                "total_errors": self.total_errors,
+                "unique_errors": len(self.error_history),
+                "by_type": dict(self.type_counts),
+                "by_severity": dict(self.severity_counts)
+            }
+        stats["rates"] = self.get_error_rates()
+        stats["recent_errors"] = self.get_recent_errors(10)
         return stats
     
     def export_error_log(self, file_path: str):
@@ -317,7 +575,7 @@ class ErrorHandler:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump({
                     "export_date": datetime.now().isoformat(),
-                    "error_history": self.error_history,
+                    "error_history": self.get_recent_errors(self.max_history),
                     "statistics": self.get_error_statistics()
                 }, f, indent=2, ensure_ascii=False)
             
@@ -360,35 +618,50 @@ def error_handler_decorator(error_type: ErrorType = ErrorType.UNKNOWN_ERROR,
 
 def retry_on_error(max_retries: int = 3, delay: float = 1.0, 
                   backoff_factor: float = 2.0,
-                  exceptions: tuple = (Exception,)):
+                  exceptions: tuple = (Exception,),
+                  max_delay: float = 30.0,
+                  jitter: bool = True,
+                  sleep: Callable[[float], Any] = None):
     """
     Hata durumunda yeniden deneme decorator'u
+    
+    Beklemeler RetryPolicy ile üstel artar ve tam jitter ile rastgeleleştirilir;
+    devre kesici açıkken (CircuitOpenError) yeniden denenmez.
+    
+    Args:
+        max_retries: İlk denemeden sonraki en fazla tekrar sayısı
+        delay: İlk bekleme üst sınırı (saniye)
+        backoff_factor: Her denemede bekleme üst sınırının çarpanı
+        exceptions: Yeniden denenecek hata sınıfları
+        max_delay: Tek bekleme için üst sınır (saniye)
+        jitter: Beklemeler rastgeleleştirilsin mi
+        sleep: Bekleme fonksiyonu (True dönerse denemeler kesilir); verilmezse time.sleep
     """
+    policy = RetryPolicy(
+        max_retries=max_retries, base_delay=delay, max_delay=max_delay,
+        multiplier=backoff_factor, jitter=jitter,
+        retry_on=lambda error: isinstance(error, exceptions)
+    )
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-            current_delay = delay
+            attempts = 0
             
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    
-                    if attempt < max_retries:
-                        logger.warning(f"{func.__name__} başarısız (deneme {attempt + 1}/{max_retries + 1}): {e}")
-                        logger.info(f"{current_delay} saniye bekleniyor...")
-                        
-                        import time
-                        time.sleep(current_delay)
-                        current_delay *= backoff_factor
-                    else:
-                        logger.error(f"{func.__name__} {max_retries + 1} denemeden sonra başarısız: {e}")
-                        raise
+            def attempt_call():
+                nonlocal attempts
+                attempts += 1
+                return func(*args, **kwargs)
             
-            raise last_exception
-        
+            try:
+                return policy.execute(attempt_call, sleep=sleep or time.sleep, description=func.__name__)
+            except exceptions as e:
+                # Yalnızca tüm denemeler tükendiğinde hata loglanır; tekrar edilmeyen hatalar çağırana kalır
+                if attempts > max_retries:
+                    logger.error(f"{func.__name__} {attempts} denemeden sonra başarısız: {e}")
+                raise
+        
+        wrapper.retry_policy = policy
         return wrapper
     return decorator
 
@@ -455,7 +728,8 @@ class ErrorLogViewer:
         stats = self.error_handler.get_error_statistics()
         
         # İstatistikleri göster
-        stats_text = f"Toplam Hata: {stats['total_errors']}\n"
+        stats_text = f"Toplam Hata: {stats['total_errors']} (farklı kayıt: {stats['unique_errors']}, "
+        stats_text += f"son 1 dk: {stats['rates']['last_1m']:.0f}, son 15 dk: {stats['rates']['last_15m']:.1f}/dk)\n"
         stats_text += "Türe Göre: " + ", ".join([f"{k}: {v}" for k, v in stats['by_type'].items()]) + "\n"
         stats_text += "Önem Seviyesine Göre: " + ", ".join([f"{k}: {v}" for k, v in stats['by_severity'].items()])
         
@@ -464,8 +738,10 @@ class ErrorLogViewer:
         # Hata listesini göster
         self.error_textbox.delete("1.0", "end")
         
-        for error in reversed(self.error_handler.error_history[-50:]):  # Son 50 hata
+        for error in reversed(self.error_handler.get_recent_errors(50)):  # Son 50 hata
             error_text = f"[{error['timestamp']}] {error['severity']} - {error['error_type']}\n"
+            if error['count'] > 1:
+                error_text += f"Tekrar: {error['count']} kez (son: {error['last_seen']})\n"
             error_text += f"Bağlam: {error['context']}\n"
             error_text += f"Mesaj: {error['message']}\n"
             if error['details']:
@@ -479,7 +755,7 @@ class ErrorLogViewer:
         Hata geçmişini temizler
         """
         if messagebox.askyesno("Onay", "Hata geçmişini temizlemek istediğinizden emin misiniz?"):
-            self.error_handler.error_history.clear()
+            self.error_handler.clear_history()
             self.load_error_history()
             messagebox.showinfo("Başarılı", "Hata geçmişi temizlendi!")
     
@@ -0,0 +1,552 @@
+import math
+import time
+import heapq
+import random
+import itertools
+import threading
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+class SimulatedExchangeError(Exception):
+    """
+    Simülatörün reddettiği emirler için hata (mesaj BTCTurk hata kodunu içerir)
+    """
+
+@dataclass
+class SimulatedOrder:
+    """
+    Simülatördeki limit emir
+    """
+    order_id: int
+    symbol: str
+    side: str  # 'buy' veya 'sell'
+    price: float
+    quantity: float
+    remaining: float
+    created_at: float
+    client_id: str = ""
+    status: str = "Untouched"
+    locked: float = 0.0  # Emir için kilitlenen miktar (alışta quote, satışta base varlık)
+
+    def to_api(self) -> Dict[str, Any]:
+        """
+        BTCTurk açık emir formatına çevirir
+        """
+        return {
+            'id': self.order_id,
+            'price': f"{self.price}",
+            'amount': f"{self.remaining}",
+            'quantity': f"{self.quantity}",
+            'pairsymbol': self.symbol,
+            'type': self.side,
+            'method': 'limit',
+            'orderClientId': self.client_id,
+            'time': int(self.created_at * 1000),
+            'updateTime': int(self.created_at * 1000),
+            'status': self.status
+        }
+
+class SyntheticPriceSource:
+    """
+    Geometrik Brown hareketiyle sentetik fiyat üreten kaynak
+    """
+
+    def __init__(self, start_price: float, volatility: float = 0.0005, seed: int = None):
+        """
+        Args:
+            start_price: Başlangıç fiyatı
+            volatility: Saniye başına log getiri standart sapması
+            seed: Tekrarlanabilir testler için rastgele tohum
+        """
+        self.price = start_price
+        self.volatility = volatility
+        self._random = random.Random(seed)
+
+    def next(self, dt: float) -> float:
+        sigma = self.volatility * math.sqrt(max(dt, 0.0))
+        self.price *= math.exp(self._random.gauss(-0.5 * sigma * sigma, sigma))
+        return self.price
+
+class RecordedPriceSource:
+    """
+    Kaydedilmiş tick verisini simülasyon saatine göre yeniden oynatan kaynak
+    """
+
+    def __init__(self, timestamps: np.ndarray, prices: np.ndarray, loop: bool = False):
+        """
+        Args:
+            timestamps: Artan sıralı zaman damgaları
+            prices: Fiyatlar
+            loop: Kayıt bitince başa dön (False ise son fiyatta kalır)
+        """
+        if len(prices) == 0:
+            raise ValueError("Boş fiyat kaydı")
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.loop = loop
+        self.clock = float(self.timestamps[0])
+        self.price = float(self.prices[0])
+
+    @classmethod
+    def from_archive(cls, base_dir: str, symbol: str, **kwargs) -> "RecordedPriceSource":
+        """
+        Piyasa verisi kaydedicisinin arşivinden kaynak oluşturur
+        """
+        from tick_archive import open_tick_archive
+
+        reader = open_tick_archive(base_dir, symbol)
+        if reader is None or len(reader) == 0:
+            raise ValueError(f"Kayıtlı fiyat bulunamadı: {symbol}")
+        columns = reader.columns()
+        return cls(np.array(columns['timestamp']), np.array(columns['price']), **kwargs)
+
+    def next(self, dt: float) -> float:
+        self.clock += dt
+        end = self.timestamps[-1]
+        if self.clock > end and self.loop:
+            self.clock = self.timestamps[0] + (self.clock - end)
+
+        index = int(np.searchsorted(self.timestamps, self.clock, side='right')) - 1
+        self.price = float(self.prices[max(0, index)])
+        return self.price
+
+@dataclass
+class _PairState:
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    source: Any
+    price_scale: int = 2
+    quantity_scale: int = 8
+    tick_size: float = 0.01
+    min_notional: float = 10.0
+    last: float = 0.0
+    open: float = 0.0
+    high: float = 0.0
+    low: float = 0.0
+    volume: float = 0.0
+    updated_at: float = 0.0  # Son fiyat güncellemesinin zamanı
+    bids: List[Tuple[float, int, SimulatedOrder]] = field(default_factory=list)  # (-fiyat, sıra, emir)
+    asks: List[Tuple[float, int, SimulatedOrder]] = field(default_factory=list)  # (fiyat, sıra, emir)
+
+class SimulatedExchange:
+    """
+    BTCTurk Client arayüzünün botun kullandığı kısmını taklit eden yerel borsa
+
+    Her coin çiftinin fiyatı sentetik veya kaydedilmiş bir kaynaktan gelir.
+    Limit emirler fiyat-zaman önceliğiyle eşleşir: gelen emir önce karşı
+    taraftaki bekleyen emirlerle, sonra piyasa fiyatını geçiyorsa piyasa
+    likiditesiyle gerçekleşir; kalanı deftere yazılır. Her fiyat
+    güncellemesi o fiyattan bir piyasa işlemi sayılır ve fiyatı geçen
+    bekleyen emirler kendi limit fiyatlarından gerçekleşir. Bakiyeler emir
+    açılınca kilitlenir, gerçekleşince aktarılır.
+    """
+
+    def __init__(self, balances: Dict[str, float] = None, fee_rate: float = 0.0, spread: float = 0.001):
+        """
+        Args:
+            balances: Başlangıç bakiyeleri {varlık: miktar}
+            fee_rate: İşlem ücreti oranı (quote varlıktan kesilir)
+            spread: Emir defterindeki sentetik alış/satış makası (oran)
+        """
+        self.fee_rate = fee_rate
+        self.spread = spread
+
+        self.pairs: Dict[str, _PairState] = {}
+        self.balances: Dict[str, List[float]] = {}  # {varlık: [serbest, kilitli]}
+        self.orders: Dict[int, SimulatedOrder] = {}
+        self.trades: List[Dict[str, Any]] = []
+
+        self._order_ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        for asset, amount in (balances or {}).items():
+            self.balances[asset] = [float(amount), 0.0]
+
+    def add_pair(self, symbol: str, source, quote_asset: str = None, price_scale: int = 2,
+                 quantity_scale: int = 8, tick_size: float = None, min_notional: float = 10.0):
+        """
+        Coin çifti ekler
+
+        Args:
+            symbol: Coin çifti (örn: BTCTRY)
+            source: Fiyat kaynağı (SyntheticPriceSource, RecordedPriceSource) veya başlangıç fiyatı
+            quote_asset: Karşı varlık (verilmezse sembolden çıkarılır)
+            price_scale: Fiyat ondalık basamağı
+            quantity_scale: Miktar ondalık basamağı
+            tick_size: Fiyat adımı (verilmezse 10^-price_scale)
+            min_notional: Minimum işlem tutarı (quote varlık cinsinden)
+        """
+        if isinstance(source, (int, float)):
+            source = SyntheticPriceSource(float(source))
+        if quote_asset is None:
+            quote_asset = 'TRY' if symbol.endswith('TRY') else symbol[-4:]
+
+        price = float(source.price)
+        self.pairs[symbol] = _PairState(
+            symbol=symbol,
+            base_asset=symbol[:-len(quote_asset)],
+            quote_asset=quote_asset,
+            source=source,
+            price_scale=price_scale,
+            quantity_scale=quantity_scale,
+            tick_size=tick_size or 10 ** -price_scale,
+            min_notional=min_notional,
+            last=price, open=price, high=price, low=price, updated_at=time.time()
+        )
+
+    # ---- Fiyat akışı ----
+
+    def set_price(self, symbol: str, price: float):
+        """
+        Piyasada verilen fiyattan işlem olmuş gibi fiyatı günceller ve
+        fiyatı geçen bekleyen emirleri gerçekleştirir
+        """
+        with self._lock:
+            pair = self.pairs[symbol]
+            pair.last = price
+            pair.updated_at = time.time()
+            pair.high = max(pair.high, price)
+            pair.low = min(pair.low, price)
+
+            # Alış emirleri: fiyat limitin altına indiyse
+            while pair.bids and -pair.bids[0][0] >= price:
+                order = self._peek(pair.bids)
+                if order is None:
+                    continue
+                self._fill(pair, order, order.remaining, order.price)
+
+            # Satış emirleri: fiyat limitin üstüne çıktıysa
+            while pair.asks and pair.asks[0][0] <= price:
+                order = self._peek(pair.asks)
+                if order is None:
+                    continue
+                self._fill(pair, order, order.remaining, order.price)
+
+    def advance(self, dt: float):
+        """
+        Tüm coin çiftlerinin fiyat kaynaklarını dt saniye ilerletir
+        """
+        for symbol, pair in list(self.pairs.items()):
+            self.set_price(symbol, pair.source.next(dt))
+
+    def start(self, interval: float = 1.0, speed: float = 1.0):
+        """
+        Fiyatları arka planda ilerletir
+
+        Args:
+            interval: Güncelleme aralığı (gerçek saniye)
+            speed: Simülasyon hız çarpanı (her aralıkta interval*speed saniye ilerler)
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval, speed), daemon=True)
+        self._thread.start()
+        logger.info(f"Borsa simülatörü başlatıldı - {len(self.pairs)} coin çifti, hız: {speed}x")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self, interval: float, speed: float):
+        while not self._stop_event.wait(interval):
+            try:
+                self.advance(interval * speed)
+            except Exception as e:
+                logger.error(f"Simülatör fiyat güncelleme hatası: {e}")
+
+    # ---- Eşleştirme motoru ----
+
+    @staticmethod
+    def _peek(book: List[Tuple[float, int, SimulatedOrder]]) -> Optional[SimulatedOrder]:
+        """
+        Defterin en öncelikli emrini döndürür; iptal/gerçekleşmiş emirleri atar
+        """
+        order = book[0][2]
+        if order.remaining <= 0 or order.status == 'Canceled':
+            heapq.heappop(book)
+            return None
+        return order
+
+    def _fill(self, pair: _PairState, order: SimulatedOrder, quantity: float, price: float):
+        """
+        Emrin bir kısmını veya tamamını verilen fiyattan gerçekleştirir (kilit altında)
+        """
+        base = self.balances.setdefault(pair.base_asset, [0.0, 0.0])
+        quote = self.balances.setdefault(pair.quote_asset, [0.0, 0.0])
+        notional = quantity * price
+
+        if order.side == 'buy':
+            # Kilitli tutarın bu miktara düşen kısmı serbest bırakılır, gerçek maliyet düşülür
+            released = order.locked * (quantity / order.remaining)
+            order.locked -= released
+            quote[1] -= released
+            quote[0] += released - notional * (1 + self.fee_rate)
+            base[0] += quantity
+        else:
+            order.locked -= quantity
+            base[1] -= quantity
+            quote[0] += notional * (1 - self.fee_rate)
+
+        order.remaining -= quantity
+        if order.remaining <= 1e-12:
+            order.remaining = 0.0
+            order.status = 'Filled'
+            self.orders.pop(order.order_id, None)
+            book = pair.bids if order.side == 'buy' else pair.asks
+            if book and book[0][2] is order:
+                heapq.heappop(book)
+        else:
+            order.status = 'Partial'
+
+        pair.volume += quantity
+        self.trades.append({
+            'order_id': order.order_id, 'symbol': pair.symbol, 'side': order.side,
+            'price': price, 'quantity': quantity, 'timestamp': time.time()
+        })
+        logger.debug(f"SİMÜLATÖR: {pair.symbol} {order.side} {quantity:.8f} @ {price}")
+
+    def _match_incoming(self, pair: _PairState, order: SimulatedOrder):
+        """
+        Yeni emri karşı taraftaki bekleyen emirlerle ve piyasa likiditesiyle eşleştirir
+        """
+        if order.side == 'buy':
+            book, crosses = pair.asks, lambda best: best <= order.price
+        else:
+            book, crosses = pair.bids, lambda best: -best >= order.price
+
+        # Fiyat-zaman önceliği: en iyi fiyat, eşitse en eski emir
+        while order.remaining > 0 and book and crosses(book[0][0]):
+            resting = self._peek(book)
+            if resting is None:
+                continue
+            quantity = min(order.remaining, resting.remaining)
+            self._fill(pair, resting, quantity, resting.price)
+            self._fill(pair, order, quantity, resting.price)
+
+        # Kalan miktar piyasa fiyatını geçiyorsa piyasa likiditesinden alınır
+        if order.remaining > 0:
+            if (order.side == 'buy' and order.price >= pair.last) or \
+               (order.side == 'sell' and order.price <= pair.last):
+                self._fill(pair, order, order.remaining, pair.last)
+
+    # ---- BTCTurk Client arayüzü ----
+
+    def tick(self, pair: str = None) -> List[Dict[str, Any]]:
+        """
+        Ticker verisini döndürür (pair verilmezse tüm coin çiftleri)
+        """
+        with self._lock:
+            symbols = [pair] if pair else list(self.pairs)
+            result = []
+            for symbol in symbols:
+                state = self.pairs.get(symbol)
+                if state is None:
+                    continue
+                half_spread = state.last * self.spread / 2
+                result.append({
+                    'pair': symbol,
+                    'pairNormalized': f"{state.base_asset}_{state.quote_asset}",
+                    'timestamp': int(state.updated_at * 1000),
+                    'last': state.last,
+                    'high': state.high,
+                    'low': state.low,
+                    'bid': state.last - half_spread,
+                    'ask': state.last + half_spread,
+                    'open': state.open,
+                    'volume': state.volume,
+                    'daily': state.last - state.open,
+                    'dailyPercent': (state.last - state.open) / state.open * 100 if state.open else 0.0,
+                    'numeratorSymbol': state.base_asset,
+                    'denominatorSymbol': state.quote_asset
+                })
+            return result
+
+    def get_exchange_info(self) -> List[Dict[str, Any]]:
+        """
+        Coin çifti kurallarını BTCTurk exchange info formatında döndürür
+        """
+        return [{
+            'name': state.symbol,
+            'nameNormalized': f"{state.base_asset}_{state.quote_asset}",
+            'status': 'TRADING',
+            'numerator': state.base_asset,
+            'denominator': state.quote_asset,
+            'numeratorScale': state.quantity_scale,
+            'denominatorScale': state.price_scale,
+            'hasFraction': state.price_scale > 0,
+            'filters': [{
+                'filterType': 'PRICE_FILTER',
+                'minPrice': str(state.tick_size),
+                'maxPrice': '0',
+                'tickSize': str(state.tick_size),
+                'minExchangeValue': str(state.min_notional),
+                'minAmount': None,
+                'maxAmount': None
+            }]
+        } for state in self.pairs.values()]
+
+    def get_account_balance(self) -> List[Dict[str, Any]]:
+        """
+        Bakiyeleri BTCTurk formatında döndürür ('balance' toplam bakiyedir)
+        """
+        with self._lock:
+            return [{
+                'asset': asset,
+                'assetname': asset,
+                'balance': f"{free + locked:.8f}",
+                'locked': f"{locked:.8f}",
+                'free': f"{free:.8f}"
+            } for asset, (free, locked) in self.balances.items()]
+
+    def get_order_book(self, pair: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Bekleyen emirler ve piyasa fiyatı etrafındaki sentetik likiditeden oluşan defteri döndürür
+        """
+        with self._lock:
+            state = self.pairs[pair]
+            levels = {'bids': {}, 'asks': {}}
+            for side, book, sign in (('bids', state.bids, -1), ('asks', state.asks, 1)):
+                for key, _, order in book:
+                    if order.remaining > 0 and order.status != 'Canceled':
+                        price = key * sign
+                        levels[side][price] = levels[side].get(price, 0.0) + order.remaining
+
+            half_spread = state.last * self.spread / 2
+            bid = round(state.last - half_spread, state.price_scale)
+            ask = round(state.last + half_spread, state.price_scale)
+            levels['bids'][bid] = levels['bids'].get(bid, 0.0) + 1e6 / max(bid, 1e-12)
+            levels['asks'][ask] = levels['asks'].get(ask, 0.0) + 1e6 / max(ask, 1e-12)
+
+            return {
+                'timestamp': int(time.time() * 1000),
+                'bids': [[f"{p}", f"{q}"] for p, q in sorted(levels['bids'].items(), reverse=True)[:limit]],
+                'asks': [[f"{p}", f"{q}"] for p, q in sorted(levels['asks'].items())[:limit]]
+            }
+
+    def submit_limit_order(self, quantity: float, price: float, order_type: str, pair_symbol: str,
+                           new_order_client_id: str = None) -> Dict[str, Any]:
+        """
+        Limit emir verir
+
+        Raises:
+            SimulatedExchangeError: Geçersiz emir veya yetersiz bakiye
+        """
+        quantity, price = float(quantity), float(price)
+        side = order_type.lower()
+
+        with self._lock:
+            pair = self.pairs.get(pair_symbol)
+            if pair is None:
+                raise SimulatedExchangeError(f"FAILED_INVALID_PAIR_SYMBOL: {pair_symbol}")
+            if quantity <= 0 or price <= 0 or side not in ('buy', 'sell'):
+                raise SimulatedExchangeError("FAILED_INVALID_ORDER")
+            if quantity * price < pair.min_notional:
+                raise SimulatedExchangeError(f"FAILED_MIN_TOTAL_AMOUNT: {quantity * price:.2f} < {pair.min_notional}")
+
+            if side == 'buy':
+                asset, required = pair.quote_asset, quantity * price * (1 + self.fee_rate)
+            else:
+                asset, required = pair.base_asset, quantity
+            balance = self.balances.setdefault(asset, [0.0, 0.0])
+            if balance[0] + 1e-12 < required:
+                raise SimulatedExchangeError(f"FAILED_INSUFFICIENT_BALANCE: {asset} {balance[0]:.8f} < {required:.8f}")
+            balance[0] -= required
+            balance[1] += required
+
+            order = SimulatedOrder(
+                order_id=next(self._order_ids), symbol=pair_symbol, side=side,
+                price=price, quantity=quantity, remaining=quantity,
+                created_at=time.time(), client_id=new_order_client_id or "", locked=required
+            )
+            self.orders[order.order_id] = order
+            self._match_incoming(pair, order)
+
+            if order.remaining > 0:
+                sequence = next(self._sequence)
+                if side == 'buy':
+                    heapq.heappush(pair.bids, (-price, sequence, order))
+                else:
+                    heapq.heappush(pair.asks, (price, sequence, order))
+
+            return {
+                'id': order.order_id,
+                'datetime': int(order.created_at * 1000),
+                'type': side,
+                'method': 'limit',
+                'price': f"{price}",
+                'quantity': f"{quantity}",
+                'pairSymbol': pair_symbol,
+                'pairSymbolNormalized': f"{pair.base_asset}_{pair.quote_asset}",
+                'newOrderClientId': order.client_id
+            }
+
+    def get_open_orders(self, pair: str = None, **kwargs) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Açık emirleri BTCTurk formatında döndürür ({'asks': [...], 'bids': [...]})
+        """
+        pair_symbol = kwargs.get('pairSymbol', pair)
+        with self._lock:
+            result = {'asks': [], 'bids': []}
+            for order in self.orders.values():
+                if pair_symbol and order.symbol != pair_symbol:
+                    continue
+                result['bids' if order.side == 'buy' else 'asks'].append(order.to_api())
+            return result
+
+    def cancel_order(self, order_id: int) -> bool:
+        """
+        Açık emri iptal eder ve kilitli bakiyeyi serbest bırakır
+        """
+        with self._lock:
+            order = self.orders.pop(int(order_id), None)
+            if order is None:
+                return False
+
+            pair = self.pairs[order.symbol]
+            asset = pair.quote_asset if order.side == 'buy' else pair.base_asset
+            balance = self.balances[asset]
+            balance[0] += order.locked
+            balance[1] -= order.locked
+            order.locked = 0.0
+            order.status = 'Canceled'  # Defterden bir sonraki erişimde atılır
+            return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Simülatör istatistiklerini döndürür
+        """
+        with self._lock:
+            return {
+                'pairs': len(self.pairs),
+                'open_orders': len(self.orders),
+                'trades': len(self.trades),
+                'balances': {asset: free + locked for asset, (free, locked) in self.balances.items()}
+            }
+
+# Global değişkenler
+_simulated_exchange = None
+_simulated_exchange_lock = threading.Lock()
+
+def get_simulated_exchange() -> SimulatedExchange:
+    """
+    API anahtarı olmadan çalışan botların paylaştığı simülatörü döner (yoksa oluşturup başlatır)
+    """
+    global _simulated_exchange
+
+    with _simulated_exchange_lock:
+        if _simulated_exchange is None:
+            exchange = SimulatedExchange(balances={'TRY': 10000.0, 'BTC': 0.001, 'ASR': 100.0})
+            exchange.add_pair('BTCTRY', 2500000.0)
+            exchange.add_pair('ETHTRY', 120000.0)
+            exchange.add_pair('ASRTRY', 0.85, price_scale=4)
+            exchange.start()
+            _simulated_exchange = exchange
+        return _simulated_exchange
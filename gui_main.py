@@ -1,10 +1,13 @@
 from trading_bot import BTCTurkTradingBot
+from market_data_stream import get_market_stream
 import customtkinter as ctk
 import json
 import os
 import random
+import threading
 from tkinter import messagebox
 from datetime import datetime
+from loguru import logger
 
 class CoinAddDialog:
     def __init__(self, parent, available_coins):
@@ -101,12 +104,15 @@ class TradingBotGUI:
         self.price_data = []
         self.time_data = []
         self.strategy = None
+        self.sharded_runtime = None  # Çoklu process modunda bot supervisor'ı
+        self.log_widget_lines = {}  # Bellek izleyici için log widget satır sayıları
         
         # GUI değişkenlerini başlat
         self.setup_variables()
         
         # GUI'yi oluştur
         self.setup_gui()
+        self.update_log_widget_sizes()
         
     def setup_variables(self):
         """GUI değişkenlerini başlatır"""
@@ -269,6 +275,10 @@ class TradingBotGUI:
         ctk.CTkButton(button_frame, text="Temizle", command=self.clear_system_logs, width=80).pack(side="left", padx=5)
         ctk.CTkButton(button_frame, text="Kaydet", command=self.save_system_logs, width=80).pack(side="left", padx=5)
         ctk.CTkButton(button_frame, text="Yenile", command=self.refresh_system_logs, width=80).pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="Gecikme İzleri", command=self.export_latency_traces, width=110).pack(side="left", padx=5)
+        self.profiler_button = ctk.CTkButton(button_frame, text="Profil Başlat", command=self.toggle_profiler, width=110)
+        self.profiler_button.pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="Bellek Raporu", command=self.show_memory_report, width=110).pack(side="left", padx=5)
         
         # Log seviye filtresi
         ctk.CTkLabel(button_frame, text="Seviye:").pack(side="left", padx=(10, 5))
@@ -518,24 +528,16 @@ class TradingBotGUI:
         settings = coin_data['settings']
         
         try:
-            # Yeni bot instance oluştur
-            from trading_bot import BTCTurkTradingBot
-            bot_instance = BTCTurkTradingBot(self.api_key.get(), self.api_secret.get())
-            
-            # Callback fonksiyonlarını ayarla
-            bot_instance.set_callbacks(
-                price_callback=lambda price, profit_pct=0: self.update_coin_price(coin_symbol, price, profit_pct),
-                status_callback=lambda status: self.update_coin_status(coin_symbol, status),
-                trade_callback=lambda trade_info: self.on_coin_trade_completed(coin_symbol, trade_info),
-                balance_callback=self.update_balance_from_bot
-            )
-            
-            # Bot'u başlat
-            bot_instance.start_trading(
-                settings['coin'],
-                settings['target_percentage'],
-                settings['trade_amount']
-            )
+            runtime = self.get_sharded_runtime()
+            if runtime:
+                # Bot, coin çiftine atanan worker process'te çalışır
+                bot_instance = runtime.start_bot(
+                    settings['coin'],
+                    settings['target_percentage'],
+                    settings['trade_amount']
+                )
+            else:
+                bot_instance = self.create_local_bot(coin_symbol, settings)
             
             # Bot instance'ını kaydet
             coin_data['bot_instance'] = bot_instance
@@ -560,6 +562,76 @@ class TradingBotGUI:
             messagebox.showerror("Hata", f"{coin_symbol} botu başlatılamadı: {str(e)}")
             self.add_log(f"{coin_symbol} bot başlatma hatası: {str(e)}", "trading", "ERROR")
     
+    def create_local_bot(self, coin_symbol, settings):
+        """
+        Botu bu process içinde oluşturup başlatır
+        """
+        from trading_bot import BTCTurkTradingBot
+        bot_instance = BTCTurkTradingBot(self.api_key.get(), self.api_secret.get())
+        bot_instance.risk_manager = getattr(self.app_instance, 'risk_manager', None)
+        
+        # Uygulama genelindeki WebSocket akışı açıksa bota bağla
+        stream = get_market_stream()
+        if stream:
+            bot_instance.attach_market_stream(stream)
+        
+        # Callback fonksiyonlarını ayarla
+        bot_instance.set_callbacks(
+            price_callback=lambda price, profit_pct=0: self.update_coin_price(coin_symbol, price, profit_pct),
+            status_callback=lambda status: self.update_coin_status(coin_symbol, status),
+            trade_callback=lambda trade_info: self.on_coin_trade_completed(coin_symbol, trade_info),
+            balance_callback=self.update_balance_from_bot
+        )
+        
+        # Bot'u başlat
+        bot_instance.start_trading(
+            settings['coin'],
+            settings['target_percentage'],
+            settings['trade_amount']
+        )
+        return bot_instance
+    
+    def get_sharded_runtime(self):
+        """
+        Çoklu process modu açıksa bot supervisor'ını döner (yoksa oluşturur)
+        
+        Returns:
+            ShardedBotRuntime: Supervisor, tek process modunda None
+        """
+        settings = getattr(self.settings_manager, 'settings', None)
+        num_workers = getattr(settings, 'worker_processes', 0) if settings else 0
+        if num_workers <= 0:
+            return None
+        
+        if self.sharded_runtime is None:
+            from sharded_runtime import ShardedBotRuntime
+            client = self.bot.client if getattr(self, 'bot', None) else None
+            runtime = ShardedBotRuntime(self.api_key.get(), self.api_secret.get(), num_workers, client=client)
+            runtime.price_callback = self.update_coin_price
+            runtime.status_callback = self.update_coin_status
+            runtime.trade_callback = self.on_coin_trade_completed
+            runtime.balance_callback = self.update_balance_from_bot
+            runtime.start()
+            from metrics_server import register_collector
+            register_collector('sharded_runtime', runtime.collect_metrics)
+            stream = get_market_stream()
+            if stream:
+                runtime.attach_market_stream(stream)
+            self.sharded_runtime = runtime
+            self.add_log(f"Botlar {num_workers} worker process'e dağıtılıyor", "system", "INFO")
+        
+        return self.sharded_runtime
+    
+    def shutdown_sharded_runtime(self, timeout=5.0):
+        """
+        Worker process'lerini durdurur
+        """
+        if self.sharded_runtime:
+            from metrics_server import unregister_collector
+            unregister_collector('sharded_runtime')
+            self.sharded_runtime.stop(timeout)
+            self.sharded_runtime = None
+    
     def stop_coin_bot(self, coin_symbol):
         """
         Belirli bir coin için bot durdurur
@@ -1092,7 +1164,7 @@ class TradingBotGUI:
             
             # Bakiye kontrolü ile test et
             balance = test_bot.get_balance()
-            if balance is not None:
+            if balance:
                 self.profile_status_label.configure(text="API bağlantısı başarılı!", text_color="green")
                 messagebox.showinfo("Başarılı", "API bağlantısı başarılı! Bakiye bilgileri alındı.")
             else:
@@ -1389,10 +1461,11 @@ class TradingBotGUI:
             # Bot oluştur ve test et
             from trading_bot import BTCTurkTradingBot
             self.bot = BTCTurkTradingBot(api_key, api_secret)
+            self.bot.risk_manager = getattr(self.app_instance, 'risk_manager', None)
             
             # Bağlantıyı test et
             balance = self.bot.get_balance()
-            if balance is not None:
+            if balance:
                 self.connect_btn.configure(text="Bağlandı ✓", state="disabled", fg_color="green")
                 
                 # Bakiye bilgilerini güncelle
@@ -1468,6 +1541,48 @@ class TradingBotGUI:
         except Exception as e:
             print(f"Sistem log ekleme hatası: {e}")
     
+    def update_log_widget_sizes(self):
+        """Log widget'larının satır sayısını kaydeder (Tk thread'inde, dakikada bir)"""
+        try:
+            for name in ('system_log_text', 'trading_log_text', 'api_log_text', 'error_log_text'):
+                widget = getattr(self, name, None)
+                if widget is not None:
+                    self.log_widget_lines[name] = int(widget.index("end-1c").split(".")[0])
+        except Exception as e:
+            logger.debug(f"Log widget boyutu okunamadı: {e}")
+        self.root.after(60000, self.update_log_widget_sizes)
+    
+    def show_memory_report(self):
+        """Anlık bellek ölçümü alır ve raporu sistem loguna yazar"""
+        try:
+            from memory_tracker import get_memory_tracker
+            tracker = get_memory_tracker()
+            if not tracker.is_running:
+                messagebox.showinfo("Bilgi", "Bellek izleme kapalı. Ayarlardan 'Bellek İzleme' açılıp "
+                                    "uygulama yeniden başlatılmalıdır.")
+                return
+            
+            def build_report():
+                # Anlık görüntü büyük yığınlarda saniyeler sürebilir; GUI thread'i bekletilmez
+                try:
+                    tracker.take_sample()
+                    report, path = tracker.report(), tracker.write_report()
+                    self.root.after(0, lambda: self.on_memory_report(report, path))
+                except Exception as e:
+                    logger.error(f"Bellek raporu oluşturulamadı: {e}")
+            
+            self.add_system_log("Bellek ölçümü alınıyor...", "INFO")
+            threading.Thread(target=build_report, name="MemoryReport", daemon=True).start()
+        except Exception as e:
+            logger.error(f"Bellek raporu oluşturulamadı: {e}")
+            messagebox.showerror("Hata", f"Bellek raporu oluşturulamadı: {str(e)}")
+    
+    def on_memory_report(self, report, path):
+        """Hazırlanan bellek raporunu sistem loguna yazar"""
+        for line in report.splitlines():
+            self.add_system_log(line, "INFO")
+        self.add_system_log(f"Bellek raporu kaydedildi: {path}", "INFO")
+    
     def clear_system_logs(self):
         """Sistem loglarını temizler"""
         try:
@@ -1504,6 +1619,60 @@ class TradingBotGUI:
         except Exception as e:
             print(f"Log yenileme hatası: {e}")
     
+    def export_latency_traces(self):
+        """Fiyattan emre gecikme izlerini dosyaya aktarır ve aşama özetini loga yazar"""
+        try:
+            from latency_tracing import get_trace_recorder
+            recorder = get_trace_recorder()
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"latency_traces_{timestamp}.json"
+            count = recorder.export(filename, fmt='chrome')
+            
+            for line in recorder.format_summary().splitlines():
+                self.add_system_log(line, "INFO")
+            self.add_system_log(f"{count} gecikme izi kaydedildi: {filename}", "INFO")
+            messagebox.showinfo("Başarılı", f"{count} gecikme izi {filename} dosyasına kaydedildi!\n"
+                                "chrome://tracing veya ui.perfetto.dev ile açılabilir.")
+        except Exception as e:
+            logger.error(f"Gecikme izleri dışa aktarılamadı: {e}")
+            messagebox.showerror("Hata", f"Gecikme izleri dışa aktarılamadı: {str(e)}")
+    
+    def toggle_profiler(self):
+        """Örnekleme profilcisini başlatır; çalışıyorsa durdurup profili kaydeder"""
+        try:
+            from sampling_profiler import get_sampling_profiler, DEFAULT_DURATION
+            profiler = get_sampling_profiler()
+            
+            if profiler.is_running:
+                self.on_profile_complete(profiler.stop())
+                return
+            
+            def on_complete(path):
+                # Örnekleme thread'inden çağrılır; GUI güncellemesi ana thread'e aktarılır
+                self.root.after(0, lambda: self.on_profile_complete(path))
+            
+            if profiler.start(DEFAULT_DURATION, on_complete=on_complete):
+                self.profiler_button.configure(text="Profili Durdur")
+                self.add_system_log(f"Örnekleme profilcisi başlatıldı ({DEFAULT_DURATION:g}s)", "INFO")
+        except Exception as e:
+            logger.error(f"Profilci başlatılamadı: {e}")
+            messagebox.showerror("Hata", f"Profilci başlatılamadı: {str(e)}")
+    
+    def on_profile_complete(self, path):
+        """Profil dosyası yazıldığında buton ve logu günceller"""
+        self.profiler_button.configure(text="Profil Başlat")
+        if not path:
+            self.add_system_log("Profil kaydedilmedi: aktif yığın örneklenmedi", "WARNING")
+            return
+        
+        from sampling_profiler import get_sampling_profiler
+        for label, count in get_sampling_profiler().top_functions(5):
+            self.add_system_log(f"{count:>6} örnek  {label}", "INFO")
+        self.add_system_log(f"Profil kaydedildi: {path}", "INFO")
+        messagebox.showinfo("Başarılı", f"Profil {path} dosyasına kaydedildi!\n"
+                            "flamegraph.pl veya speedscope.app ile açılabilir.")
+    
     def update_coin_list(self):
         """Coin listesini API'den günceller"""
         try:
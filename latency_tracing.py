@@ -0,0 +1,314 @@
+import os
+import json
+import time
+import itertools
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any
+from loguru import logger
+from api_metrics import LatencyHistogram
+
+# Alım-satım kararının aşamaları
+STAGE_PRICE_FETCH = 'price_fetch'
+STAGE_STRATEGY = 'strategy'
+STAGE_RISK_CHECK = 'risk_check'
+STAGE_LIMIT_PRICE = 'limit_price'
+STAGE_NORMALIZE = 'normalize'
+STAGE_CANCEL_OPEN = 'cancel_open_orders'
+STAGE_SUBMIT = 'submit'
+STAGE_FILL_DETECTION = 'fill_detection'
+
+# İz sonuçları
+STATUS_FILLED = 'filled'
+STATUS_SUBMITTED = 'submitted'  # Gönderildi, gerçekleşme izlenmedi
+STATUS_REJECTED = 'rejected'
+STATUS_FAILED = 'failed'
+STATUS_ABANDONED = 'abandoned'  # Gerçekleşme beklenirken bot durdu
+
+DEFAULT_CAPACITY = 512
+
+class _Span:
+    """
+    Aşama süresini ölçen bağlam yöneticisi
+    """
+    __slots__ = ('trace', 'name', 'attrs', 'start_ns')
+
+    def __init__(self, trace: 'Trace', name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.trace.add_span(self.name, self.start_ns, time.perf_counter_ns(), **self.attrs)
+        return False
+
+class Trace:
+    """
+    Tek bir alım-satım kararının fiyat alımından emir gerçekleşmesine kadar izi
+
+    Aşamalar farklı thread'lerde eklenebilir (gerçekleşme tespiti takip
+    thread'inde yapılır). İz, TraceRecorder.finish ile kapatılana kadar
+    kayıt tamponuna girmez; sinyal üretmeyen fiyat kontrollerinin izleri
+    hiç saklanmadan atılır.
+    """
+
+    def __init__(self, trace_id: int, symbol: str, side: str, start_ns: int = None, **attrs):
+        now_ns = time.perf_counter_ns()
+        self.trace_id = trace_id
+        self.symbol = symbol
+        self.side = side
+        self.attrs = attrs
+        self.start_ns = start_ns if start_ns is not None else now_ns
+        self.started_at = time.time() - (now_ns - self.start_ns) / 1e9
+        self.end_ns = None
+        self.status = None
+        self.spans: List[Dict[str, Any]] = []
+        self.marks: Dict[str, int] = {}
+
+    def span(self, name: str, **attrs) -> _Span:
+        """
+        Aşamayı ölçen bağlam yöneticisi döndürür
+
+        Örnek:
+            with trace.span(STAGE_SUBMIT):
+                client.submit_limit_order(...)
+        """
+        return _Span(self, name, attrs)
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, **attrs):
+        """
+        Önceden ölçülmüş aşamayı ekler (perf_counter_ns değerleri)
+        """
+        self.spans.append({'name': name, 'start_ns': start_ns, 'end_ns': end_ns, 'attrs': attrs})
+
+    def mark(self, name: str, at_ns: int = None):
+        """
+        Anlık olayı (örn: emir gönderildi) zaman damgasıyla kaydeder
+        """
+        self.marks[name] = at_ns if at_ns is not None else time.perf_counter_ns()
+
+    def span_since(self, name: str, mark: str, **attrs) -> bool:
+        """
+        Kaydedilmiş bir olaydan şu ana kadar geçen süreyi aşama olarak ekler
+
+        Returns:
+            bool: Olay kaydı varsa True
+        """
+        start_ns = self.marks.get(mark)
+        if start_ns is None:
+            return False
+        self.add_span(name, start_ns, time.perf_counter_ns(), **attrs)
+        return True
+
+    @property
+    def duration(self) -> float:
+        """
+        İzin toplam süresi (saniye); kapatılmadıysa şu ana kadar geçen süre
+        """
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def stage_durations(self) -> Dict[str, float]:
+        """
+        Aşama adı başına toplam süreyi milisaniye cinsinden döndürür
+        """
+        durations: Dict[str, float] = {}
+        for span in self.spans:
+            durations[span['name']] = durations.get(span['name'], 0.0) + (span['end_ns'] - span['start_ns']) / 1e6
+        return durations
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'status': self.status,
+            'started_at': self.started_at,
+            'duration_ms': self.duration * 1000,
+            'attrs': self.attrs,
+            'spans': [
+                {
+                    'name': span['name'],
+                    'offset_ms': (span['start_ns'] - self.start_ns) / 1e6,
+                    'duration_ms': (span['end_ns'] - span['start_ns']) / 1e6,
+                    **({'attrs': span['attrs']} if span['attrs'] else {})
+                }
+                for span in self.spans
+            ],
+            'marks': {name: (at_ns - self.start_ns) / 1e6 for name, at_ns in self.marks.items()}
+        }
+
+class TraceRecorder:
+    """
+    Tamamlanan izleri sabit boyutlu halka tamponda tutan kayıtçı
+
+    Tampon dolunca en eski iz düşer. Aşama başına süreler ayrıca sabit
+    bellekli histogramlarda birikir; böylece tampondan düşen izler de
+    yüzdelik özetlere dahil olur.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: Saklanacak en fazla iz sayısı
+        """
+        self.capacity = capacity
+        self._traces = deque(maxlen=capacity)
+        self._stage_histograms: Dict[str, LatencyHistogram] = {}
+        self._total_histogram = LatencyHistogram()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.status_counts: Dict[str, int] = {}
+        self.enabled = True
+
+    def new_trace(self, symbol: str, side: str, start_ns: int = None, **attrs) -> Trace:
+        """
+        Yeni iz başlatır (kayıt tamponuna finish çağrılınca girer)
+
+        Args:
+            symbol: Coin çifti
+            side: 'buy' veya 'sell'
+            start_ns: İz başlangıcı (perf_counter_ns); geriye dönük aşama
+                eklenecekse ilk aşamanın başlangıcı verilir
+        """
+        return Trace(next(self._ids), symbol, side, start_ns, **attrs)
+
+    def finish(self, trace: Optional[Trace], status: str):
+        """
+        İzi kapatır ve tampona ekler (aynı iz için ikinci çağrı yok sayılır)
+        """
+        if trace is None or not self.enabled:
+            return
+        with self._lock:
+            if trace.end_ns is not None:
+                return
+            trace.end_ns = time.perf_counter_ns()
+            trace.status = status
+            self._traces.append(trace)
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+            for name, duration_ms in trace.stage_durations().items():
+                histogram = self._stage_histograms.get(name)
+                if histogram is None:
+                    histogram = self._stage_histograms[name] = LatencyHistogram()
+                histogram.record(duration_ms / 1000)
+            self._total_histogram.record(trace.duration)
+
+        logger.debug(f"Gecikme izi #{trace.trace_id} ({trace.symbol} {trace.side}, {status}): "
+                     f"{trace.duration * 1000:.1f}ms")
+
+    def recent(self, count: int = None, symbol: str = None) -> List[Dict[str, Any]]:
+        """
+        Son izleri eskiden yeniye döndürür
+
+        Args:
+            count: En fazla kaç iz
+            symbol: Yalnızca bu coin çiftinin izleri
+        """
+        with self._lock:
+            traces = list(self._traces)
+        if symbol:
+            traces = [trace for trace in traces if trace.symbol == symbol]
+        if count:
+            traces = traces[-count:]
+        return [trace.to_dict() for trace in traces]
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aşama başına gecikme yüzdeliklerini döndürür ('total' tüm iz süresidir)
+        """
+        with self._lock:
+            histograms = dict(self._stage_histograms)
+        summary = {name: histogram.summary() for name, histogram in sorted(histograms.items())}
+        summary['total'] = self._total_histogram.summary()
+        return summary
+
+    def format_summary(self) -> str:
+        lines = [f"{'Aşama':<20} {'Adet':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} (ms)"]
+        for name, stats in self.stage_summary().items():
+            lines.append(f"{name:<20} {stats['count']:>6} {stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f} "
+                         f"{stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def export(self, path: str, fmt: str = 'chrome') -> int:
+        """
+        Tampondaki izleri dosyaya yazar
+
+        Args:
+            path: Hedef dosya
+            fmt: 'chrome' (chrome://tracing / Perfetto ile açılan trace event
+                formatı) veya 'json' (iz listesi ve aşama özeti)
+
+        Returns:
+            int: Yazılan iz sayısı
+        """
+        traces = self.recent()
+        if fmt == 'chrome':
+            data = {'traceEvents': self._chrome_events(traces), 'displayTimeUnit': 'ms'}
+        elif fmt == 'json':
+            data = {'exported_at': time.time(), 'summary': self.stage_summary(), 'traces': traces}
+        else:
+            raise ValueError(f"Bilinmeyen dışa aktarma formatı: {fmt}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        logger.info(f"{len(traces)} gecikme izi dışa aktarıldı: {path}")
+        return len(traces)
+
+    @staticmethod
+    def _chrome_events(traces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        İzleri coin çifti başına bir satır olacak şekilde trace event listesine çevirir
+        """
+        events = []
+        rows: Dict[str, int] = {}
+        for trace in traces:
+            tid = rows.setdefault(trace['symbol'], len(rows) + 1)
+            base_us = trace['started_at'] * 1e6
+            events.append({
+                'name': f"{trace['side']} #{trace['trace_id']}", 'cat': 'trade', 'ph': 'X',
+                'ts': base_us, 'dur': trace['duration_ms'] * 1000, 'pid': 1, 'tid': tid,
+                'args': {'status': trace['status'], **trace['attrs']}
+            })
+            for span in trace['spans']:
+                events.append({
+                    'name': span['name'], 'cat': 'stage', 'ph': 'X',
+                    'ts': base_us + span['offset_ms'] * 1000, 'dur': span['duration_ms'] * 1000,
+                    'pid': 1, 'tid': tid, 'args': span.get('attrs', {})
+                })
+        for symbol, tid in rows.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': symbol}})
+        return events
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._stage_histograms.clear()
+            self._total_histogram.reset()
+            self.status_counts.clear()
+
+# Global değişkenler
+_trace_recorder = None
+_trace_recorder_lock = threading.Lock()
+
+def get_trace_recorder() -> TraceRecorder:
+    """
+    Global gecikme izi kayıtçısını döner (yoksa oluşturur)
+    """
+    global _trace_recorder
+
+    with _trace_recorder_lock:
+        if _trace_recorder is None:
+            _trace_recorder = TraceRecorder()
+        return _trace_recorder
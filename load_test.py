@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BTCTurk Trading Bot - Yük Testi
+
+N adet BTCTurkTradingBot'u gecikme eklenmiş yerel borsa simülatörüne karşı
+çalıştırır ve işlem hacmi, fiyat işleme gecikmesi yüzdelikleri, API çağrı
+gecikmeleri, thread sayısı, CPU ve bellek kullanımını raporlar.
+
+Kullanım:
+    python load_test.py --bots 100 --duration 60
+    python load_test.py --sweep 10,50,100,200 --duration 30 --latency 0.05
+"""
+
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from exchange_simulator import SimulatedExchange, SyntheticPriceSource
+from state_store import BotStateStore
+from poll_scheduler import get_poll_scheduler
+
+@dataclass
+class LoadTestConfig:
+    """
+    Yük testi parametreleri
+    """
+    num_bots: int = 50
+    duration: float = 30.0  # saniye
+    tick_interval: float = 0.5  # Simülatör fiyat güncelleme aralığı (saniye)
+    api_latency: float = 0.02  # API çağrısı başına ortalama gecikme (saniye)
+    api_jitter: float = 0.01  # Gecikmeye eklenen rastgele sapma üst sınırı (saniye)
+    volatility: float = 0.002  # Saniye başına fiyat volatilitesi
+    target_percentage: float = 0.5
+    trade_amount: float = 100.0
+    ramp_up: float = 2.0  # Botların başlatılmasının yayıldığı süre (saniye)
+    poll_budget: float = None  # Yoklama zamanlayıcısı istek bütçesi (istek/s, None: değiştirme)
+    sample_interval: float = 1.0  # Kaynak kullanımı örnekleme aralığı (saniye)
+
+class LatencyInjectingClient:
+    """
+    Simülatör çağrılarına ağ gecikmesi ekleyen ve çağrı sürelerini ölçen client sarmalayıcı
+    """
+
+    def __init__(self, exchange: SimulatedExchange, latency: float = 0.02, jitter: float = 0.01):
+        self.exchange = exchange
+        self.latency = latency
+        self.jitter = jitter
+
+        self.call_latencies: Dict[str, List[float]] = {}
+        self.last_ticks: Dict[str, tuple] = {}  # {symbol: (fiyat, yayın zamanı)}
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, *args, **kwargs):
+        start = time.perf_counter()
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            return getattr(self.exchange, method)(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.call_latencies.setdefault(method, []).append(elapsed)
+
+    def tick(self, pair: str = None):
+        tickers = self._call('tick', pair)
+        for ticker in tickers:
+            self.last_ticks[ticker['pair']] = (float(ticker['last']), ticker['timestamp'] / 1000.0)
+        return tickers
+
+    def get_exchange_info(self):
+        return self._call('get_exchange_info')
+
+    def get_account_balance(self):
+        return self._call('get_account_balance')
+
+    def get_order_book(self, pair: str, limit: int = 100):
+        return self._call('get_order_book', pair, limit)
+
+    def submit_limit_order(self, **kwargs):
+        return self._call('submit_limit_order', **kwargs)
+
+    def get_open_orders(self, pair=None, **kwargs):
+        return self._call('get_open_orders', pair, **kwargs)
+
+    def cancel_order(self, order_id):
+        return self._call('cancel_order', order_id)
+
+class ResourceSampler:
+    """
+    Süreç kaynak kullanımını periyodik olarak örnekler
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        last_wall, last_cpu = time.perf_counter(), time.process_time()
+        while not self._stop_event.wait(self.interval):
+            wall, cpu = time.perf_counter(), time.process_time()
+            self.samples.append({
+                'threads': threading.active_count(),
+                'cpu_percent': (cpu - last_cpu) / (wall - last_wall) * 100,
+                'rss_mb': current_rss_mb()
+            })
+            last_wall, last_cpu = wall, cpu
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Sürecin güncel bellek kullanımını (RSS) MB cinsinden döndürür
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    if resource is not None:
+        # Linux dışında yalnızca tepe değer bilinir (macOS: byte, diğerleri: KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    return None
+
+def _percentiles(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """
+    p50/p90/p99/max değerlerini (varsayılan olarak milisaniye) döndürür
+    """
+    if not values:
+        return {'count': 0}
+    data = np.asarray(values) * scale
+    p50, p90, p99 = np.percentile(data, [50, 90, 99])
+    return {'count': len(values), 'p50': float(p50), 'p90': float(p90),
+            'p99': float(p99), 'max': float(data.max())}
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """
+    Yük testini çalıştırır
+
+    Args:
+        config: Test parametreleri
+
+    Returns:
+        dict: Ölçüm sonuçları
+    """
+    from trading_bot import BTCTurkTradingBot
+
+    symbols = [f"LT{i:04d}TRY" for i in range(config.num_bots)]
+    exchange = SimulatedExchange(balances={'TRY': config.num_bots * config.trade_amount * 2})
+    for index, symbol in enumerate(symbols):
+        exchange.add_pair(symbol, SyntheticPriceSource(100.0, config.volatility, seed=index), min_notional=1.0)
+    client = LatencyInjectingClient(exchange, config.api_latency, config.api_jitter)
+
+    if config.poll_budget:
+        get_poll_scheduler().requests_per_second = config.poll_budget
+
+    # Ölçüm durumu
+    tick_latencies: List[float] = []
+    counters = {'price_updates': 0, 'trades': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def count_errors(message):
+        with lock:
+            counters['errors'] += 1
+
+    error_sink = logger.add(count_errors, level="ERROR")
+
+    def make_price_callback(symbol: str):
+        def on_price(price, profit_pct=0):
+            tick = client.last_ticks.get(symbol)
+            with lock:
+                counters['price_updates'] += 1
+                if tick:
+                    tick_latencies.append(time.time() - tick[1])
+        return on_price
+
+    def on_trade(trade_info):
+        with lock:
+            counters['trades'] += 1
+
+    state_dir = tempfile.mkdtemp(prefix="load_test_state_")
+    state_store = BotStateStore(state_dir, snapshot_interval=3600)
+
+    sampler = ResourceSampler(config.sample_interval)
+    sampler.start()
+    threads_before = threading.active_count()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+
+    exchange.start(interval=config.tick_interval)
+
+    bots = []
+    start_latencies = []
+
+    def start_bot(bot, symbol: str):
+        # İlk alım emri start_trading içinde verildiği için süre API gecikmesini de içerir
+        started = time.perf_counter()
+        bot.start_trading(symbol, config.target_percentage, config.trade_amount)
+        with lock:
+            start_latencies.append(time.perf_counter() - started)
+
+    for index, symbol in enumerate(symbols):
+        bot = BTCTurkTradingBot(client=client)
+        bot.state_store = state_store
+        bot.set_callbacks(price_callback=make_price_callback(symbol), trade_callback=on_trade)
+        bots.append(bot)
+
+        threading.Thread(target=start_bot, args=(bot, symbol), daemon=True).start()
+        if config.ramp_up > 0:
+            time.sleep(config.ramp_up / config.num_bots)
+
+    logger.warning(f"Yük testi: {config.num_bots} bot başlatıldı, {config.duration:.0f}s ölçülüyor")
+    time.sleep(config.duration)
+
+    measured_wall = time.perf_counter() - wall_start
+    measured_cpu = time.process_time() - cpu_start
+
+    # Kapatma süresi de kapasite göstergesidir
+    stop_start = time.perf_counter()
+    for bot in bots:
+        bot.stop_trading()
+    stuck = sum(1 for bot in bots if not bot.join(timeout=0.1))
+    stop_seconds = time.perf_counter() - stop_start
+
+    exchange.stop()
+    sampler.stop()
+    logger.remove(error_sink)
+    shutil.rmtree(state_dir, ignore_errors=True)
+
+    samples = sampler.samples
+    rss_values = [s['rss_mb'] for s in samples if s['rss_mb'] is not None]
+    api_calls = sum(len(v) for v in client.call_latencies.values())
+
+    return {
+        'config': asdict(config),
+        'wall_seconds': measured_wall,
+        'price_updates': counters['price_updates'],
+        'price_updates_per_second': counters['price_updates'] / measured_wall,
+        'api_calls': api_calls,
+        'api_calls_per_second': api_calls / measured_wall,
+        'orders_submitted': len(client.call_latencies.get('submit_limit_order', [])),
+        'fills': len(exchange.trades),
+        'trade_callbacks': counters['trades'],
+        'errors': counters['errors'],
+        'tick_latency_ms': _percentiles(tick_latencies),
+        'start_latency_ms': _percentiles(start_latencies),
+        'api_latency_ms': {method: _percentiles(values) for method, values in client.call_latencies.items()},
+        'threads_before': threads_before,
+        'threads_max': max((s['threads'] for s in samples), default=threading.active_count()),
+        'cpu_percent_avg': measured_cpu / measured_wall * 100,
+        'cpu_percent_max': max((s['cpu_percent'] for s in samples), default=0.0),
+        'rss_mb_max': max(rss_values) if rss_values else None,
+        'stop_seconds': stop_seconds,
+        'stuck_threads': stuck
+    }
+
+def format_report(result: Dict[str, Any]) -> str:
+    """
+    Sonuçları okunabilir metin raporuna çevirir
+    """
+    def fmt(p):
+        if not p.get('count'):
+            return "veri yok"
+        return f"p50 {p['p50']:.1f} / p90 {p['p90']:.1f} / p99 {p['p99']:.1f} / max {p['max']:.1f} ms (n={p['count']})"
+
+    config = result['config']
+    rss = f"{result['rss_mb_max']:.1f} MB" if result['rss_mb_max'] is not None else "ölçülemedi"
+    lines = [
+        f"=== Yük Testi: {config['num_bots']} bot, {result['wall_seconds']:.1f}s ===",
+        f"API gecikmesi: {config['api_latency'] * 1000:.0f}±{config['api_jitter'] * 1000:.0f} ms, fiyat aralığı: {config['tick_interval']}s",
+        f"Fiyat güncellemesi: {result['price_updates']} ({result['price_updates_per_second']:.1f}/s)",
+        f"API çağrısı: {result['api_calls']} ({result['api_calls_per_second']:.1f}/s)",
+        f"Emir: {result['orders_submitted']}, gerçekleşme: {result['fills']}, hata logu: {result['errors']}",
+        f"Fiyat işleme gecikmesi: {fmt(result['tick_latency_ms'])}",
+        f"Bot başlatma süresi: {fmt(result['start_latency_ms'])}",
+    ]
+    for method, stats in sorted(result['api_latency_ms'].items()):
+        lines.append(f"  {method}: {fmt(stats)}")
+    lines += [
+        f"Thread: başlangıç {result['threads_before']}, en fazla {result['threads_max']}",
+        f"CPU: ortalama %{result['cpu_percent_avg']:.1f}, en fazla %{result['cpu_percent_max']:.1f}",
+        f"Bellek (RSS): en fazla {rss}",
+        f"Durdurma: {result['stop_seconds']:.2f}s, takılan thread: {result['stuck_threads']}"
+    ]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="BTCTurk Trading Bot yük testi")
+    parser.add_argument('--bots', type=int, default=50, help="Bot sayısı")
+    parser.add_argument('--sweep', type=str, help="Sırayla denenecek bot sayıları (örn: 10,50,100)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Ölçüm süresi (saniye)")
+    parser.add_argument('--tick-interval', type=float, default=0.5, help="Fiyat güncelleme aralığı (saniye)")
+    parser.add_argument('--latency', type=float, default=0.02, help="API gecikmesi (saniye)")
+    parser.add_argument('--jitter', type=float, default=0.01, help="API gecikme sapması (saniye)")
+    parser.add_argument('--volatility', type=float, default=0.002, help="Saniye başına volatilite")
+    parser.add_argument('--poll-budget', type=float, help="Yoklama zamanlayıcısı istek bütçesi (istek/s)")
+    parser.add_argument('--json', type=str, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    # Bot loglarının test süresini domine etmemesi için yalnızca uyarılar ekrana yazılır
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    counts = [int(n) for n in args.sweep.split(',')] if args.sweep else [args.bots]
+    results = []
+    for count in counts:
+        config = LoadTestConfig(
+            num_bots=count, duration=args.duration, tick_interval=args.tick_interval,
+            api_latency=args.latency, api_jitter=args.jitter, volatility=args.volatility,
+            poll_budget=args.poll_budget
+        )
+        result = run_load_test(config)
+        results.append(result)
+        print(format_report(result))
+        print()
+
+    if args.json:
+        import json
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ import os
 import threading
 import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 # Proje kök dizinini sys.path'e ekle
@@ -50,6 +50,16 @@ try:
         ErrorType, ErrorSeverity, BotError, ErrorLogViewer
     )
     from trading_strategy import TradingStrategy, RiskManager
+    from market_data_stream import initialize_market_stream
+    from market_recorder import initialize_market_recorder, get_market_recorder
+    from poll_scheduler import get_poll_scheduler
+    from timer_wheel import get_timer_wheel
+    from latency_tracing import get_trace_recorder, STAGE_PRICE_FETCH, STAGE_STRATEGY
+    from metrics_server import start_metrics_server, stop_metrics_server
+    from sampling_profiler import install_signal_handler, get_sampling_profiler
+    from memory_tracker import get_memory_tracker
+    from reconnect_coordinator import get_reconnect_coordinator, STATE_RECOVERING
+    from retry_policy import add_circuit_listener, STATE_OPEN
 except ImportError as e:
     print(f"Proje modülleri yüklenemedi: {e}")
     print("Lütfen tüm dosyaların doğru konumda olduğundan emin olun")
@@ -74,11 +84,15 @@ class TradingBotApplication:
         self.is_running = False
         self.is_trading_active = False
         self.shutdown_event = threading.Event()
+        self.trading_stop_event = threading.Event()  # Durdur/duraklat/acil durumda beklemeleri keser
         
         # Thread'ler
         self.price_monitor_thread = None
         self.trading_thread = None
         
+        # Periyodik görevler (zamanlayıcı çarkında)
+        self.periodic_timers = []
+        
         self.initialize_application()
     
     def initialize_application(self):
@@ -142,6 +156,9 @@ class TradingBotApplication:
             # Başlangıç kontrollerini yap
             self.perform_startup_checks()
             
+            # Periyodik bakım görevlerini zamanla
+            self.register_periodic_tasks()
+            
             self.is_running = True
             logger.info("BTCTurk Trading Bot başlatıldı")
             
@@ -166,6 +183,26 @@ class TradingBotApplication:
                 api_secret=self.settings_manager.settings.api_secret
             )
             
+            # Piyasa verisi kaydını başlat (ayarlarda açıksa)
+            recorder = None
+            if self.settings_manager.settings.enable_market_recording:
+                recorder = initialize_market_recorder(self.settings_manager.settings.market_data_dir)
+            
+            # WebSocket fiyat akışını başlat (ayarlarda açıksa)
+            if self.settings_manager.settings.enable_websocket:
+                stream = initialize_market_stream(self.settings_manager.settings.websocket_url)
+                if stream:
+                    self.bot.attach_market_stream(stream)
+                    if recorder:
+                        recorder.attach_stream(stream)
+            
+            # Prometheus metrik sunucusunu başlat (ayarlarda port verildiyse)
+            start_metrics_server(self.settings_manager.settings.metrics_port,
+                                 self.settings_manager.settings.metrics_host)
+            
+            # SIGUSR1 ile yeniden başlatmadan örnekleme profili alınabilsin
+            install_signal_handler()
+            
             # Trading stratejisini başlat
             self.trading_strategy = TradingStrategy()
             
@@ -174,6 +211,7 @@ class TradingBotApplication:
                 max_daily_loss=self.settings_manager.settings.max_daily_loss,
                 max_position_size=self.settings_manager.settings.max_position_size
             )
+            self.bot.risk_manager = self.risk_manager
             
             logger.info("Bot bileşenleri başlatıldı")
             
@@ -208,6 +246,12 @@ class TradingBotApplication:
             ErrorType.TRADING_ERROR,
             self.handle_trading_error
         )
+        
+        # Bağlantı kurtarma tek koordinatörde yürür; bir uç noktanın devresi açılınca da başlar.
+        # Koordinatör GUI'den açılanlar dahil bu process'teki tüm botların bağlantısını test eder.
+        coordinator = get_reconnect_coordinator()
+        coordinator.add_listener(self.on_connection_state_change)
+        add_circuit_listener(self.on_circuit_state_change)
     
     def handle_api_error(self, error_info: dict):
         """
@@ -229,8 +273,26 @@ class TradingBotApplication:
         """
         logger.warning("Network hatası tespit edildi, yeniden bağlanmaya çalışılıyor...")
         
-        # Otomatik yeniden bağlanma
-        threading.Thread(target=self.retry_connection, daemon=True).start()
+        # Otomatik yeniden bağlanma (kurtarma sürüyorsa bildirim mevcut döngüye katılır)
+        get_reconnect_coordinator().report_failure(error_info.get("context", ""))
+    
+    def on_circuit_state_change(self, endpoint: str, state: str):
+        """
+        API uç noktasının devre kesicisi açılınca bağlantı kurtarmayı başlatır
+        """
+        if state == STATE_OPEN:
+            get_reconnect_coordinator().report_failure(f"devre:{endpoint}")
+    
+    def on_connection_state_change(self, state: str):
+        """
+        Bağlantı kurtarma durumunu GUI'ye yansıtır
+        """
+        if not self.gui:
+            return
+        if state == STATE_RECOVERING:
+            self.gui.update_status("Bağlantı Koptu - Yeniden Bağlanılıyor", "warning")
+        else:
+            self.gui.update_status("Bağlantı Yeniden Kuruldu", "success")
     
     def handle_trading_error(self, error_info: dict):
         """
@@ -242,34 +304,6 @@ class TradingBotApplication:
         if self.is_trading_active:
             self.emergency_stop()
     
-    def retry_connection(self):
-        """
-        Bağlantıyı yeniden kurmaya çalışır
-        """
-        max_retries = 5
-        retry_delay = 10  # saniye
-        
-        for attempt in range(max_retries):
-            try:
-                if self.bot and self.bot.test_connection():
-                    logger.info("Bağlantı yeniden kuruldu")
-                    if self.gui:
-                        self.gui.update_status("Bağlantı Yeniden Kuruldu", "success")
-                    return True
-                
-            except Exception as e:
-                logger.warning(f"Bağlantı denemesi {attempt + 1} başarısız: {e}")
-            
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-        
-        logger.error("Bağlantı yeniden kurulamadı")
-        if self.gui:
-            self.gui.update_status("Bağlantı Başarısız", "error")
-        
-        return False
-    
     def perform_startup_checks(self):
         """
         Başlangıç kontrollerini yapar
@@ -306,6 +340,61 @@ class TradingBotApplication:
                 "Başlangıç Kontrolü"
             )
     
+    def register_periodic_tasks(self):
+        """
+        Tekrarlanan bakım görevlerini ortak zamanlayıcı çarkına ekler
+        
+        GUI güncellemeleri Tk thread'inde kalmak zorunda olduğu için root.after ile devam eder.
+        """
+        try:
+            wheel = get_timer_wheel()
+            
+            # Günlük risk istatistiklerini gece yarısı sıfırla
+            if self.risk_manager:
+                now = datetime.now()
+                next_midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
+                self.periodic_timers.append(wheel.schedule(
+                    (next_midnight - now).total_seconds(), self.risk_manager.reset_daily_stats,
+                    interval=86400, name="gunluk_risk_sifirlama"
+                ))
+            
+            # Eski log dosyalarını günde bir temizle (dosya işlemi, işçi havuzunda)
+            if self.log_manager:
+                self.periodic_timers.append(wheel.schedule(
+                    86400, self.log_manager.clear_old_logs, 30,
+                    interval=86400, jitter=600, blocking=True, name="log_temizleme"
+                ))
+            
+            # Uzun oturumlarda bellek büyümesini izle (ayarlarda açıksa)
+            if self.settings_manager.settings.enable_memory_tracking:
+                self.start_memory_tracking()
+            
+            logger.info(f"{len(self.periodic_timers)} periyodik görev zamanlandı")
+            
+        except Exception as e:
+            self.error_handler.handle_error(
+                BotError(f"Periyodik görevler zamanlanamadı: {e}", ErrorType.SYSTEM_ERROR),
+                "Periyodik Görevler"
+            )
+    
+    def start_memory_tracking(self):
+        """
+        Bellek izleyiciyi büyüyebilen geçmiş listeleriyle birlikte başlatır
+        """
+        tracker = get_memory_tracker()
+        tracker.register_probe('error_handler.error_history', 'logging',
+                               lambda: len(self.error_handler.error_history))
+        if self.trading_strategy:
+            tracker.register_probe('strategy.price_history', 'strategy',
+                                   lambda: len(self.trading_strategy.price_history))
+            tracker.register_probe('strategy.trade_history', 'strategy',
+                                   lambda: len(self.trading_strategy.trade_history))
+        if self.gui:
+            tracker.register_probe('gui.trade_history', 'gui', lambda: len(self.gui.trade_history))
+            tracker.register_probe('gui.price_data', 'gui', lambda: len(self.gui.price_data))
+            tracker.register_probe('gui.log_widget_lines', 'gui', lambda: sum(self.gui.log_widget_lines.values()))
+        tracker.start(self.settings_manager.settings.memory_snapshot_interval)
+    
     def start_trading(self, coin_pair: str, target_percentage: float, trade_amount: float):
         """
         Trading'i başlatır
@@ -322,14 +411,20 @@ class TradingBotApplication:
             if self.risk_manager:
                 # Bakiye bilgisini al
                 balance_info = self.bot.get_account_balance()
-                try_balance = float(balance_info.get('TRY', {}).get('free', 0)) if balance_info else 10000.0
+                if 'TRY' not in balance_info:
+                    raise BotError("TRY bakiyesi alınamadı", ErrorType.API_ERROR, ErrorSeverity.HIGH)
+                try_balance = float(balance_info['TRY'].get('free', 0) or 0)
                 
-                if not self.risk_manager.can_open_position(trade_amount, try_balance):
+                if try_balance <= 0 or not self.risk_manager.can_open_position(trade_amount, try_balance):
                     raise BotError("Risk limitleri aşıldı", ErrorType.TRADING_ERROR, ErrorSeverity.HIGH)
             
             # Trading parametrelerini ayarla
             self.bot.set_trading_params(coin_pair, target_percentage, trade_amount)
             
+            # Akış varsa fiyatlar stratejiye geldikleri anda eklenir
+            if self.bot.market_stream:
+                self.bot.market_stream.subscribe_ticker(coin_pair, self._on_stream_price)
+            
             # Trading thread'ini başlat
             self.trading_thread = threading.Thread(
                 target=self._trading_loop,
@@ -338,6 +433,7 @@ class TradingBotApplication:
             )
             
             self.is_trading_active = True
+            self.trading_stop_event.clear()
             self.trading_thread.start()
             
             logger.info(f"Trading başlatıldı: {coin_pair}, Hedef: %{target_percentage}, Miktar: {trade_amount}")
@@ -355,30 +451,44 @@ class TradingBotApplication:
         """
         Ana trading döngüsü
         """
+        poll_scheduler = get_poll_scheduler()
+        poll_scheduler.register(coin_pair, base_interval=self.settings_manager.settings.price_check_interval)
+        
         try:
             check_interval = self.settings_manager.settings.price_check_interval
             
-            while self.is_trading_active and not self.shutdown_event.is_set():
+            while self.is_trading_active and not self.trading_stop_event.is_set():
                 try:
-                    # Fiyat bilgisini al
+                    # Fiyat bilgisini al (süre yalnızca karar çıkarsa ize eklenir)
+                    fetch_start = time.perf_counter_ns()
                     current_price = self.bot.get_current_price(coin_pair)
+                    fetch_end = time.perf_counter_ns()
                     
                     if current_price is None:
                         logger.warning("Fiyat bilgisi alınamadı")
-                        time.sleep(check_interval)
+                        poll_scheduler.wait(coin_pair, self.trading_stop_event)
                         continue
                     
+                    poll_scheduler.update_price(coin_pair, current_price)
+                    
                     # GUI'yi güncelle
                     if self.gui:
                         self.gui.update_price_display(coin_pair, current_price)
                     
                     # Trading stratejisini kontrol et
                     if self.trading_strategy:
-                        self.trading_strategy.add_price_data(current_price)
+                        if not self.bot.market_stream:
+                            self.trading_strategy.add_price_data(current_price)
                         
                         # Alım sinyali kontrolü
-                        if not self.bot.has_position and self.trading_strategy.should_buy():
-                            if self.bot.place_buy_order(coin_pair, trade_amount):
+                        trace = get_trace_recorder().new_trace(coin_pair, 'buy', start_ns=fetch_start)
+                        trace.add_span(STAGE_PRICE_FETCH, fetch_start, fetch_end)
+                        with trace.span(STAGE_STRATEGY):
+                            buy_signal = not self.bot.has_position and self.trading_strategy.should_buy()
+                        
+                        # Risk kontrolü place_buy_order içinde, emir hazırlığından önce yapılır
+                        if buy_signal:
+                            if self.bot.place_buy_order(coin_pair, trade_amount, trace=trace):
                                 logger.info(f"Alım emri verildi: {coin_pair} - {trade_amount} TRY")
                                 
                                 if self.risk_manager:
@@ -406,14 +516,15 @@ class TradingBotApplication:
                                     self.stop_trading()
                                     break
                     
-                    time.sleep(check_interval)
+                    # Bir sonraki yoklamanın zamanını volatilite ve bütçeye göre zamanlayıcı belirler
+                    poll_scheduler.wait(coin_pair, self.trading_stop_event)
                     
                 except Exception as e:
                     self.error_handler.handle_error(
                         BotError(f"Trading döngüsü hatası: {e}", ErrorType.TRADING_ERROR),
                         "Trading Döngüsü"
                     )
-                    time.sleep(check_interval * 2)  # Hata durumunda daha uzun bekle
+                    self.trading_stop_event.wait(check_interval * 2)  # Hata durumunda daha uzun bekle
             
         except Exception as e:
             self.error_handler.handle_error(
@@ -421,18 +532,32 @@ class TradingBotApplication:
                 "Trading Döngüsü"
             )
         finally:
+            poll_scheduler.unregister(coin_pair)
             self.is_trading_active = False
             if self.gui:
                 self.gui.update_status("Trading Durduruldu", "stopped")
     
+    def _on_stream_price(self, symbol: str, price: float, data: dict):
+        """
+        WebSocket akışından gelen fiyatı stratejiye ekler
+        """
+        if self.is_trading_active and self.trading_strategy:
+            self.trading_strategy.add_price_point(price)
+    
     def stop_trading(self):
         """
         Trading'i durdurur
         """
         try:
             self.is_trading_active = False
+            self.trading_stop_event.set()
             
-            if self.trading_thread and self.trading_thread.is_alive():
+            if self.bot and self.bot.market_stream:
+                for symbol in list(self.bot.market_stream.ticker_callbacks):
+                    self.bot.market_stream.remove_callbacks(symbol, self._on_stream_price)
+            
+            if (self.trading_thread and self.trading_thread.is_alive()
+                    and self.trading_thread is not threading.current_thread()):
                 self.trading_thread.join(timeout=5)
             
             logger.info("Trading durduruldu")
@@ -448,6 +573,7 @@ class TradingBotApplication:
         Trading'i geçici olarak duraklatır
         """
         self.is_trading_active = False
+        self.trading_stop_event.set()
         logger.info("Trading duraklatıldı")
         
         if self.gui:
@@ -460,13 +586,20 @@ class TradingBotApplication:
         try:
             logger.critical("ACİL DURUM DURDURMA AKTİF!")
             
-            # Tüm açık pozisyonları kapat
-            if self.bot and self.bot.has_position:
-                self.bot.emergency_sell_all()
+            # Önce tüm beklemeleri kes ki hiçbir bot yeni emir vermesin
+            self.trading_stop_event.set()
+            if self.bot:
+                self.bot.stop_trading()
+            if self.gui and hasattr(self.gui, 'stop_all_bots'):
+                self.gui.stop_all_bots()
             
             # Trading'i durdur
             self.stop_trading()
             
+            # Tüm açık pozisyonları kapat
+            if self.bot and self.bot.has_position:
+                self.bot.emergency_sell_all()
+            
             # GUI'de uyarı göster
             if self.gui:
                 self.gui.update_status("ACİL DURUM DURDURMA", "emergency")
@@ -555,10 +688,39 @@ class TradingBotApplication:
             
             # Shutdown event'ini set et
             self.shutdown_event.set()
+            self.trading_stop_event.set()
             
-            # Thread'lerin bitmesini bekle
+            # Thread'lerin bitmesini ortak bir süre sınırı içinde bekle
+            deadline = time.time() + 3
             if self.trading_thread and self.trading_thread.is_alive():
-                self.trading_thread.join(timeout=3)
+                self.trading_thread.join(timeout=max(0.0, deadline - time.time()))
+            if self.bot:
+                self.bot.stop_trading()
+                if not self.bot.join(timeout=max(0.0, deadline - time.time())):
+                    logger.warning("Bot takip thread'i süre sınırında durmadı")
+            
+            # Worker process'lerini durdur
+            if self.gui and hasattr(self.gui, 'shutdown_sharded_runtime'):
+                self.gui.shutdown_sharded_runtime(timeout=max(0.5, deadline - time.time()))
+            
+            # Periyodik görevleri durdur
+            for timer in self.periodic_timers:
+                timer.cancel()
+            get_timer_wheel().stop()
+            
+            # Kaydedicideki bekleyen veriyi diske yaz
+            recorder = get_market_recorder()
+            if recorder:
+                recorder.stop()
+            
+            stop_metrics_server()
+            get_reconnect_coordinator().stop()
+            get_sampling_profiler().stop()
+            
+            memory_tracker = get_memory_tracker()
+            if memory_tracker.is_running:
+                memory_tracker.write_report()
+                memory_tracker.stop()
             
             # Ayarları kaydet
             if self.settings_manager:
@@ -0,0 +1,615 @@
+import json
+import time
+import base64
+import hashlib
+import socket
+import struct
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+BTCTURK_WS_URL = "wss://ws-feed-pro.btcturk.com/"
+
+# BTCTurk WebSocket mesaj tipleri
+MSG_SUBSCRIPTION = 151
+MSG_TICKER_PAIR = 402
+MSG_TRADE_LIST = 421
+MSG_TRADE_SINGLE = 422
+MSG_ORDERBOOK_FULL = 431
+MSG_ORDERBOOK_DIFF = 432
+
+class MarketDataStream:
+    """
+    BTCTurk WebSocket piyasa verisi istemcisi
+
+    Ticker ve trade kanallarına abone olur, gelen her güncellemeyi kayıtlı
+    callback'lere anında iletir. Son fiyatlar REST yoklamasına gerek
+    kalmadan okunabilsin diye bellekte tutulur.
+    """
+
+    def __init__(self, url: str = BTCTURK_WS_URL, reconnect_delay: float = 5.0,
+                 record_path: str = None):
+        """
+        Args:
+            url: WebSocket adresi (yerel replay sunucusu için ws://127.0.0.1:port)
+            reconnect_delay: Bağlantı koptuğunda yeniden bağlanma beklemesi (saniye)
+            record_path: Verilirse gelen ham mesajlar JSON satırları olarak kaydedilir
+        """
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.record_path = record_path
+
+        self.subscriptions = set()  # {(channel, symbol)}
+        self.ticker_callbacks: Dict[str, List[Callable]] = defaultdict(list)
+        self.trade_callbacks: Dict[str, List[Callable]] = defaultdict(list)
+        self.message_listeners: Dict[int, List[Callable]] = defaultdict(list)
+
+        self.latest_prices: Dict[str, Tuple[float, float]] = {}  # {symbol: (price, receive_time)}
+        self.is_connected = False
+        self.message_count = 0
+
+        self._ws = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._record_file = None
+
+    def subscribe_ticker(self, symbol: str, callback: Callable = None):
+        """
+        Coin çifti için ticker kanalına abone olur
+
+        Args:
+            symbol: Coin çifti (örn: BTCTRY)
+            callback: callback(symbol, price, data) şeklinde çağrılır
+        """
+        if callback:
+            self.ticker_callbacks[symbol].append(callback)
+        self._subscribe('ticker', symbol)
+
+    def subscribe_trades(self, symbol: str, callback: Callable = None):
+        """
+        Coin çifti için trade kanalına abone olur
+
+        Args:
+            symbol: Coin çifti
+            callback: callback(symbol, price, amount, timestamp) şeklinde çağrılır
+        """
+        if callback:
+            self.trade_callbacks[symbol].append(callback)
+        self._subscribe('trade', symbol)
+
+    def subscribe_channel(self, channel: str, symbol: str):
+        """
+        Herhangi bir kanala abone olur (örn: orderbook, obdiff)
+        """
+        self._subscribe(channel, symbol)
+
+    def add_message_listener(self, message_type: int, callback: Callable):
+        """
+        Belirli mesaj tipi için ham mesaj dinleyicisi ekler
+
+        Args:
+            message_type: BTCTurk mesaj tipi (örn: 431)
+            callback: callback(payload) şeklinde çağrılır
+        """
+        self.message_listeners[message_type].append(callback)
+
+    def remove_callbacks(self, symbol: str, callback: Callable):
+        """
+        Coin çifti için kayıtlı callback'i kaldırır
+        """
+        for registry in (self.ticker_callbacks, self.trade_callbacks):
+            if callback in registry.get(symbol, []):
+                registry[symbol].remove(callback)
+
+    def _subscribe(self, channel: str, symbol: str):
+        """
+        Aboneliği kaydeder ve bağlantı açıksa hemen gönderir
+        """
+        key = (channel, symbol)
+        with self._lock:
+            if key in self.subscriptions:
+                return
+            self.subscriptions.add(key)
+
+        if self.is_connected:
+            self._send_subscription(channel, symbol)
+
+    def _send_subscription(self, channel: str, symbol: str, join: bool = True):
+        """
+        Abonelik mesajını gönderir
+        """
+        message = [MSG_SUBSCRIPTION, {
+            "type": MSG_SUBSCRIPTION,
+            "channel": channel,
+            "event": symbol,
+            "join": join
+        }]
+        try:
+            self._ws.send(json.dumps(message))
+            logger.debug(f"WebSocket aboneliği gönderildi: {channel} - {symbol}")
+        except Exception as e:
+            logger.warning(f"WebSocket aboneliği gönderilemedi ({channel} - {symbol}): {e}")
+
+    def start(self) -> bool:
+        """
+        WebSocket bağlantısını ayrı thread'de başlatır
+
+        Returns:
+            bool: Başlatma başarılı ise True
+        """
+        if websocket is None:
+            logger.error("websocket-client kütüphanesi yüklü değil, WebSocket akışı başlatılamadı")
+            return False
+
+        if self._thread and self._thread.is_alive():
+            return True
+
+        if self.record_path:
+            self._record_file = open(self.record_path, 'a', encoding='utf-8')
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"WebSocket piyasa verisi akışı başlatıldı: {self.url}")
+        return True
+
+    def stop(self):
+        """
+        WebSocket bağlantısını kapatır
+        """
+        self._stop_event.set()
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+
+        if self._record_file:
+            self._record_file.close()
+            self._record_file = None
+
+        logger.info("WebSocket piyasa verisi akışı durduruldu")
+
+    def _run(self):
+        """
+        Bağlantıyı açık tutar, koptuğunda yeniden bağlanır (ayrı thread'de çalışır)
+        """
+        while not self._stop_event.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            self._ws.run_forever(ping_interval=30, ping_timeout=10)
+
+            if self._stop_event.wait(self.reconnect_delay):
+                break
+            logger.info("WebSocket yeniden bağlanıyor...")
+
+    def _on_open(self, ws):
+        self.is_connected = True
+        logger.info("WebSocket bağlantısı açıldı")
+
+        with self._lock:
+            subscriptions = list(self.subscriptions)
+
+        for channel, symbol in subscriptions:
+            self._send_subscription(channel, symbol)
+
+    def _on_close(self, ws, close_status_code=None, close_msg=None):
+        self.is_connected = False
+        logger.warning(f"WebSocket bağlantısı kapandı: {close_status_code} {close_msg or ''}")
+
+    def _on_error(self, ws, error):
+        logger.error(f"WebSocket hatası: {error}")
+
+    def _on_message(self, ws, raw_message: str):
+        receive_time = time.time()
+        self.message_count += 1
+
+        if self._record_file:
+            try:
+                self._record_file.write(json.dumps({"t": receive_time, "msg": raw_message}) + "\n")
+            except Exception as e:
+                logger.warning(f"WebSocket mesajı kaydedilemedi: {e}")
+
+        try:
+            message = json.loads(raw_message)
+            if not isinstance(message, list) or len(message) < 2:
+                return
+            message_type, payload = message[0], message[1]
+        except (ValueError, TypeError):
+            logger.debug(f"Çözümlenemeyen WebSocket mesajı: {raw_message[:200]}")
+            return
+
+        try:
+            self.dispatch(message_type, payload, receive_time)
+        except Exception as e:
+            logger.error(f"WebSocket mesajı işlenirken hata ({message_type}): {e}")
+
+    def dispatch(self, message_type: int, payload: Any, receive_time: float = None):
+        """
+        Çözümlenmiş mesajı ilgili callback'lere iletir
+
+        Args:
+            message_type: BTCTurk mesaj tipi
+            payload: Mesaj içeriği
+            receive_time: Mesajın alındığı zaman
+        """
+        if receive_time is None:
+            receive_time = time.time()
+
+        if message_type == MSG_TICKER_PAIR and isinstance(payload, dict):
+            self._handle_ticker(payload, receive_time)
+        elif message_type == MSG_TRADE_SINGLE and isinstance(payload, dict):
+            self._handle_trade(payload)
+        elif message_type == MSG_TRADE_LIST and isinstance(payload, dict):
+            for item in payload.get('items', []):
+                item.setdefault('PS', payload.get('event'))
+                self._handle_trade(item)
+
+        for listener in self.message_listeners.get(message_type, []):
+            try:
+                listener(payload)
+            except Exception as e:
+                logger.error(f"WebSocket dinleyici hatası ({message_type}): {e}")
+
+    def _handle_ticker(self, payload: Dict, receive_time: float):
+        symbol = payload.get('PS')
+        if not symbol or payload.get('LA') is None:
+            return
+
+        price = float(payload['LA'])
+        self.latest_prices[symbol] = (price, receive_time)
+
+        for callback in list(self.ticker_callbacks.get(symbol, [])):
+            try:
+                callback(symbol, price, payload)
+            except Exception as e:
+                logger.error(f"Ticker callback hatası ({symbol}): {e}")
+
+    def _handle_trade(self, payload: Dict):
+        symbol = payload.get('PS')
+        if not symbol or payload.get('P') is None:
+            return
+
+        price = float(payload['P'])
+        amount = float(payload.get('A', 0) or 0)
+        timestamp = float(payload.get('D', time.time() * 1000)) / 1000.0
+
+        for callback in list(self.trade_callbacks.get(symbol, [])):
+            try:
+                callback(symbol, price, amount, timestamp)
+            except Exception as e:
+                logger.error(f"Trade callback hatası ({symbol}): {e}")
+
+    def get_latest_price(self, symbol: str, max_age: float = 5.0) -> Optional[float]:
+        """
+        Akıştan gelen son fiyatı döndürür
+
+        Args:
+            symbol: Coin çifti
+            max_age: Kabul edilebilir maksimum veri yaşı (saniye)
+
+        Returns:
+            float: Son fiyat, veri yoksa veya eskiyse None
+        """
+        entry = self.latest_prices.get(symbol)
+        if not entry:
+            return None
+
+        price, receive_time = entry
+        if time.time() - receive_time > max_age:
+            return None
+        return price
+
+class MarketDataReplayServer:
+    """
+    Kaydedilmiş piyasa verisini yerel WebSocket sunucusu olarak yeniden oynatır
+
+    BTCTurk akışının yerine geçer; MarketDataStream(url=server.url) ile
+    çevrimdışı test yapılabilir. Yalnızca standart kütüphane kullanır.
+    """
+
+    WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    def __init__(self, messages: List[Tuple[float, str]] = None, recording_path: str = None,
+                 host: str = "127.0.0.1", port: int = 0, speed: float = 1.0, loop: bool = False):
+        """
+        Args:
+            messages: [(zaman, ham_mesaj)] listesi
+            recording_path: MarketDataStream(record_path=...) ile kaydedilmiş dosya
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş port seçilir)
+            speed: Oynatma hızı çarpanı (0 ise beklemeden gönderilir)
+            loop: Kayıt bitince başa dönülsün mü
+        """
+        if messages is None:
+            messages = self.load_recording(recording_path) if recording_path else []
+
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.loop = loop
+
+        self._server_socket = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.client_count = 0
+
+    @staticmethod
+    def load_recording(path: str) -> List[Tuple[float, str]]:
+        """
+        Kayıt dosyasını yükler
+
+        Args:
+            path: JSON satırları formatında kayıt dosyası
+
+        Returns:
+            list: [(zaman, ham_mesaj)] listesi
+        """
+        messages = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                raw = entry['msg'] if isinstance(entry['msg'], str) else json.dumps(entry['msg'])
+                messages.append((float(entry['t']), raw))
+        return messages
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/"
+
+    def start(self):
+        """
+        Sunucuyu ayrı thread'de başlatır
+        """
+        self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server_socket.bind((self.host, self.port))
+        self._server_socket.listen(5)
+        self._server_socket.settimeout(0.5)
+        self.port = self._server_socket.getsockname()[1]
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Piyasa verisi replay sunucusu başlatıldı: {self.url} ({len(self.messages)} mesaj)")
+
+    def stop(self):
+        """
+        Sunucuyu durdurur
+        """
+        self._stop_event.set()
+        if self._server_socket:
+            try:
+                self._server_socket.close()
+            except OSError:
+                pass
+        logger.info("Piyasa verisi replay sunucusu durduruldu")
+
+    def _accept_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                conn, _ = self._server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self.client_count += 1
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _serve_client(self, conn: socket.socket):
+        try:
+            if not self._handshake(conn):
+                conn.close()
+                return
+
+            subscribed = set()
+            closed = threading.Event()
+            reader = threading.Thread(target=self._read_client, args=(conn, subscribed, closed), daemon=True)
+            reader.start()
+
+            # İstemcinin abonelik mesajlarını göndermesi için kısa süre bekle
+            deadline = time.time() + 1.0
+            while not subscribed and time.time() < deadline and not closed.is_set():
+                time.sleep(0.01)
+
+            self._replay(conn, subscribed, closed)
+        except OSError:
+            pass
+        finally:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _handshake(self, conn: socket.socket) -> bool:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return False
+            request += chunk
+
+        headers = {}
+        for line in request.decode('latin-1').split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get('sec-websocket-key')
+        if not key:
+            return False
+
+        accept = base64.b64encode(hashlib.sha1((key + self.WS_GUID).encode()).digest()).decode()
+        response = ("HTTP/1.1 101 Switching Protocols\r\n"
+                    "Upgrade: websocket\r\n"
+                    "Connection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\n\r\n")
+        conn.sendall(response.encode())
+        return True
+
+    def _read_client(self, conn: socket.socket, subscribed: set, closed: threading.Event):
+        """
+        İstemciden gelen çerçeveleri okur (abonelik, ping, kapanış)
+        """
+        try:
+            while not closed.is_set():
+                frame = self._recv_frame(conn)
+                if frame is None:
+                    break
+
+                opcode, payload = frame
+                if opcode == 0x8:  # close
+                    break
+                if opcode == 0x9:  # ping -> pong
+                    conn.sendall(self._encode_frame(payload, opcode=0xA))
+                    continue
+                if opcode != 0x1:
+                    continue
+
+                try:
+                    message = json.loads(payload.decode('utf-8'))
+                    if isinstance(message, list) and message and message[0] == MSG_SUBSCRIPTION:
+                        request = message[1]
+                        if request.get('join', True):
+                            subscribed.add(request.get('event'))
+                        else:
+                            subscribed.discard(request.get('event'))
+                except (ValueError, AttributeError, IndexError):
+                    continue
+        except OSError:
+            pass
+        finally:
+            closed.set()
+
+    def _replay(self, conn: socket.socket, subscribed: set, closed: threading.Event):
+        while not closed.is_set() and not self._stop_event.is_set():
+            previous_time = None
+
+            for message_time, raw in self.messages:
+                if closed.is_set() or self._stop_event.is_set():
+                    return
+
+                if previous_time is not None and self.speed > 0:
+                    delay = (message_time - previous_time) / self.speed
+                    if delay > 0 and self._stop_event.wait(delay):
+                        return
+                previous_time = message_time
+
+                if not self._matches_subscription(raw, subscribed):
+                    continue
+
+                conn.sendall(self._encode_frame(raw.encode('utf-8')))
+
+            if not self.loop:
+                # Kayıt bitti, bağlantıyı istemci kapatana kadar açık tut
+                closed.wait()
+                return
+
+    @staticmethod
+    def _matches_subscription(raw: str, subscribed: set) -> bool:
+        if not subscribed or 'all' in subscribed:
+            return True
+        try:
+            message = json.loads(raw)
+            payload = message[1]
+            symbol = payload.get('PS') or payload.get('event')
+        except (ValueError, IndexError, AttributeError):
+            return True
+        return symbol is None or symbol in subscribed
+
+    @staticmethod
+    def _encode_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack("!H", length)
+        else:
+            header += bytes([127]) + struct.pack("!Q", length)
+        return header + payload
+
+    @staticmethod
+    def _recv_exact(conn: socket.socket, size: int) -> Optional[bytes]:
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _recv_frame(self, conn: socket.socket) -> Optional[Tuple[int, bytes]]:
+        header = self._recv_exact(conn, 2)
+        if header is None:
+            return None
+
+        opcode = header[0] & 0x0F
+        masked = header[1] & 0x80
+        length = header[1] & 0x7F
+
+        if length == 126:
+            extended = self._recv_exact(conn, 2)
+            if extended is None:
+                return None
+            length = struct.unpack("!H", extended)[0]
+        elif length == 127:
+            extended = self._recv_exact(conn, 8)
+            if extended is None:
+                return None
+            length = struct.unpack("!Q", extended)[0]
+
+        mask = self._recv_exact(conn, 4) if masked else b""
+        if masked and mask is None:
+            return None
+
+        payload = self._recv_exact(conn, length) if length else b""
+        if payload is None:
+            return None
+
+        if masked:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+        return opcode, payload
+
+# Global değişkenler
+_market_stream = None
+
+def initialize_market_stream(url: str = BTCTURK_WS_URL, record_path: str = None) -> Optional[MarketDataStream]:
+    """
+    Uygulama genelinde kullanılacak WebSocket akışını başlatır
+    """
+    global _market_stream
+
+    if _market_stream is not None:
+        return _market_stream
+
+    stream = MarketDataStream(url=url, record_path=record_path)
+    if not stream.start():
+        return None
+
+    _market_stream = stream
+    return _market_stream
+
+def get_market_stream() -> Optional[MarketDataStream]:
+    """
+    Global WebSocket akışını döner
+    """
+    return _market_stream
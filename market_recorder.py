@@ -0,0 +1,300 @@
+import os
+import json
+import time
+import queue
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+# Kaydedilen veri türleri
+KIND_TICK = 'tick'
+KIND_TRADE = 'trade'
+
+class _ColumnBuffer:
+    """
+    Tek bir coin çifti/veri türü için bekleyen satırlar
+    """
+
+    def __init__(self):
+        self.timestamps: List[float] = []
+        self.prices: List[float] = []
+        self.volumes: List[float] = []
+        self.created_at = time.time()
+
+    def append(self, timestamp: float, price: float, volume: float):
+        self.timestamps.append(timestamp)
+        self.prices.append(price)
+        self.volumes.append(volume)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+class MarketDataRecorder:
+    """
+    Tick ve trade verilerini arka planda sıkıştırılmış sütunlu dosyalara yazan sınıf
+
+    Trading thread'leri yalnızca sınırlı bir kuyruğa ekleme yapar (dolu ise
+    kayıt düşürülür, asla beklenmez). Yazıcı thread veriyi coin çifti ve tür
+    bazında biriktirir, parça dolunca veya süre dolunca .npz dosyasına yazar
+    ve coin çiftinin index.json dosyasını günceller.
+
+    Dizin yapısı: base_dir/SYMBOL/{tick|trade}_YYYYMMDD_HHMMSS_NNNN.npz
+    """
+
+    def __init__(self, base_dir: str = "market_data", chunk_size: int = 10000,
+                 flush_interval: float = 60.0, max_queue: int = 100000):
+        """
+        Args:
+            base_dir: Kayıt dizini
+            chunk_size: Parça başına maksimum satır
+            flush_interval: Parça dolmasa da yazma aralığı (saniye)
+            max_queue: Bekleyen kayıt sınırı
+        """
+        self.base_dir = base_dir
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[Tuple[str, str, float, float, float]]" = queue.Queue(maxsize=max_queue)
+        self._buffers: Dict[Tuple[str, str], _ColumnBuffer] = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._chunk_seq = 0
+        self._index_lock = threading.Lock()
+
+        # İstatistikler
+        self.recorded_count = 0
+        self.dropped_count = 0
+        self.chunk_count = 0
+
+    def start(self):
+        """
+        Yazıcı thread'ini başlatır
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Piyasa verisi kaydedici başlatıldı: {self.base_dir}")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Kuyruktaki veriyi yazıp thread'i durdurur
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logger.info(f"Piyasa verisi kaydedici durduruldu - Kayıt: {self.recorded_count}, Düşen: {self.dropped_count}")
+
+    def record_tick(self, symbol: str, price: float, volume: float = 0.0, timestamp: float = None):
+        """
+        Ticker fiyatını kaydeder (bloklamaz)
+        """
+        self._enqueue(symbol, KIND_TICK, price, volume, timestamp)
+
+    def record_trade(self, symbol: str, price: float, amount: float, timestamp: float = None):
+        """
+        Gerçekleşen işlemi kaydeder (bloklamaz)
+        """
+        self._enqueue(symbol, KIND_TRADE, price, amount, timestamp)
+
+    def _enqueue(self, symbol: str, kind: str, price: float, volume: float, timestamp: Optional[float]):
+        if timestamp is None:
+            timestamp = time.time()
+        try:
+            self._queue.put_nowait((symbol, kind, timestamp, price, volume))
+        except queue.Full:
+            self.dropped_count += 1
+            if self.dropped_count % 1000 == 1:
+                logger.warning(f"Kaydedici kuyruğu dolu, veri düşürülüyor (toplam: {self.dropped_count})")
+
+    def attach_stream(self, stream):
+        """
+        WebSocket akışındaki tüm ticker ve trade mesajlarını kaydeder
+
+        Args:
+            stream: MarketDataStream örneği
+        """
+        from market_data_stream import MSG_TICKER_PAIR, MSG_TRADE_SINGLE
+
+        def on_ticker(payload):
+            if isinstance(payload, dict) and payload.get('PS') and payload.get('LA') is not None:
+                self.record_tick(payload['PS'], float(payload['LA']), float(payload.get('V', 0) or 0))
+
+        def on_trade(payload):
+            if isinstance(payload, dict) and payload.get('PS') and payload.get('P') is not None:
+                timestamp = float(payload['D']) / 1000.0 if payload.get('D') else None
+                self.record_trade(payload['PS'], float(payload['P']), float(payload.get('A', 0) or 0), timestamp)
+
+        stream.add_message_listener(MSG_TICKER_PAIR, on_ticker)
+        stream.add_message_listener(MSG_TRADE_SINGLE, on_trade)
+
+    def _writer_loop(self):
+        """
+        Kuyruğu boşaltır ve parçaları diske yazar (ayrı thread'de çalışır)
+        """
+        while not (self._stop_event.is_set() and self._queue.empty()):
+            try:
+                symbol, kind, timestamp, price, volume = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._flush_expired()
+                continue
+
+            key = (symbol, kind)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = _ColumnBuffer()
+                self._buffers[key] = buffer
+
+            buffer.append(timestamp, price, volume)
+            self.recorded_count += 1
+
+            if len(buffer) >= self.chunk_size:
+                self._write_chunk(symbol, kind, self._buffers.pop(key))
+            elif self._queue.empty():
+                self._flush_expired()
+
+        # Kapanışta kalan her şeyi yaz
+        for (symbol, kind), buffer in list(self._buffers.items()):
+            if len(buffer):
+                self._write_chunk(symbol, kind, buffer)
+        self._buffers.clear()
+
+    def _flush_expired(self):
+        now = time.time()
+        for key, buffer in list(self._buffers.items()):
+            if len(buffer) and now - buffer.created_at >= self.flush_interval:
+                self._write_chunk(key[0], key[1], self._buffers.pop(key))
+
+    def _write_chunk(self, symbol: str, kind: str, buffer: _ColumnBuffer):
+        """
+        Tamponu sıkıştırılmış .npz parçası olarak yazar ve index'i günceller
+        """
+        try:
+            timestamps = np.asarray(buffer.timestamps, dtype=np.float64)
+            prices = np.asarray(buffer.prices, dtype=np.float64)
+            volumes = np.asarray(buffer.volumes, dtype=np.float64)
+
+            # Kuyruk sırası zaman sırası olmayabilir (REST ve akış karışık)
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, prices, volumes = timestamps[order], prices[order], volumes[order]
+
+            symbol_dir = os.path.join(self.base_dir, symbol)
+            os.makedirs(symbol_dir, exist_ok=True)
+
+            start_label = datetime.fromtimestamp(timestamps[0]).strftime('%Y%m%d_%H%M%S')
+            while True:
+                # Önceki çalıştırmalardan kalan aynı isimli parçanın üzerine yazma
+                self._chunk_seq += 1
+                file_name = f"{kind}_{start_label}_{self._chunk_seq:04d}.npz"
+                path = os.path.join(symbol_dir, file_name)
+                if not os.path.exists(path):
+                    break
+
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(f, timestamp=timestamps, price=prices, volume=volumes)
+            os.replace(temp_path, path)
+
+            self._append_index(symbol_dir, {
+                'file': file_name,
+                'kind': kind,
+                'start': float(timestamps[0]),
+                'end': float(timestamps[-1]),
+                'count': int(len(timestamps)),
+                'min_price': float(prices.min()),
+                'max_price': float(prices.max())
+            })
+            self.chunk_count += 1
+            logger.debug(f"Piyasa verisi parçası yazıldı: {path} ({len(timestamps)} satır)")
+
+        except Exception as e:
+            logger.error(f"Piyasa verisi parçası yazılamadı ({symbol}/{kind}): {e}")
+
+    def _append_index(self, symbol_dir: str, entry: Dict[str, Any]):
+        index_path = os.path.join(symbol_dir, "index.json")
+        with self._index_lock:
+            entries = load_index(symbol_dir)
+            entries.append(entry)
+            temp_path = index_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(temp_path, index_path)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Kaydedici istatistiklerini döndürür
+        """
+        return {
+            'recorded': self.recorded_count,
+            'dropped': self.dropped_count,
+            'chunks': self.chunk_count,
+            'queued': self._queue.qsize(),
+            'buffered': sum(len(buffer) for buffer in self._buffers.values())
+        }
+
+def load_index(symbol_dir: str) -> List[Dict[str, Any]]:
+    """
+    Coin çifti dizinindeki parça index'ini okur
+
+    Args:
+        symbol_dir: base_dir/SYMBOL dizini
+
+    Returns:
+        list: Parça kayıtları
+    """
+    index_path = os.path.join(symbol_dir, "index.json")
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def list_chunks(base_dir: str, symbol: str, kind: str = KIND_TICK,
+                start: float = None, end: float = None) -> List[Dict[str, Any]]:
+    """
+    Zaman aralığıyla kesişen parçaları index'ten bulur (dosyaları açmadan)
+
+    Returns:
+        list: Başlangıç zamanına göre sıralı parça kayıtları
+    """
+    entries = [
+        entry for entry in load_index(os.path.join(base_dir, symbol))
+        if entry['kind'] == kind
+        and (start is None or entry['end'] >= start)
+        and (end is None or entry['start'] <= end)
+    ]
+    return sorted(entries, key=lambda entry: entry['start'])
+
+def load_chunk(path: str) -> Dict[str, np.ndarray]:
+    """
+    Parça dosyasını yükler
+
+    Returns:
+        dict: {'timestamp', 'price', 'volume'} dizileri
+    """
+    with np.load(path) as data:
+        return {name: data[name] for name in ('timestamp', 'price', 'volume')}
+
+# Global değişkenler
+_market_recorder = None
+
+def initialize_market_recorder(base_dir: str = "market_data") -> MarketDataRecorder:
+    """
+    Uygulama genelinde kullanılacak kaydediciyi başlatır
+    """
+    global _market_recorder
+
+    if _market_recorder is None:
+        _market_recorder = MarketDataRecorder(base_dir)
+        _market_recorder.start()
+    return _market_recorder
+
+def get_market_recorder() -> Optional[MarketDataRecorder]:
+    """
+    Global kaydediciyi döner
+    """
+    return _market_recorder
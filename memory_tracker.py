@@ -0,0 +1,413 @@
+import os
+import time
+import threading
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_INTERVAL = 300.0  # 5 dakika
+DEFAULT_HISTORY = 288  # 5 dakikada bir alınırsa 24 saat
+DEFAULT_FRAMES = 8
+TOP_GROWERS = 10
+RSS_WARNING_MB_PER_HOUR = 50.0
+
+# Dosya adına göre alt sistem eşlemesi (önce proje modülleri, sonra kütüphane dizinleri)
+SUBSYSTEM_MODULES = {
+    'strategy': ('trading_strategy.py', 'candle_aggregator.py', 'order_book.py', 'price_board.py'),
+    'trading': ('trading_bot.py', 'order_normalizer.py', 'balance_cache.py', 'poll_scheduler.py',
+                'sharded_runtime.py', 'exchange_simulator.py'),
+    'gui': ('gui_main.py', 'settings_manager.py', 'main.py'),
+    'logging': ('error_handler.py',),
+    'persistence': ('state_store.py', 'market_recorder.py', 'tick_archive.py'),
+    'network': ('market_data_stream.py',),
+    'diagnostics': ('api_metrics.py', 'latency_tracing.py', 'metrics_server.py', 'sampling_profiler.py',
+                    'memory_tracker.py', 'timer_wheel.py'),
+}
+SUBSYSTEM_PACKAGES = {
+    'gui': ('customtkinter', 'tkinter', 'PIL'),
+    'logging': ('loguru', 'logging'),
+    'persistence': ('json', 'sqlite3', 'pickle', 'csv', 'gzip'),
+    'network': ('requests', 'urllib3', 'websocket', 'ssl', 'http', 'socket', 'btcturk_api'),
+}
+OTHER_SUBSYSTEM = 'other'
+
+def get_rss_bytes() -> Optional[int]:
+    """
+    Process'in fiziksel bellek kullanımını döndürür (bilinmiyorsa None)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # Linux dışında ru_maxrss tepe değerdir (macOS'ta bayt, diğerlerinde KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    return None
+
+def _build_subsystem_index() -> Tuple[Dict[str, str], Tuple[Tuple[str, str], ...]]:
+    modules = {filename: name for name, filenames in SUBSYSTEM_MODULES.items() for filename in filenames}
+    packages = tuple((f"{os.sep}{package}{os.sep}", name)
+                     for name, package_names in SUBSYSTEM_PACKAGES.items() for package in package_names)
+    packages += tuple((f"{os.sep}{package}.py", name)
+                      for name, package_names in SUBSYSTEM_PACKAGES.items() for package in package_names)
+    return modules, packages
+
+_MODULE_SUBSYSTEMS, _PACKAGE_SUBSYSTEMS = _build_subsystem_index()
+
+def subsystem_for(filename: str) -> str:
+    """
+    Ayırmanın yapıldığı dosyayı alt sisteme eşler
+
+    Args:
+        filename: tracemalloc çerçevesinin dosya yolu
+
+    Returns:
+        str: Alt sistem adı ('other' eşleşme yoksa)
+    """
+    subsystem = _MODULE_SUBSYSTEMS.get(os.path.basename(filename))
+    if subsystem:
+        return subsystem
+    for marker, name in _PACKAGE_SUBSYSTEMS:
+        if marker in filename:
+            return name
+    return OTHER_SUBSYSTEM
+
+def subsystem_for_traceback(traceback) -> str:
+    """
+    Ayırmayı yığındaki en içteki proje modülüne göre alt sisteme eşler
+
+    Örneğin GUI'nin json.load ile okuduğu işlem geçmişi, json yerine GUI'ye
+    yazılır. Yığında proje modülü yoksa en içteki kütüphane eşlemesi kullanılır.
+
+    Args:
+        traceback: tracemalloc.Traceback (en yeni çerçeve başta)
+    """
+    fallback = OTHER_SUBSYSTEM
+    for frame in traceback:
+        subsystem = _MODULE_SUBSYSTEMS.get(os.path.basename(frame.filename))
+        if subsystem:
+            return subsystem
+        if fallback == OTHER_SUBSYSTEM:
+            fallback = subsystem_for(frame.filename)
+    return fallback
+
+class MemorySample:
+    """
+    Tek bir bellek ölçümü
+    """
+    __slots__ = ('timestamp', 'rss', 'traced', 'subsystems', 'probes')
+
+    def __init__(self, timestamp: float, rss: Optional[int], traced: int,
+                 subsystems: Dict[str, int], probes: Dict[str, int]):
+        self.timestamp = timestamp
+        self.rss = rss
+        self.traced = traced
+        self.subsystems = subsystems
+        self.probes = probes
+
+class MemoryTracker:
+    """
+    Uzun süre çalışan oturumlarda bellek büyümesini izleyen tanılama aracı
+
+    tracemalloc ile periyodik anlık görüntü alır, ayırmaları dosya adına göre
+    alt sistemlere (strateji, GUI, loglama, kalıcılık...) dağıtır ve bir
+    önceki ölçüme göre en çok büyüyen satırları raporlar. Ayrıca RSS eğilimi
+    ve kayıtlı kap boyutları (örn: işlem geçmişi listeleri) izlenir; böylece
+    tracemalloc'un görmediği C eklentisi büyümeleri de RSS eğiliminden fark
+    edilebilir.
+
+    tracemalloc her ayırmada ek maliyet getirdiği için varsayılan olarak
+    kapalıdır; start() çağrılınca açılır, stop() ile kapanır.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, history: int = DEFAULT_HISTORY,
+                 frames: int = DEFAULT_FRAMES):
+        """
+        Args:
+            interval: Anlık görüntü aralığı (saniye)
+            history: Saklanacak ölçüm sayısı
+            frames: Ayırma başına saklanacak yığın derinliği; alt sistem eşlemesi
+                için yığında proje modülüne ulaşacak kadar derin olmalıdır
+        """
+        self.interval = interval
+        self.frames = frames
+        self.samples = deque(maxlen=history)
+        self._probes: Dict[str, Tuple[str, Callable[[], int]]] = {}
+        self._previous_snapshot = None
+        self._last_growers: List[Dict[str, Any]] = []
+        self._timer = None
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def register_probe(self, name: str, subsystem: str, size_fn: Callable[[], int]):
+        """
+        Boyutu izlenecek bir kap ekler
+
+        Args:
+            name: Görünen ad (örn: 'strategy.trade_history')
+            subsystem: Alt sistem adı
+            size_fn: Eleman sayısını döndüren fonksiyon; GUI widget'larına
+                dokunmamalıdır (ölçüm zamanlayıcı thread'inde yapılır)
+        """
+        with self._lock:
+            self._probes[name] = (subsystem, size_fn)
+
+    def unregister_probe(self, name: str):
+        with self._lock:
+            self._probes.pop(name, None)
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer is not None
+
+    def start(self, interval: float = None):
+        """
+        tracemalloc'u açar ve periyodik ölçümü zamanlayıcı çarkına ekler
+
+        Args:
+            interval: Anlık görüntü aralığı (verilmezse mevcut değer)
+        """
+        if self.is_running:
+            return
+        if interval:
+            self.interval = interval
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+
+        from timer_wheel import get_timer_wheel
+        self._timer = get_timer_wheel().schedule(
+            self.interval, self.take_sample, interval=self.interval,
+            blocking=True, name="bellek_olcumu"
+        )
+
+        from metrics_server import register_collector
+        register_collector('memory_tracker', self.collect_metrics)
+
+        self.take_sample()
+        logger.info(f"Bellek izleyici başlatıldı - Aralık: {self.interval:g}s")
+
+    def stop(self):
+        """
+        Periyodik ölçümü durdurur ve (kendi açtıysa) tracemalloc'u kapatır
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        from metrics_server import unregister_collector
+        unregister_collector('memory_tracker')
+
+        with self._lock:
+            self._previous_snapshot = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        logger.info("Bellek izleyici durduruldu")
+
+    def take_sample(self) -> MemorySample:
+        """
+        Anlık görüntü alır, alt sistemlere dağıtır ve büyüyen satırları hesaplar
+
+        Returns:
+            MemorySample: Alınan ölçüm
+        """
+        subsystems: Dict[str, int] = {}
+        traced = 0
+        growers: List[Dict[str, Any]] = []
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ))
+            for stat in snapshot.statistics('traceback'):
+                subsystem = subsystem_for_traceback(stat.traceback)
+                subsystems[subsystem] = subsystems.get(subsystem, 0) + stat.size
+                traced += stat.size
+
+            with self._lock:
+                previous = self._previous_snapshot
+                self._previous_snapshot = snapshot
+            if previous is not None:
+                growers = self._top_growers(snapshot, previous)
+
+        with self._lock:
+            probes = dict(self._probes)
+        probe_sizes = {}
+        for name, (subsystem, size_fn) in probes.items():
+            try:
+                probe_sizes[name] = int(size_fn())
+            except Exception as e:
+                logger.debug(f"Bellek ölçüm kabı okunamadı ({name}): {e}")
+
+        sample = MemorySample(time.time(), get_rss_bytes(), traced, subsystems, probe_sizes)
+        with self._lock:
+            self.samples.append(sample)
+            if growers:
+                self._last_growers = growers
+
+        self._log_sample(sample)
+        return sample
+
+    @staticmethod
+    def _top_growers(snapshot, previous, limit: int = TOP_GROWERS) -> List[Dict[str, Any]]:
+        """
+        Önceki görüntüye göre en çok büyüyen ayırma satırları
+        """
+        growers = []
+        for diff in snapshot.compare_to(previous, 'lineno'):
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            growers.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'subsystem': subsystem_for_traceback(diff.traceback),
+                'size': diff.size,
+                'size_diff': diff.size_diff,
+                'count_diff': diff.count_diff
+            })
+            if len(growers) >= limit:
+                break
+        return growers
+
+    def _log_sample(self, sample: MemorySample):
+        rss_text = f"{sample.rss / 1e6:.1f} MB" if sample.rss is not None else "bilinmiyor"
+        trend = self.rss_trend()
+        trend_text = f", eğilim: {trend:+.1f} MB/saat" if trend is not None else ""
+        logger.info(f"Bellek ölçümü - RSS: {rss_text}, izlenen: {sample.traced / 1e6:.1f} MB{trend_text}")
+        if trend is not None and trend > RSS_WARNING_MB_PER_HOUR:
+            logger.warning(f"Bellek kullanımı sürekli artıyor: {trend:+.1f} MB/saat "
+                           f"(rapor için bellek izleyici raporuna bakın)")
+
+    def rss_trend(self) -> Optional[float]:
+        """
+        RSS'in saatlik değişim eğilimini (MB/saat) en küçük kareler ile hesaplar
+
+        Returns:
+            float: Eğim (en az 3 ölçüm ve 10 dakikalık pencere yoksa None)
+        """
+        with self._lock:
+            points = [(sample.timestamp, sample.rss) for sample in self.samples if sample.rss is not None]
+        if len(points) < 3 or points[-1][0] - points[0][0] < 600:
+            return None
+
+        mean_t = sum(t for t, _ in points) / len(points)
+        mean_r = sum(r for _, r in points) / len(points)
+        variance = sum((t - mean_t) ** 2 for t, _ in points)
+        if variance == 0:
+            return None
+        slope = sum((t - mean_t) * (r - mean_r) for t, r in points) / variance
+        return slope * 3600 / 1e6
+
+    def top_growers(self) -> List[Dict[str, Any]]:
+        """
+        Son iki ölçüm arasında en çok büyüyen satırlar
+        """
+        with self._lock:
+            return list(self._last_growers)
+
+    def report(self) -> str:
+        """
+        Alt sistem dağılımı, kap boyutları, büyüyen satırlar ve RSS eğilimini
+        okunabilir metin olarak döndürür
+        """
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return "Bellek ölçümü yok"
+
+        first, last = samples[0], samples[-1]
+        elapsed_h = (last.timestamp - first.timestamp) / 3600
+        lines = [f"Bellek raporu - {len(samples)} ölçüm, {elapsed_h:.1f} saat"]
+
+        if last.rss is not None:
+            rss_line = f"RSS: {last.rss / 1e6:.1f} MB"
+            if first.rss is not None:
+                rss_line += f" (başlangıç: {first.rss / 1e6:.1f} MB)"
+            trend = self.rss_trend()
+            if trend is not None:
+                rss_line += f", eğilim: {trend:+.1f} MB/saat"
+            lines.append(rss_line)
+
+        if last.subsystems:
+            lines.append(f"{'Alt sistem':<14} {'Şimdi (KB)':>12} {'Değişim (KB)':>13}")
+            for name, size in sorted(last.subsystems.items(), key=lambda item: -item[1]):
+                delta = size - first.subsystems.get(name, 0)
+                lines.append(f"{name:<14} {size / 1024:>12.1f} {delta / 1024:>+13.1f}")
+        else:
+            lines.append("tracemalloc kapalı: alt sistem dağılımı yok")
+
+        if last.probes:
+            lines.append(f"{'Kap':<32} {'Eleman':>8} {'Değişim':>8}")
+            for name, size in sorted(last.probes.items()):
+                lines.append(f"{name:<32} {size:>8} {size - first.probes.get(name, size):>+8}")
+
+        growers = self.top_growers()
+        if growers:
+            lines.append("En çok büyüyen satırlar (son ölçüm aralığı):")
+            for grower in growers:
+                lines.append(f"  {grower['size_diff'] / 1024:>+9.1f} KB  {grower['count_diff']:>+7} blok  "
+                             f"[{grower['subsystem']}] {grower['location']}")
+        return "\n".join(lines)
+
+    def write_report(self, directory: str = "logs") -> str:
+        """
+        Raporu zaman damgalı dosyaya yazar
+
+        Returns:
+            str: Dosya yolu
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"memory_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report() + "\n")
+        logger.info(f"Bellek raporu yazıldı: {path}")
+        return path
+
+    def collect_metrics(self) -> List[Any]:
+        """
+        Son ölçümü metrik sunucusu için ailelere çevirir
+        """
+        from metrics_server import MetricFamily
+
+        with self._lock:
+            last = self.samples[-1] if self.samples else None
+            probe_subsystems = {name: subsystem for name, (subsystem, _) in self._probes.items()}
+        if last is None:
+            return []
+
+        subsystems = MetricFamily("memory_subsystem_bytes", "gauge", "Alt sisteme göre izlenen bellek")
+        for name, size in last.subsystems.items():
+            subsystems.add(size, subsystem=name)
+        probes = MetricFamily("memory_container_items", "gauge", "İzlenen kapların eleman sayısı")
+        for name, size in last.probes.items():
+            probes.add(size, container=name, subsystem=probe_subsystems.get(name, OTHER_SUBSYSTEM))
+        return [subsystems, probes]
+
+# Global değişkenler
+_memory_tracker = None
+_memory_tracker_lock = threading.Lock()
+
+def get_memory_tracker() -> MemoryTracker:
+    """
+    Global bellek izleyicisini döner (yoksa oluşturur)
+    """
+    global _memory_tracker
+
+    with _memory_tracker_lock:
+        if _memory_tracker is None:
+            _memory_tracker = MemoryTracker()
+        return _memory_tracker
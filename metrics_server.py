@@ -0,0 +1,397 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
+from loguru import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "btcturk_"
+
+# API gecikme histogramı için Prometheus 'le' sınırları (saniye)
+API_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TRACE_QUANTILES = (0.5, 0.9, 0.99)
+CIRCUIT_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+PROCESS_START_TIME = time.time()
+
+class MetricFamily:
+    """
+    Tek bir metrik adının tüm örnekleri (Prometheus metin formatı için)
+    """
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        """
+        Args:
+            name: Önek hariç metrik adı
+            metric_type: 'counter', 'gauge', 'histogram' veya 'summary'
+            help_text: HELP satırı
+        """
+        self.name = METRIC_PREFIX + name
+        self.type = metric_type
+        self.help = help_text
+        self.samples: List[Tuple[str, Dict[str, Any], float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels):
+        """
+        Örnek ekler
+
+        Args:
+            value: Değer
+            suffix: Ad soneki (histogram için _bucket/_sum/_count)
+            **labels: Etiketler
+        """
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(value_)}"' for key, value_ in labels.items())
+                lines.append(f"{self.name}{suffix}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{self.name}{suffix} {_format_value(value)}")
+        return "\n".join(lines)
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value))
+
+# ---------------------------------------------------------------------------
+# Toplayıcılar
+#
+# Tüm değerler sorgu anında okunur; trading yolunda yalnızca botların kendi
+# tam sayı sayaçları artırılır, kilit veya kuyruk kullanılmaz.
+# ---------------------------------------------------------------------------
+
+_collectors: Dict[str, Callable[[], List[MetricFamily]]] = {}
+_collectors_lock = threading.Lock()
+
+def register_collector(name: str, collector: Callable[[], List[MetricFamily]]):
+    """
+    Ek metrik toplayıcısı kaydeder (aynı adla kayıt öncekinin yerini alır)
+
+    Args:
+        name: Toplayıcı adı
+        collector: Sorgu anında MetricFamily listesi döndüren fonksiyon
+    """
+    with _collectors_lock:
+        _collectors[name] = collector
+
+def unregister_collector(name: str):
+    with _collectors_lock:
+        _collectors.pop(name, None)
+
+def build_bot_families(statuses: Iterable[Tuple[str, Dict[str, Any], str]],
+                       workers: Iterable[str] = ()) -> List[MetricFamily]:
+    """
+    Bot durum özetlerini (BTCTurkTradingBot.get_status çıktısı) metrik ailelerine çevirir
+
+    Yerel botlar ve worker process'lerdeki botlar aynı ad ve etiketlerle
+    yayınlansın diye her iki kaynak da bu fonksiyonu kullanır.
+
+    Args:
+        statuses: (coin çifti, durum özeti, worker etiketi) üçlüleri
+        workers: Botu olmasa da açık pozisyon sayısı (0) yayınlanacak worker etiketleri
+
+    Returns:
+        list: MetricFamily listesi
+    """
+    ticks = MetricFamily("bot_ticks_processed_total", "counter", "Botun işlediği fiyat güncellemesi sayısı")
+    orders = MetricFamily("bot_orders_total", "counter", "Sonuca göre emir sayısı")
+    running = MetricFamily("bot_running", "gauge", "Bot çalışıyor mu (1/0)")
+    position = MetricFamily("bot_position_open", "gauge", "Açık pozisyon var mı (1/0)")
+    price = MetricFamily("bot_last_price", "gauge", "Botun gördüğü son fiyat")
+    tick_age = MetricFamily("bot_last_tick_age_seconds", "gauge", "Son fiyat güncellemesinden bu yana geçen süre")
+    realized = MetricFamily("bot_realized_pnl_try", "gauge", "Gerçekleşen kar/zarar (TRY)")
+    unrealized = MetricFamily("bot_unrealized_pnl_try", "gauge", "Açık pozisyonun güncel fiyatla kar/zararı (TRY)")
+    open_positions = MetricFamily("open_positions", "gauge", "Açık pozisyonu olan bot sayısı")
+
+    now = time.time()
+    positions_by_worker: Dict[str, int] = {worker: 0 for worker in workers}
+    for symbol, status, worker in statuses:
+        labels = {'symbol': symbol, 'worker': worker}
+        ticks.add(status.get('ticks_processed', 0), **labels)
+        for result, count in status.get('order_counts', {}).items():
+            orders.add(count, result=result, **labels)
+        running.add(bool(status.get('is_running')), **labels)
+        position.add(bool(status.get('is_position_open')), **labels)
+        price.add(status.get('current_price', 0.0), **labels)
+        if status.get('last_tick_at'):
+            tick_age.add(now - status['last_tick_at'], **labels)
+        realized.add(status.get('realized_pnl', 0.0), **labels)
+        unrealized.add(status.get('unrealized_pnl', 0.0), **labels)
+        positions_by_worker[worker] = positions_by_worker.get(worker, 0) + (1 if status.get('is_position_open') else 0)
+
+    for worker, count in positions_by_worker.items():
+        open_positions.add(count, worker=worker)
+    return [ticks, orders, running, position, price, tick_age, realized, unrealized, open_positions]
+
+def _bot_families() -> List[MetricFamily]:
+    """
+    Bu process'teki botların sayaç ve durumlarını toplar
+    """
+    from trading_bot import get_active_bots
+
+    statuses = [(bot.selected_coin, bot.get_status(), "local") for bot in get_active_bots() if bot.selected_coin]
+    return build_bot_families(statuses, workers=("local",))
+
+def _api_families() -> List[MetricFamily]:
+    """
+    API metrik kayıt defterini Prometheus histogramlarına çevirir
+    """
+    from api_metrics import get_metrics_registry
+
+    registry = get_metrics_registry()
+    latency = MetricFamily("api_request_duration_seconds", "histogram", "Başarılı API çağrısı süresi")
+    requests = MetricFamily("api_requests_total", "counter", "API çağrısı sayısı")
+    errors = MetricFamily("api_errors_total", "counter", "Türe göre API hatası sayısı")
+
+    for name in registry.endpoints():
+        metrics = registry.endpoint(name)
+        histogram = metrics.latency
+        for bound, count in zip(API_LATENCY_BUCKETS, histogram.cumulative_counts(list(API_LATENCY_BUCKETS))):
+            latency.add(count, "_bucket", endpoint=name, le=bound)
+        latency.add(histogram.count, "_bucket", endpoint=name, le="+Inf")
+        latency.add(histogram.total_us / 1e6, "_sum", endpoint=name)
+        latency.add(histogram.count, "_count", endpoint=name)
+
+        requests.add(metrics.calls, endpoint=name)
+        for error_type, count in dict(metrics.errors).items():
+            errors.add(count, endpoint=name, type=error_type)
+
+    from retry_policy import get_circuit_breaker_states
+    states = MetricFamily("circuit_breaker_state", "gauge", "Devre kesici durumu (0: kapalı, 1: yarı açık, 2: açık)")
+    rejected = MetricFamily("circuit_breaker_rejected_total", "counter", "Devre açıkken reddedilen çağrı sayısı")
+    for name, stats in get_circuit_breaker_states().items():
+        states.add(CIRCUIT_STATE_VALUES[stats['state']], endpoint=name)
+        rejected.add(stats['rejected_calls'], endpoint=name)
+    return [latency, requests, errors, states, rejected]
+
+def _trace_families() -> List[MetricFamily]:
+    """
+    Gecikme izlerinin aşama yüzdeliklerini summary olarak toplar
+    """
+    from latency_tracing import get_trace_recorder
+
+    recorder = get_trace_recorder()
+    stages = MetricFamily("trade_stage_duration_seconds", "summary", "Alım-satım kararı aşama süreleri")
+    for stage, stats in recorder.stage_summary().items():
+        for quantile in TRACE_QUANTILES:
+            key = {0.5: 'p50_ms', 0.9: 'p90_ms', 0.99: 'p99_ms'}[quantile]
+            stages.add(stats[key] / 1000, stage=stage, quantile=quantile)
+        stages.add(stats['mean_ms'] * stats['count'] / 1000, "_sum", stage=stage)
+        stages.add(stats['count'], "_count", stage=stage)
+
+    traces = MetricFamily("trade_traces_total", "counter", "Sonuca göre tamamlanan karar izi sayısı")
+    for status, count in dict(recorder.status_counts).items():
+        traces.add(count, status=status)
+    return [stages, traces]
+
+def _runtime_families() -> List[MetricFamily]:
+    """
+    Thread sayısı, kuyruk derinlikleri ve process kaynak kullanımı
+    """
+    families = [
+        MetricFamily("threads", "gauge", "Aktif thread sayısı").add(threading.active_count()),
+        MetricFamily("process_start_time_seconds", "gauge", "Process başlangıç zamanı").add(PROCESS_START_TIME)
+    ]
+
+    cpu = os.times()
+    families.append(MetricFamily("process_cpu_seconds_total", "counter", "Kullanılan CPU süresi")
+                    .add(cpu.user + cpu.system))
+
+    from memory_tracker import get_rss_bytes
+    rss = get_rss_bytes()
+    if rss is not None:
+        families.append(MetricFamily("process_resident_memory_bytes", "gauge", "Fiziksel bellek kullanımı").add(rss))
+
+    queue_depth = MetricFamily("queue_depth", "gauge", "İç kuyruklarda bekleyen öğe sayısı")
+    from market_recorder import get_market_recorder
+    recorder = get_market_recorder()
+    if recorder:
+        stats = recorder.get_statistics()
+        queue_depth.add(stats['queued'], queue="market_recorder")
+        families.append(MetricFamily("market_recorder_dropped_total", "counter", "Kuyruk dolduğu için atılan kayıt")
+                        .add(stats['dropped']))
+
+    from timer_wheel import get_timer_wheel
+    wheel_stats = get_timer_wheel().get_statistics()
+    queue_depth.add(wheel_stats['active_timers'], queue="timer_wheel")
+    families.append(MetricFamily("timer_wheel_lag_ticks", "gauge", "Zamanlayıcı çarkının gerideki tick sayısı")
+                    .add(wheel_stats['lag_ticks']))
+    families.append(queue_depth)
+    return families
+
+DEFAULT_COLLECTORS = (_bot_families, _api_families, _trace_families, _runtime_families)
+
+def render_metrics() -> str:
+    """
+    Tüm metrikleri Prometheus metin formatında döndürür
+    """
+    with _collectors_lock:
+        extra = list(_collectors.items())
+
+    families: List[MetricFamily] = []
+    for collector in DEFAULT_COLLECTORS:
+        try:
+            families.extend(collector())
+        except Exception as e:
+            logger.error(f"Metrikler toplanamadı ({collector.__name__}): {e}")
+    for name, collector in extra:
+        try:
+            families.extend(collector())
+        except Exception as e:
+            logger.error(f"Metrikler toplanamadı ({name}): {e}")
+
+    # Aynı adı taşıyan aileler (örn: worker botları) tek blokta birleştirilir
+    merged: Dict[str, MetricFamily] = {}
+    for family in families:
+        existing = merged.get(family.name)
+        if existing is None:
+            merged[family.name] = family
+        else:
+            existing.samples.extend(family.samples)
+
+    return "\n".join(family.render() for family in merged.values() if family.samples) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == "/metrics":
+            started = time.perf_counter()
+            body = render_metrics().encode('utf-8')
+            self.server.scrape_count += 1
+            self.server.last_scrape_seconds = time.perf_counter() - started
+            self._respond(200, CONTENT_TYPE, body)
+        elif path in ("/health", "/healthz"):
+            self._respond(200, "text/plain; charset=utf-8", b"ok\n")
+        else:
+            self._respond(404, "text/plain; charset=utf-8", b"not found\n")
+
+    def _respond(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrik isteği: {self.address_string()} {format % args}")
+
+class MetricsServer:
+    """
+    Prometheus metin formatında /metrics sunan süreç içi HTTP sunucusu
+
+    Sunucu ayrı bir daemon thread'de çalışır. Metrikler yalnızca sorgu
+    geldiğinde toplanır; trading yoluna ek iş yüklenmez.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        """
+        Args:
+            port: Dinlenecek port (0 verilirse boş bir port seçilir)
+            host: Dinlenecek adres (varsayılan yalnızca yerel erişim)
+        """
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """
+        Sunucuyu başlatır
+        """
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.scrape_count = 0
+        self._server.last_scrape_seconds = 0.0
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.5},
+                                        daemon=True, name="metrics_server")
+        self._thread.start()
+        logger.info(f"Metrik sunucusu başlatıldı: http://{self.host}:{self.port}/metrics")
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Sunucuyu durdurur
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._server = None
+        logger.info("Metrik sunucusu durduruldu")
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def get_statistics(self) -> Dict[str, Any]:
+        server = self._server
+        return {
+            'running': server is not None,
+            'url': self.url,
+            'scrapes': server.scrape_count if server else 0,
+            'last_scrape_ms': server.last_scrape_seconds * 1000 if server else 0.0
+        }
+
+# Global değişkenler
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> Optional[MetricsServer]:
+    """
+    Global metrik sunucusunu başlatır (port 0 veya negatifse kapalı kalır)
+
+    Returns:
+        MetricsServer: Başlatılan sunucu, kapalıysa veya port açılamadıysa None
+    """
+    global _metrics_server
+
+    if not port or port < 0:
+        return None
+
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            server = MetricsServer(port, host)
+            try:
+                server.start()
+            except OSError as e:
+                logger.error(f"Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+                return None
+            _metrics_server = server
+        return _metrics_server
+
+def get_metrics_server() -> Optional[MetricsServer]:
+    """
+    Global metrik sunucusunu döner
+    """
+    return _metrics_server
+
+def stop_metrics_server():
+    """
+    Global metrik sunucusunu durdurur
+    """
+    global _metrics_server
+
+    with _metrics_server_lock:
+        if _metrics_server is not None:
+            _metrics_server.stop()
+            _metrics_server = None
@@ -0,0 +1,389 @@
+import time
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+from loguru import logger
+
+# BTCTurk WebSocket emir defteri mesaj tipleri
+MSG_ORDERBOOK_FULL = 431
+MSG_ORDERBOOK_DIFF = 432
+
+# Diff kayıtlarındaki değişiklik tipi (CP alanı)
+CHANGE_REMOVE = 2
+
+class _BookSide:
+    """
+    Emir defterinin tek tarafı (alış veya satış)
+
+    Fiyat seviyeleri sıralı bir anahtar listesinde tutulur; arama bisect ile
+    O(log n) yapılır. Alış tarafında anahtarlar negatif fiyattır, böylece
+    her iki tarafta da en iyi fiyat listenin başındadır.
+    """
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys: List[float] = []
+        self._levels: Dict[float, float] = {}  # {fiyat: miktar}
+
+    def _key(self, price: float) -> float:
+        return -price if self.is_bid else price
+
+    def clear(self):
+        self._keys = []
+        self._levels = {}
+
+    def set_level(self, price: float, amount: float):
+        """
+        Fiyat seviyesini ekler/günceller, miktar sıfırsa siler
+        """
+        if amount <= 0:
+            self.remove_level(price)
+            return
+
+        if price not in self._levels:
+            bisect.insort(self._keys, self._key(price))
+        self._levels[price] = amount
+
+    def remove_level(self, price: float):
+        if price not in self._levels:
+            return
+
+        del self._levels[price]
+        key = self._key(price)
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self._keys:
+            return None
+        price = self._price(self._keys[0])
+        return price, self._levels[price]
+
+    def _price(self, key: float) -> float:
+        return -key if self.is_bid else key
+
+    def levels(self, count: int = None) -> List[Tuple[float, float]]:
+        keys = self._keys if count is None else self._keys[:count]
+        return [(self._price(key), self._levels[self._price(key)]) for key in keys]
+
+    def trim(self, max_levels: int):
+        """
+        En iyi max_levels seviye dışındakileri siler
+        """
+        if max_levels and len(self._keys) > max_levels:
+            for key in self._keys[max_levels:]:
+                del self._levels[self._price(key)]
+            del self._keys[max_levels:]
+
+    def __len__(self):
+        return len(self._keys)
+
+class OrderBook:
+    """
+    Tek bir coin çifti için yerel L2 emir defteri
+
+    Tam görüntü (snapshot) ile başlatılır ve sonrasında yalnızca değişen
+    seviyeler (diff) uygulanır. Güncelleme sonrası defter kesişirse (en iyi
+    alış >= en iyi satış) kaçırılmış bir diff olduğu anlaşılır; defter
+    geçersiz işaretlenir ve yeni snapshot alınır.
+    """
+
+    def __init__(self, symbol: str, max_levels: int = 100):
+        self.symbol = symbol
+        self.max_levels = max_levels
+        self.bids = _BookSide(is_bid=True)
+        self.asks = _BookSide(is_bid=False)
+        self.last_update = 0.0
+        self.is_valid = False
+        self.integrity_errors = 0
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> bool:
+        """
+        Defteri tam görüntü ile yeniden kurar
+
+        Args:
+            bids: [(fiyat, miktar)] alış seviyeleri
+            asks: [(fiyat, miktar)] satış seviyeleri
+
+        Returns:
+            bool: Defter geçerli ise True
+        """
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, amount in bids:
+                self.bids.set_level(price, amount)
+            for price, amount in asks:
+                self.asks.set_level(price, amount)
+            self.bids.trim(self.max_levels)
+            self.asks.trim(self.max_levels)
+            return self._finish_update()
+
+    def apply_diff(self, bid_changes: List[Tuple[float, float]], ask_changes: List[Tuple[float, float]]) -> bool:
+        """
+        Değişen seviyeleri deftere uygular (miktar 0 ise seviye silinir)
+
+        Args:
+            bid_changes: [(fiyat, yeni_miktar)] alış değişiklikleri
+            ask_changes: [(fiyat, yeni_miktar)] satış değişiklikleri
+
+        Returns:
+            bool: Defter geçerli ise True
+        """
+        with self._lock:
+            if not self.is_valid:
+                # Snapshot gelmeden diff uygulamak defteri bozar
+                return False
+
+            for price, amount in bid_changes:
+                self.bids.set_level(price, amount)
+            for price, amount in ask_changes:
+                self.asks.set_level(price, amount)
+            self.bids.trim(self.max_levels)
+            self.asks.trim(self.max_levels)
+            return self._finish_update()
+
+    def _finish_update(self) -> bool:
+        self.last_update = time.time()
+
+        if self.is_crossed():
+            self.integrity_errors += 1
+            self.is_valid = False
+            logger.warning(f"Emir defteri kesişti ({self.symbol}), yeni snapshot gerekli")
+            return False
+
+        self.is_valid = True
+        return True
+
+    def is_crossed(self) -> bool:
+        """
+        En iyi alış fiyatı en iyi satış fiyatına eşit veya büyükse True
+
+        Borsadaki defter hiçbir zaman kesişmez; yerel defterde kesişme
+        kaçırılan veya sırası bozulan bir diff olduğunu gösterir.
+        """
+        bid = self.bids.best()
+        ask = self.asks.best()
+        return bid is not None and ask is not None and bid[0] >= ask[0]
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def spread(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def mid_price(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def get_depth(self, levels: int = 10) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        En iyi seviyeleri döndürür
+
+        Returns:
+            dict: {'bids': [(fiyat, miktar)], 'asks': [(fiyat, miktar)]}
+        """
+        with self._lock:
+            return {'bids': self.bids.levels(levels), 'asks': self.asks.levels(levels)}
+
+    def volume_within(self, side: str, price_limit: float) -> float:
+        """
+        Belirli fiyata kadar olan toplam miktarı döndürür
+
+        Args:
+            side: 'bids' veya 'asks'
+            price_limit: Sınır fiyat (dahil)
+        """
+        book_side = self.bids if side == 'bids' else self.asks
+        total = 0.0
+        with self._lock:
+            for price, amount in book_side.levels():
+                if (book_side.is_bid and price < price_limit) or (not book_side.is_bid and price > price_limit):
+                    break
+                total += amount
+        return total
+
+    def age(self) -> float:
+        if not self.last_update:
+            return float('inf')
+        return time.time() - self.last_update
+
+class OrderBookManager:
+    """
+    Coin çifti başına emir defterlerini yöneten sınıf
+
+    WebSocket akışı bağlıysa defterler 431 (snapshot) ve 432 (diff)
+    mesajlarıyla güncel tutulur; aksi halde REST'ten snapshot alınır.
+    """
+
+    def __init__(self, client=None, depth_limit: int = 50, snapshot_interval: float = 5.0):
+        """
+        Args:
+            client: BTCTurk client (REST snapshot için)
+            depth_limit: Tutulacak seviye sayısı
+            snapshot_interval: REST snapshot'ları arası minimum süre (saniye)
+        """
+        self.client = client
+        self.depth_limit = depth_limit
+        self.snapshot_interval = snapshot_interval
+        self.stream = None
+
+        self.books: Dict[str, OrderBook] = {}
+        self._last_snapshot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def attach_stream(self, stream):
+        """
+        WebSocket akışına bağlanır
+
+        Args:
+            stream: MarketDataStream örneği
+        """
+        self.stream = stream
+        stream.add_message_listener(MSG_ORDERBOOK_FULL, self._on_snapshot_message)
+        stream.add_message_listener(MSG_ORDERBOOK_DIFF, self._on_diff_message)
+
+    def subscribe(self, symbol: str):
+        """
+        Coin çifti için emir defteri akışına abone olur
+        """
+        self._get_or_create(symbol)
+        if self.stream:
+            self.stream.subscribe_channel('orderbook', symbol)
+            self.stream.subscribe_channel('obdiff', symbol)
+
+    def _get_or_create(self, symbol: str) -> OrderBook:
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None:
+                book = OrderBook(symbol, max_levels=self.depth_limit)
+                self.books[symbol] = book
+            return book
+
+    def get_book(self, symbol: str, max_age: float = 5.0) -> Optional[OrderBook]:
+        """
+        Coin çiftinin geçerli emir defterini döndürür
+
+        Defter yoksa, geçersizse veya max_age'den eskiyse REST'ten yenilenir.
+
+        Args:
+            symbol: Coin çifti
+            max_age: Kabul edilebilir maksimum defter yaşı (saniye)
+
+        Returns:
+            OrderBook: Geçerli defter, alınamazsa None
+        """
+        book = self._get_or_create(symbol)
+        if book.is_valid and book.age() <= max_age:
+            return book
+
+        if self.refresh_snapshot(symbol):
+            return book
+        return book if book.is_valid else None
+
+    def refresh_snapshot(self, symbol: str) -> bool:
+        """
+        REST'ten snapshot alıp defteri yeniden kurar
+
+        Returns:
+            bool: Başarılı ise True
+        """
+        if self.client is None:
+            return False
+
+        now = time.time()
+        if now - self._last_snapshot.get(symbol, 0.0) < self.snapshot_interval:
+            return False
+        self._last_snapshot[symbol] = now
+
+        try:
+            data = self.client.get_order_book(pair=symbol, limit=self.depth_limit)
+            if isinstance(data, list) and data:
+                data = data[0]
+            if not isinstance(data, dict):
+                logger.warning(f"Beklenmeyen emir defteri yanıtı ({symbol}): {type(data)}")
+                return False
+
+            bids = self._parse_rest_levels(data.get('bids', []))
+            asks = self._parse_rest_levels(data.get('asks', []))
+            return self._get_or_create(symbol).apply_snapshot(bids, asks)
+
+        except Exception as e:
+            logger.error(f"Emir defteri alınırken hata ({symbol}): {e}")
+            return False
+
+    @staticmethod
+    def _parse_rest_levels(levels: List) -> List[Tuple[float, float]]:
+        parsed = []
+        for level in levels:
+            try:
+                parsed.append((float(level[0]), float(level[1])))
+            except (TypeError, ValueError, IndexError):
+                continue
+        return parsed
+
+    @staticmethod
+    def _parse_stream_levels(levels: List, is_diff: bool = False) -> List[Tuple[float, float]]:
+        parsed = []
+        for level in levels or []:
+            try:
+                price = float(level['P'])
+                amount = float(level.get('A', 0) or 0)
+            except (TypeError, ValueError, KeyError):
+                continue
+            if is_diff and level.get('CP') == CHANGE_REMOVE:
+                amount = 0.0
+            parsed.append((price, amount))
+        return parsed
+
+    def _on_snapshot_message(self, payload: Dict[str, Any]):
+        symbol = payload.get('PS')
+        if not symbol or symbol not in self.books:
+            return
+
+        valid = self.books[symbol].apply_snapshot(
+            self._parse_stream_levels(payload.get('BO')),
+            self._parse_stream_levels(payload.get('AO'))
+        )
+
+        if not valid:
+            self.refresh_snapshot(symbol)
+
+    def _on_diff_message(self, payload: Dict[str, Any]):
+        symbol = payload.get('PS')
+        book = self.books.get(symbol)
+        if book is None:
+            return
+
+        valid = book.apply_diff(
+            self._parse_stream_levels(payload.get('BO'), is_diff=True),
+            self._parse_stream_levels(payload.get('AO'), is_diff=True)
+        )
+
+        if not valid:
+            # Bozulan defteri REST snapshot ile yeniden kur
+            self.refresh_snapshot(symbol)
+
+    def get_best_prices(self, symbol: str, max_age: float = 5.0) -> Tuple[Optional[float], Optional[float]]:
+        """
+        En iyi alış ve satış fiyatlarını döndürür
+
+        Returns:
+            tuple: (best_bid, best_ask), defter yoksa (None, None)
+        """
+        book = self.get_book(symbol, max_age)
+        if book is None:
+            return None, None
+        return book.best_bid(), book.best_ask()
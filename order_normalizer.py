@@ -0,0 +1,322 @@
+import time
+import threading
+from decimal import Decimal, InvalidOperation, ROUND_FLOOR, ROUND_CEILING
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+from loguru import logger
+
+def _to_units(value: Any, scale: int) -> int:
+    """
+    Ondalık bir değeri verilen ölçekte tam sayı birimine çevirir
+
+    Args:
+        value: Sayısal değer (str, float, int)
+        scale: Ondalık basamak sayısı
+
+    Returns:
+        int: 10^-scale cinsinden tam sayı birim (aşağı yuvarlanmış)
+    """
+    if value is None or value == "":
+        return 0
+    try:
+        # float'ın ikili temsil hatalarını str üzerinden Decimal'e geçerek önle
+        decimal_value = Decimal(str(value))
+    except InvalidOperation:
+        return 0
+    return int(decimal_value.scaleb(scale).to_integral_value(rounding=ROUND_FLOOR))
+
+def _from_units(units: int, scale: int) -> float:
+    """
+    Tam sayı birimi tekrar float değere çevirir
+
+    Args:
+        units: 10^-scale cinsinden tam sayı birim
+        scale: Ondalık basamak sayısı
+
+    Returns:
+        float: Değer
+    """
+    return float(Decimal(units).scaleb(-scale))
+
+@dataclass
+class SymbolFilters:
+    """
+    Bir coin çiftinin emir hassasiyet kuralları (tam sayı sabit nokta)
+
+    Fiyatlar 10^-price_scale, miktarlar 10^-quantity_scale biriminde tutulur.
+    """
+    symbol: str
+    price_scale: int = 2
+    quantity_scale: int = 8
+    tick_size: int = 1  # price_scale biriminde
+    step_size: int = 1  # quantity_scale biriminde
+    min_price: int = 0
+    max_price: int = 0  # 0 ise sınır yok
+    min_quantity: int = 0
+    max_quantity: int = 0  # 0 ise sınır yok
+    min_notional: int = 0  # price_scale biriminde (TRY cinsinden minimum işlem tutarı)
+
+    @classmethod
+    def from_exchange_info(cls, info: Dict[str, Any]) -> "SymbolFilters":
+        """
+        BTCTurk exchange info kaydından filtreleri oluşturur
+
+        Args:
+            info: get_exchange_info() listesindeki tek bir coin çifti kaydı
+
+        Returns:
+            SymbolFilters: Coin çiftinin filtreleri
+        """
+        price_scale = int(info.get('denominatorScale', 2) or 0)
+        quantity_scale = int(info.get('numeratorScale', 8) or 0)
+
+        # Kesirli fiyat desteklenmiyorsa fiyat tam sayı olmalı
+        if info.get('hasFraction') is False:
+            price_scale = 0
+
+        filters = cls(symbol=info.get('name', ''),
+                      price_scale=price_scale,
+                      quantity_scale=quantity_scale)
+
+        for item in info.get('filters') or []:
+            if not isinstance(item, dict) or item.get('filterType') != 'PRICE_FILTER':
+                continue
+            filters.tick_size = max(1, _to_units(item.get('tickSize'), price_scale))
+            filters.min_price = _to_units(item.get('minPrice'), price_scale)
+            filters.max_price = _to_units(item.get('maxPrice'), price_scale)
+            filters.min_notional = _to_units(item.get('minExchangeValue'), price_scale)
+            filters.min_quantity = _to_units(item.get('minAmount'), quantity_scale)
+            filters.max_quantity = _to_units(item.get('maxAmount'), quantity_scale)
+
+        return filters
+
+class OrderNormalizer:
+    """
+    Emir fiyat/miktarlarını borsa hassasiyetine göre düzelten sınıf
+
+    Fiyatlar tick size'a, miktarlar step size'a tam sayı aritmetiği ile
+    yuvarlanır ve minimum işlem tutarı emir gönderilmeden önce yerelde
+    kontrol edilir. Böylece borsa tarafından reddedilen emirler için
+    yapılan ekstra API turları önlenir.
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self.filters: Dict[str, SymbolFilters] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._last_load_attempt = 0.0
+        self.reload_interval = 60.0  # Başarısız yüklemeden sonra tekrar deneme aralığı (saniye)
+
+    def load_exchange_info(self, exchange_info: list = None) -> bool:
+        """
+        Coin çifti filtrelerini exchange info'dan yükler
+
+        Args:
+            exchange_info: Hazır exchange info listesi (verilmezse API'den alınır)
+
+        Returns:
+            bool: Yükleme başarılı ise True
+        """
+        self._last_load_attempt = time.time()
+        try:
+            if exchange_info is None:
+                if self.client is None:
+                    return False
+                exchange_info = self.client.get_exchange_info()
+
+            if not isinstance(exchange_info, list):
+                logger.warning(f"Beklenmeyen exchange info formatı: {type(exchange_info)}")
+                return False
+
+            loaded = {}
+            for info in exchange_info:
+                if isinstance(info, dict) and info.get('name'):
+                    loaded[info['name']] = SymbolFilters.from_exchange_info(info)
+
+            with self._lock:
+                self.filters.update(loaded)
+                self._loaded = True
+
+            logger.info(f"{len(loaded)} coin çifti için emir filtreleri yüklendi")
+            return True
+
+        except Exception as e:
+            logger.error(f"Emir filtreleri yüklenirken hata: {e}")
+            return False
+
+    def get_filters(self, symbol: str) -> Optional[SymbolFilters]:
+        """
+        Coin çiftinin filtrelerini döndürür (gerekirse bir kez yükler)
+
+        Args:
+            symbol: Coin çifti (örn: BTCTRY)
+
+        Returns:
+            SymbolFilters: Filtreler, bulunamazsa None
+        """
+        if not self._loaded and time.time() - self._last_load_attempt >= self.reload_interval:
+            self.load_exchange_info()
+        return self.filters.get(symbol)
+
+    def set_filters(self, filters: SymbolFilters):
+        """
+        Coin çifti filtrelerini elle ayarlar
+        """
+        with self._lock:
+            self.filters[filters.symbol] = filters
+
+    def get_tick_size(self, symbol: str) -> float:
+        """
+        Coin çiftinin fiyat adımını döndürür
+
+        Args:
+            symbol: Coin çifti
+
+        Returns:
+            float: Tick size, filtre bilgisi yoksa 0.0
+        """
+        filters = self.get_filters(symbol)
+        if filters is None:
+            return 0.0
+        return _from_units(filters.tick_size, filters.price_scale)
+
+    def normalize_price(self, symbol: str, price: float, side: str = 'buy') -> float:
+        """
+        Fiyatı tick size'a yuvarlar
+
+        Alışta aşağı, satışta yukarı yuvarlanır; böylece limit fiyat hiçbir
+        zaman istenenden daha kötü olmaz.
+
+        Args:
+            symbol: Coin çifti
+            price: Ham fiyat
+            side: 'buy' veya 'sell'
+
+        Returns:
+            float: Düzeltilmiş fiyat
+        """
+        filters = self.get_filters(symbol)
+        if filters is None:
+            return price
+        return _from_units(self._snap_price_units(filters, price, side), filters.price_scale)
+
+    def normalize_quantity(self, symbol: str, quantity: float) -> float:
+        """
+        Miktarı step size'a aşağı yuvarlar
+
+        Args:
+            symbol: Coin çifti
+            quantity: Ham miktar
+
+        Returns:
+            float: Düzeltilmiş miktar
+        """
+        filters = self.get_filters(symbol)
+        if filters is None:
+            return quantity
+        return _from_units(self._snap_quantity_units(filters, quantity), filters.quantity_scale)
+
+    def validate(self, symbol: str, price: float, quantity: float) -> tuple:
+        """
+        Emrin borsa kurallarına uyup uymadığını kontrol eder
+
+        Args:
+            symbol: Coin çifti
+            price: Limit fiyat (düzeltilmiş)
+            quantity: Miktar (düzeltilmiş)
+
+        Returns:
+            tuple: (is_valid: bool, reason: str)
+        """
+        filters = self.get_filters(symbol)
+        if filters is None:
+            return True, "Filtre bilgisi yok, kontrol atlandı"
+
+        price_units = _to_units(price, filters.price_scale)
+        quantity_units = _to_units(quantity, filters.quantity_scale)
+        return self._validate_units(filters, price_units, quantity_units)
+
+    def prepare_order(self, symbol: str, side: str, price: float, quantity: float) -> Optional[Tuple[float, float]]:
+        """
+        Emir fiyat ve miktarını düzeltir ve doğrular
+
+        Args:
+            symbol: Coin çifti
+            side: 'buy' veya 'sell'
+            price: Ham limit fiyat
+            quantity: Ham miktar (coin cinsinden)
+
+        Returns:
+            tuple: (price, quantity) gönderilebilir değerler, emir geçersizse None
+        """
+        filters = self.get_filters(symbol)
+        if filters is None:
+            return price, quantity
+
+        price_units = self._snap_price_units(filters, price, side)
+        quantity_units = self._snap_quantity_units(filters, quantity)
+
+        is_valid, reason = self._validate_units(filters, price_units, quantity_units)
+        if not is_valid:
+            logger.warning(f"Emir yerel kontrolden geçemedi ({symbol}): {reason}")
+            return None
+
+        return (_from_units(price_units, filters.price_scale),
+                _from_units(quantity_units, filters.quantity_scale))
+
+    def _snap_price_units(self, filters: SymbolFilters, price: float, side: str) -> int:
+        """
+        Fiyatı tick size katına yuvarlar (tam sayı birim döndürür)
+        """
+        # Ölçek altını kesmeden önce tam hassasiyetle ölçekle
+        exact = Decimal(str(price)).scaleb(filters.price_scale)
+        tick = filters.tick_size
+
+        if side == 'sell':
+            units = int(exact.to_integral_value(rounding=ROUND_CEILING))
+            return -(-units // tick) * tick
+
+        units = int(exact.to_integral_value(rounding=ROUND_FLOOR))
+        return (units // tick) * tick
+
+    def _snap_quantity_units(self, filters: SymbolFilters, quantity: float) -> int:
+        """
+        Miktarı step size katına aşağı yuvarlar (tam sayı birim döndürür)
+        """
+        units = _to_units(quantity, filters.quantity_scale)
+        step = filters.step_size
+        return (units // step) * step
+
+    def _validate_units(self, filters: SymbolFilters, price_units: int, quantity_units: int) -> tuple:
+        """
+        Tam sayı birimleri üzerinden emir doğrulaması yapar
+        """
+        if price_units <= 0:
+            return False, "Fiyat sıfır veya negatif"
+
+        if quantity_units <= 0:
+            return False, "Miktar hassasiyet altında kaldı"
+
+        if filters.min_price and price_units < filters.min_price:
+            return False, f"Fiyat minimumun altında: {_from_units(price_units, filters.price_scale)}"
+
+        if filters.max_price and price_units > filters.max_price:
+            return False, f"Fiyat maksimumun üstünde: {_from_units(price_units, filters.price_scale)}"
+
+        if filters.min_quantity and quantity_units < filters.min_quantity:
+            return False, f"Miktar minimumun altında: {_from_units(quantity_units, filters.quantity_scale)}"
+
+        if filters.max_quantity and quantity_units > filters.max_quantity:
+            return False, f"Miktar maksimumun üstünde: {_from_units(quantity_units, filters.quantity_scale)}"
+
+        if filters.min_notional:
+            # price_units * quantity_units ölçeği: price_scale + quantity_scale
+            notional_units = price_units * quantity_units
+            min_notional_units = filters.min_notional * (10 ** filters.quantity_scale)
+            if notional_units < min_notional_units:
+                notional = _from_units(notional_units, filters.price_scale + filters.quantity_scale)
+                minimum = _from_units(filters.min_notional, filters.price_scale)
+                return False, f"İşlem tutarı minimumun altında: {notional:.2f} < {minimum:.2f}"
+
+        return True, "Emir geçerli"
@@ -0,0 +1,314 @@
+import math
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+from loguru import logger
+
+PAUSE_CHECK_INTERVAL = 0.5  # Duraklatılmış yoklamada durdurma olayının kontrol aralığı (saniye)
+
+@dataclass
+class SymbolPollState:
+    """
+    Bir coin çiftinin yoklama durumu
+    """
+    symbol: str
+    base_interval: float = 1.0
+    last_price: float = 0.0
+    last_update: float = 0.0
+    variance_per_second: float = 0.0  # Log getirilerin EWMA varyansı (saniye başına)
+    samples: int = 0
+    target_price: float = 0.0
+    stop_price: float = 0.0
+    interval: float = 1.0
+    watchers: int = 0
+
+class PollScheduler:
+    """
+    Coin çifti başına uyarlanabilir yoklama aralığı belirleyen merkezi zamanlayıcı
+
+    Her coin çiftinin aralığı, fiyatın volatilitesine ve pozisyonun hedef/stop
+    fiyatına olan uzaklığına göre hesaplanır: tetikleyiciye yakın ve oynak
+    coinler sık, uzak ve sakin coinler seyrek yoklanır. Toplam istek hızı
+    global bütçeyi aşarsa tüm aralıklar orantılı olarak uzatılır ve istekler
+    bütçe aralığına yayılır.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0, min_interval: float = 0.5,
+                 max_interval: float = 10.0, ewma_alpha: float = 0.1, polls_to_trigger: float = 10.0):
+        """
+        Args:
+            requests_per_second: Tüm botlar için toplam fiyat/bakiye isteği bütçesi
+            min_interval: En kısa yoklama aralığı (saniye)
+            max_interval: En uzun yoklama aralığı (saniye)
+            ewma_alpha: Volatilite tahmini için EWMA katsayısı
+            polls_to_trigger: Tetikleyiciye beklenen varış süresi içinde yapılacak yoklama sayısı
+        """
+        self.requests_per_second = requests_per_second
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ewma_alpha = ewma_alpha
+        self.polls_to_trigger = polls_to_trigger
+
+        self.states: Dict[str, SymbolPollState] = {}
+        self._lock = threading.Lock()
+        self._tokens = requests_per_second
+        self._last_refill = time.time()
+
+        self._resume_event = threading.Event()  # Temizse tüm yoklamalar bekletilir
+        self._resume_event.set()
+
+        self.total_polls = 0
+        self.throttled_polls = 0
+        self.paused_waits = 0
+
+    def register(self, symbol: str, base_interval: float = 1.0) -> SymbolPollState:
+        """
+        Coin çiftini yoklama listesine ekler
+
+        Args:
+            symbol: Coin çifti
+            base_interval: Volatilite bilinmeden önce kullanılacak aralık
+        """
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                state = SymbolPollState(symbol=symbol, base_interval=base_interval, interval=base_interval)
+                self.states[symbol] = state
+            state.watchers += 1
+            return state
+
+    def unregister(self, symbol: str):
+        """
+        Coin çiftini yoklama listesinden çıkarır (son izleyici ayrıldığında)
+        """
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                return
+            state.watchers -= 1
+            if state.watchers <= 0:
+                del self.states[symbol]
+
+    def set_triggers(self, symbol: str, target_price: float = 0.0, stop_price: float = 0.0):
+        """
+        Pozisyonun hedef ve stop fiyatlarını ayarlar (0 ise yok)
+
+        Kayıtlı olmayan coin çifti için bir şey yapılmaz; izleyici sayısı
+        yalnızca register/unregister çiftleriyle değişir.
+        """
+        state = self.states.get(symbol)
+        if state is None:
+            return
+        state.target_price = target_price or 0.0
+        state.stop_price = stop_price or 0.0
+
+    def update_price(self, symbol: str, price: float, timestamp: float = None):
+        """
+        Yeni fiyatla volatilite tahminini günceller
+
+        Args:
+            symbol: Coin çifti
+            price: Güncel fiyat
+            timestamp: Fiyatın zamanı
+        """
+        if price <= 0:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+
+        state = self.states.get(symbol)
+        if state is None:
+            return
+
+        with self._lock:
+            if state.last_price > 0 and timestamp > state.last_update:
+                elapsed = timestamp - state.last_update
+                log_return = math.log(price / state.last_price)
+                # Düzensiz aralıklı örnekler için varyansı saniye başına normalize et
+                sample_variance = (log_return * log_return) / elapsed
+                if state.samples == 0:
+                    state.variance_per_second = sample_variance
+                else:
+                    state.variance_per_second += self.ewma_alpha * (sample_variance - state.variance_per_second)
+                state.samples += 1
+
+            state.last_price = price
+            state.last_update = timestamp
+
+    def _raw_interval(self, state: SymbolPollState) -> float:
+        """
+        Bütçe uygulanmadan önceki aralığı hesaplar
+        """
+        triggers = [p for p in (state.target_price, state.stop_price) if p > 0]
+
+        if state.samples < 3 or state.last_price <= 0:
+            return state.base_interval
+
+        if not triggers:
+            # Açık pozisyon yoksa fiyatın kaçırılması kâr/zarar etkilemez
+            return self.max_interval
+
+        distance = min(abs(trigger - state.last_price) / state.last_price for trigger in triggers)
+        volatility = math.sqrt(state.variance_per_second)
+        if volatility <= 0:
+            return self.max_interval
+
+        # Rastgele yürüyüşte tetikleyiciye beklenen varış süresi ~ (mesafe / volatilite)^2
+        expected_seconds = (distance / volatility) ** 2
+        return expected_seconds / self.polls_to_trigger
+
+    def compute_intervals(self) -> Dict[str, float]:
+        """
+        Tüm coin çiftlerinin aralıklarını bütçeye göre yeniden hesaplar
+
+        Returns:
+            dict: {symbol: interval}
+        """
+        with self._lock:
+            raw = {symbol: min(self.max_interval, max(self.min_interval, self._raw_interval(state)))
+                   for symbol, state in self.states.items()}
+
+            demand = sum(1.0 / interval for interval in raw.values())
+            scale = demand / self.requests_per_second if demand > self.requests_per_second else 1.0
+
+            for symbol, interval in raw.items():
+                self.states[symbol].interval = interval * scale
+            return {symbol: state.interval for symbol, state in self.states.items()}
+
+    def get_interval(self, symbol: str) -> float:
+        """
+        Coin çiftinin güncel yoklama aralığını döndürür
+        """
+        intervals = self.compute_intervals()
+        return intervals.get(symbol, self.max_interval)
+
+    def _acquire_token(self) -> float:
+        """
+        Global bütçeden bir istek hakkı alır (token bucket)
+
+        Hak yoksa borçlanılır; sıradaki istekler borç kapanana kadar bekler.
+
+        Returns:
+            float: İstekten önce beklenmesi gereken süre (saniye)
+        """
+        with self._lock:
+            now = time.time()
+            refill = (now - self._last_refill) * self.requests_per_second
+            self._tokens = min(self.requests_per_second, self._tokens + refill)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.requests_per_second
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._resume_event.is_set()
+
+    def pause(self):
+        """
+        Tüm yoklamaları duraklatır (bağlantı kurtarılırken API'ye istek gitmesin)
+        """
+        if self._resume_event.is_set():
+            self._resume_event.clear()
+            logger.info("Fiyat yoklamaları duraklatıldı")
+
+    def resume(self):
+        """
+        Duraklatılan yoklamaları birlikte sürdürür
+
+        Token kovası boşaltılır; bekleyen tüm botlar aynı anda uyanır ama
+        istekleri global bütçe aralığına yayılır.
+        """
+        if self._resume_event.is_set():
+            return
+        with self._lock:
+            self._tokens = 0.0
+            self._last_refill = time.time()
+        self._resume_event.set()
+        logger.info("Fiyat yoklamaları sürdürülüyor")
+
+    def wait_resumed(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Duraklatma kalkana kadar bekler
+
+        Zamanlayıcının wait() metodunu kullanmayan döngüler (örn: akış
+        fiyatını bekleyenler) de bağlantı kurtarılırken istek göndermesin diye
+        bunu çağırır.
+
+        Returns:
+            bool: Bekleme stop_event ile kesildiyse True
+        """
+        self.paused_waits += 1
+        while not self._resume_event.wait(PAUSE_CHECK_INTERVAL):
+            if stop_event is not None and stop_event.is_set():
+                return True
+        return stop_event is not None and stop_event.is_set()
+
+    @staticmethod
+    def _sleep(seconds: float, stop_event: Optional[threading.Event]) -> bool:
+        if stop_event is not None:
+            return stop_event.wait(seconds)
+        time.sleep(seconds)
+        return False
+
+    def wait(self, symbol: str, stop_event: threading.Event = None) -> bool:
+        """
+        Coin çiftinin bir sonraki yoklamasına kadar bekler
+
+        Args:
+            symbol: Coin çifti
+            stop_event: Set edilirse bekleme erken biter
+
+        Returns:
+            bool: Bekleme stop_event ile kesildiyse True
+        """
+        if self._sleep(self.get_interval(symbol), stop_event):
+            return True
+        if not self._resume_event.is_set() and self.wait_resumed(stop_event):
+            return True
+
+        self.total_polls += 1
+        delay = self._acquire_token()
+        if delay > 0:
+            self.throttled_polls += 1
+            return self._sleep(delay, stop_event)
+        return False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Zamanlayıcı istatistiklerini döndürür
+        """
+        symbols = {}
+        for symbol, state in list(self.states.items()):
+            symbols[symbol] = {
+                'interval': round(state.interval, 3),
+                'volatility': math.sqrt(state.variance_per_second),
+                'target_price': state.target_price,
+                'stop_price': state.stop_price
+            }
+        return {
+            'requests_per_second': self.requests_per_second,
+            'total_polls': self.total_polls,
+            'throttled_polls': self.throttled_polls,
+            'paused': self.is_paused,
+            'paused_waits': self.paused_waits,
+            'symbols': symbols
+        }
+
+# Global değişkenler
+_poll_scheduler = None
+_poll_scheduler_lock = threading.Lock()
+
+def get_poll_scheduler() -> PollScheduler:
+    """
+    Global yoklama zamanlayıcısını döner (yoksa varsayılan ayarlarla oluşturur)
+    """
+    global _poll_scheduler
+
+    with _poll_scheduler_lock:
+        if _poll_scheduler is None:
+            _poll_scheduler = PollScheduler()
+            logger.info(f"Yoklama zamanlayıcısı başlatıldı - Bütçe: {_poll_scheduler.requests_per_second} istek/s")
+        return _poll_scheduler
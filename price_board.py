@@ -0,0 +1,289 @@
+import time
+import threading
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+# Paylaşımlı bellek düzeni: başlık + sabit genişlikli yuvalar
+BOARD_MAGIC = b"BTPRICE1"
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('capacity', '<u8'), ('count', '<u8'), ('reserved', '<u8')])
+SLOT_DTYPE = np.dtype([('seq', '<u8'), ('price', '<f8'), ('volume', '<f8'),
+                       ('timestamp', '<f8'), ('symbol', 'S16')])
+MAX_READ_RETRIES = 10000  # Tutarlı okuma için en fazla deneme
+
+class PriceBoard:
+    """
+    Process'ler arası paylaşımlı fiyat tablosu
+
+    Her coin çiftinin paylaşımlı bellekte sabit bir yuvası vardır. Tek bir
+    yazıcı (piyasa verisi process'i) yuvaları seqlock yöntemiyle günceller:
+    yazmadan önce sıra numarası tek sayıya, yazdıktan sonra çift sayıya
+    çıkarılır. Okuyucular kilit almadan okur; okuma sırasında sıra numarası
+    tekse veya değiştiyse okumayı tekrarlar.
+
+    Yalnızca bir process yazıcı olmalıdır (create=True ile oluşturan).
+    """
+
+    def __init__(self, name: str = None, capacity: int = 1024, create: bool = False):
+        """
+        Args:
+            name: Paylaşımlı bellek adı (create=True iken boşsa otomatik verilir)
+            capacity: Maksimum coin çifti sayısı
+            create: True ise tablo oluşturulur ve bu process yazıcı olur
+        """
+        self.create = create
+
+        if create:
+            size = HEADER_DTYPE.itemsize + capacity * SLOT_DTYPE.itemsize
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = self._attach(name)
+
+        self._header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        if create:
+            self._header[0] = (BOARD_MAGIC, capacity, 0, 0)
+        elif self._header['magic'][0] != BOARD_MAGIC:
+            self._shm.close()
+            raise ValueError(f"Geçersiz fiyat tablosu: {name}")
+
+        self.capacity = int(self._header['capacity'][0])
+        slots = np.ndarray((self.capacity,), dtype=SLOT_DTYPE, buffer=self._shm.buf,
+                           offset=HEADER_DTYPE.itemsize)
+
+        # Alan görünümleri: okuma başına yapılandırılmış kayıt oluşturulmaz
+        self._seq = slots['seq']
+        self._price = slots['price']
+        self._volume = slots['volume']
+        self._timestamp = slots['timestamp']
+        self._symbol = slots['symbol']
+        self._slots = slots
+
+        self._slot_cache: Dict[str, int] = {}
+        self._register_lock = threading.Lock()
+        self.retry_count = 0
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        try:
+            # Python 3.13+: okuyucu çıkarken tabloyu silmesin
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            return shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __len__(self):
+        return int(self._header['count'][0])
+
+    def _find_slot(self, symbol: str) -> Optional[int]:
+        slot = self._slot_cache.get(symbol)
+        if slot is not None:
+            return slot
+
+        # Yazıcının sonradan eklediği coin çiftleri için yuva tablosunu tara
+        encoded = symbol.encode()
+        count = len(self)
+        matches = np.flatnonzero(self._symbol[:count] == encoded)
+        if len(matches) == 0:
+            return None
+        slot = int(matches[0])
+        self._slot_cache[symbol] = slot
+        return slot
+
+    def _register(self, symbol: str) -> int:
+        """
+        Coin çiftine yuva ayırır (yalnızca yazıcı)
+        """
+        with self._register_lock:
+            slot = self._find_slot(symbol)
+            if slot is not None:
+                return slot
+
+            count = len(self)
+            if count >= self.capacity:
+                raise ValueError(f"Fiyat tablosu dolu ({self.capacity} coin çifti)")
+
+            encoded = symbol.encode()
+            if len(encoded) > SLOT_DTYPE['symbol'].itemsize:
+                raise ValueError(f"Coin çifti adı çok uzun: {symbol}")
+
+            self._symbol[count] = encoded
+            # Sayaç en son artırılır ki okuyucu yarım yazılmış yuvayı görmesin
+            self._header['count'][0] = count + 1
+            self._slot_cache[symbol] = count
+            return count
+
+    def publish(self, symbol: str, price: float, volume: float = 0.0, timestamp: float = None):
+        """
+        Coin çiftinin fiyatını günceller (yalnızca yazıcı)
+        """
+        if not self.create:
+            raise RuntimeError("Fiyat tablosuna yalnızca oluşturan process yazabilir")
+
+        slot = self._find_slot(symbol)
+        if slot is None:
+            slot = self._register(symbol)
+
+        seq = int(self._seq[slot])
+        self._seq[slot] = seq + 1  # Tek: yazma sürüyor
+        self._price[slot] = price
+        self._volume[slot] = volume
+        self._timestamp[slot] = time.time() if timestamp is None else timestamp
+        self._seq[slot] = seq + 2  # Çift: yazma tamamlandı
+
+    def read(self, symbol: str) -> Optional[Tuple[float, float, float]]:
+        """
+        Coin çiftinin son fiyatını kilitsiz okur
+
+        Returns:
+            tuple: (fiyat, hacim, zaman damgası), hiç yazılmadıysa veya
+                tutarlı okunamadıysa None
+        """
+        slot = self._find_slot(symbol)
+        if slot is None:
+            return None
+
+        for _ in range(MAX_READ_RETRIES):
+            before = int(self._seq[slot])
+            if before & 1 == 0:
+                price = float(self._price[slot])
+                volume = float(self._volume[slot])
+                timestamp = float(self._timestamp[slot])
+                if int(self._seq[slot]) == before:
+                    break
+            self.retry_count += 1
+        else:
+            # Yazıcı yazma ortasında sonlandıysa yuva tutarsız kalır
+            return None
+
+        if before == 0:
+            return None
+        return price, volume, timestamp
+
+    def get_price(self, symbol: str, max_age: float = None) -> Optional[float]:
+        """
+        Coin çiftinin son fiyatını döndürür
+
+        Args:
+            symbol: Coin çifti
+            max_age: Verilirse bundan eski fiyatlar için None döner (saniye)
+        """
+        entry = self.read(symbol)
+        if entry is None:
+            return None
+        price, _, timestamp = entry
+        if max_age is not None and time.time() - timestamp > max_age:
+            return None
+        return price
+
+    def symbols(self) -> List[str]:
+        """
+        Tablodaki coin çiftlerini döndürür
+        """
+        return [symbol.decode() for symbol in self._symbol[:len(self)]]
+
+    def close(self):
+        """
+        Paylaşımlı belleği bu process için kapatır; yazıcı tabloyu siler
+        """
+        # Görünümler bırakılmadan bellek kapatılamaz
+        self._seq = self._price = self._volume = self._timestamp = self._symbol = None
+        self._slots = self._header = None
+        self._shm.close()
+        if self.create:
+            self._shm.unlink()
+
+class PriceBoardFeeder:
+    """
+    Fiyat tablosunu tek noktadan besleyen yazıcı
+
+    WebSocket akışı bağlıysa ticker mesajları geldikleri anda yazılır.
+    REST ile beslemede tek bir tüm-ticker isteğiyle bütün coin çiftleri
+    güncellenir; böylece worker sayısı arttıkça API isteği artmaz.
+    """
+
+    def __init__(self, board: PriceBoard, client=None, poll_interval: float = 1.0):
+        """
+        Args:
+            board: Yazıcı modunda açılmış PriceBoard
+            client: BTCTurk API client'ı (REST beslemesi için)
+            poll_interval: REST yoklama aralığı (saniye)
+        """
+        self.board = board
+        self.client = client
+        self.poll_interval = poll_interval
+        self.symbols = set()  # Yalnızca abone olunan coin çiftleri yazılır (boşsa hiçbiri)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.publish_count = 0
+
+    def attach_stream(self, stream):
+        """
+        WebSocket akışındaki tüm ticker mesajlarını tabloya yazar
+
+        Args:
+            stream: MarketDataStream örneği
+        """
+        from market_data_stream import MSG_TICKER_PAIR
+
+        def on_ticker(payload):
+            if isinstance(payload, dict) and payload.get('PS') in self.symbols and payload.get('LA') is not None:
+                self.board.publish(payload['PS'], float(payload['LA']), float(payload.get('V', 0) or 0))
+                self.publish_count += 1
+
+        stream.add_message_listener(MSG_TICKER_PAIR, on_ticker)
+
+    def start(self):
+        """
+        REST yoklama thread'ini başlatır
+        """
+        if self.client is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Fiyat tablosu beslemesi başlatıldı - Aralık: {self.poll_interval}s")
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _poll_loop(self):
+        """
+        Tüm ticker'ları tek istekte alıp tabloya yazar (ayrı thread'de çalışır)
+        """
+        while not self._stop_event.is_set():
+            # Çalışan bot yoksa istek atılmaz; sabit kapasiteli tablo abone olunmayan çiftlerle dolmasın
+            if not self.symbols:
+                self._stop_event.wait(self.poll_interval)
+                continue
+
+            try:
+                tickers = self.client.tick()
+                now = time.time()
+                for ticker in tickers or []:
+                    symbol = ticker.get('pair')
+                    if symbol not in self.symbols:
+                        continue
+                    self.board.publish(symbol, float(ticker['last']), float(ticker.get('volume', 0) or 0), now)
+                    self.publish_count += 1
+            except Exception as e:
+                logger.error(f"Fiyat tablosu beslenirken hata: {e}")
+
+            self._stop_event.wait(self.poll_interval)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Besleme istatistiklerini döndürür
+        """
+        return {
+            'board': self.board.name,
+            'symbols': len(self.board),
+            'capacity': self.board.capacity,
+            'published': self.publish_count
+        }
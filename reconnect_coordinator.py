@@ -0,0 +1,193 @@
+import time
+import threading
+from typing import Callable, Dict, List, Any, Set
+from loguru import logger
+from retry_policy import RetryPolicy
+from poll_scheduler import get_poll_scheduler
+
+# Koordinatör durumları
+STATE_HEALTHY = 'healthy'
+STATE_RECOVERING = 'recovering'
+
+PUBLIC_PROBE_PAIR = "BTCTRY"  # Hiç bot yokken herkese açık ticker ile denenecek çift
+
+def probe_connection() -> bool:
+    """
+    Bu process'teki tüm botların bağlantısını test eder
+
+    GUI'den açılanlar dahil tüm botlar kapsanır; aynı hesabı paylaşan botlar
+    ortak bakiye önbelleği üzerinden tek istekle test edilir. Hiç bot yoksa
+    (örn: bot başlatılamadıysa) kimlik bilgisi gerektirmeyen ticker uç
+    noktası denenir.
+
+    Returns:
+        bool: Tüm hesaplara erişilebiliyorsa True
+    """
+    from trading_bot import get_active_bots
+
+    caches = {id(bot.balance_cache): bot.balance_cache for bot in get_active_bots() if bot.balance_cache}
+    if caches:
+        return all(cache.refresh() for cache in caches.values())
+
+    from btcturk_api.client import Client
+    return bool(Client().tick(pair=PUBLIC_PROBE_PAIR))
+
+class ReconnectCoordinator:
+    """
+    Bağlantı kopmalarında tek bir kurtarma döngüsü yürüten koordinatör
+
+    Aynı kesinti sırasında gelen tüm hata bildirimleri tek kurtarma
+    döngüsünde birleşir; her hata için ayrı yeniden bağlanma thread'i
+    açılmaz. Kurtarma süresince ortak yoklama zamanlayıcısı duraklatılır,
+    böylece botlar API'ye istek göndermeye devam etmez. Bağlantı jitter'lı
+    üstel geri çekilmeyle yoklanır ve ilk başarılı denemede tüm botlar
+    birlikte sürdürülür.
+    """
+
+    def __init__(self, probe: Callable[[], bool] = None, policy: RetryPolicy = None, poll_scheduler=None):
+        """
+        Args:
+            probe: Bağlantı sağlıklıysa True döndüren fonksiyon (verilmezse probe_connection)
+            policy: Deneme aralıkları için politika (yalnızca backoff kullanılır)
+            poll_scheduler: Duraklatılacak yoklama zamanlayıcısı (verilmezse global)
+        """
+        self.probe = probe or probe_connection
+        self.policy = policy or RetryPolicy(base_delay=1.0, max_delay=60.0)
+        self.poll_scheduler = poll_scheduler or get_poll_scheduler()
+
+        self.state = STATE_HEALTHY
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._listeners: List[Callable[[str], None]] = []
+        self._sources: Set[str] = set()
+
+        self.recoveries = 0
+        self.suppressed_reports = 0
+        self.probe_attempts = 0
+        self.outage_started_at = None
+        self.last_outage_duration = None
+
+    def set_probe(self, probe: Callable[[], bool]):
+        self.probe = probe
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Durum değiştiğinde (STATE_RECOVERING / STATE_HEALTHY) çağrılacak fonksiyon ekler
+        """
+        self._listeners.append(callback)
+
+    @property
+    def is_recovering(self) -> bool:
+        return self.state == STATE_RECOVERING
+
+    def report_failure(self, source: str = "") -> bool:
+        """
+        Bağlantı hatasını bildirir; kurtarma sürmüyorsa başlatır
+
+        Args:
+            source: Hatanın kaynağı (log ve istatistik için)
+
+        Returns:
+            bool: Yeni kurtarma döngüsü başlatıldıysa True
+        """
+        with self._lock:
+            if source:
+                self._sources.add(source)
+            if self.state == STATE_RECOVERING or self._stop_event.is_set():
+                self.suppressed_reports += 1
+                return False
+            # Durum ve duraklatma aynı kilit altında değişir; kurtarma bitişiyle yarışmaz
+            self.state = STATE_RECOVERING
+            self.outage_started_at = time.time()
+            self.poll_scheduler.pause()
+
+        logger.warning(f"Bağlantı sorunu tespit edildi ({source or 'bilinmiyor'}), kurtarma başlatıldı")
+        self._notify(STATE_RECOVERING)
+
+        self._thread = threading.Thread(target=self._recover, name="ReconnectCoordinator", daemon=True)
+        self._thread.start()
+        return True
+
+    def _recover(self):
+        attempt = 0
+        while True:
+            delay = self.policy.backoff(attempt)
+            if self._stop_event.wait(delay):
+                break
+
+            attempt += 1
+            self.probe_attempts += 1
+            try:
+                healthy = bool(self.probe())
+            except Exception as e:
+                logger.warning(f"Bağlantı kontrolü hatası (deneme {attempt}): {e}")
+                healthy = False
+
+            if healthy:
+                self._finish_recovery(attempt)
+                return
+            logger.info(f"Bağlantı henüz kurulamadı (deneme {attempt})")
+
+        # Kapatılıyor: bekleyen botlar durdurma olaylarıyla çıkabilsin
+        self.poll_scheduler.resume()
+
+    def _finish_recovery(self, attempts: int):
+        # Sürdürme ve durum değişikliği report_failure ile aynı kilit altında yapılır:
+        # kilit bırakıldıktan sonra gelen bildirim yeni kurtarma başlatıp yeniden duraklatır
+        with self._lock:
+            self.poll_scheduler.resume()
+            self.state = STATE_HEALTHY
+            self.recoveries += 1
+            self.last_outage_duration = time.time() - self.outage_started_at
+            sources = sorted(self._sources)
+            self._sources.clear()
+
+        logger.info(f"Bağlantı yeniden kuruldu - {attempts} deneme, kesinti: {self.last_outage_duration:.1f}s, "
+                    f"kaynaklar: {', '.join(sources) or '-'}")
+        self._notify(STATE_HEALTHY)
+
+    def _notify(self, state: str):
+        for callback in list(self._listeners):
+            try:
+                callback(state)
+            except Exception as e:
+                logger.error(f"Yeniden bağlanma dinleyici hatası: {e}")
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Süren kurtarmayı sonlandırır ve yoklamaları serbest bırakır
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread and thread.is_alive():
+            thread.join(timeout)
+        self.poll_scheduler.resume()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            outage = time.time() - self.outage_started_at if self.state == STATE_RECOVERING else 0.0
+            return {
+                'state': self.state,
+                'recoveries': self.recoveries,
+                'suppressed_reports': self.suppressed_reports,
+                'probe_attempts': self.probe_attempts,
+                'current_outage': outage,
+                'last_outage_duration': self.last_outage_duration,
+                'sources': sorted(self._sources)
+            }
+
+# Global değişkenler
+_reconnect_coordinator = None
+_reconnect_coordinator_lock = threading.Lock()
+
+def get_reconnect_coordinator() -> ReconnectCoordinator:
+    """
+    Global yeniden bağlanma koordinatörünü döner (yoksa oluşturur)
+    """
+    global _reconnect_coordinator
+
+    with _reconnect_coordinator_lock:
+        if _reconnect_coordinator is None:
+            _reconnect_coordinator = ReconnectCoordinator()
+        return _reconnect_coordinator
@@ -0,0 +1,318 @@
+import time
+import random
+import threading
+from typing import Callable, Dict, List, Any
+from loguru import logger
+
+# Devre kesici durumları
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 10.0  # İlk açılışta deneme öncesi bekleme (saniye)
+MAX_RECOVERY_TIMEOUT = 120.0
+
+# Geçici (yeniden denenebilir) kabul edilen hata sınıfları; requests ve
+# btcturk_api import edilmeden sınıf hiyerarşisindeki adlara göre eşlenir.
+# btcturk_api'nin BadRequestError'ı kurucusunda duruma özel sınıfı fırlatır ve
+# bu sınıfların çoğu yanıtı taşımaz; 429 bu yüzden sınıf adıyla da tanınır.
+TRANSIENT_ERROR_NAMES = frozenset({
+    'TimeoutError', 'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout',
+    'ChunkedEncodingError', 'ProxyError', 'SSLError', 'InternalServerError',
+    'RequestLimitExceededError',
+})
+
+# Yanıt taşıyan 4xx hatalarından yalnızca hız sınırı (429) geçicidir,
+# diğerleri iş kuralı redleridir
+RATE_LIMIT_STATUS = 429
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Hatanın bağlantı/sunucu kaynaklı geçici bir hata olup olmadığını döndürür
+
+    Borsanın iş kuralı hataları (yetersiz bakiye, açık emir vb.) geçici
+    sayılmaz; bunlar yeniden denemeyle düzelmez ve devre kesiciyi açmamalıdır.
+    HTTP yanıtı taşıyan hatalar durum koduna göre sınıflandırılır.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if isinstance(status_code, int):
+        return status_code == RATE_LIMIT_STATUS or status_code >= 500
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+class CircuitOpenError(Exception):
+    """
+    Devre kesici açıkken yapılan çağrıda fırlatılır (istek API'ye gönderilmez)
+    """
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Devre açık: {endpoint} ({retry_after:.1f}s sonra tekrar denenecek)")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Tek bir API uç noktası için devre kesici
+
+    Ardışık geçici hata sayısı eşiği aşınca devre açılır ve çağrılar API'ye
+    gitmeden CircuitOpenError ile reddedilir. Bekleme süresi dolunca yarı
+    açık duruma geçilir ve tek bir deneme çağrısına izin verilir: başarılıysa
+    devre kapanır, başarısızsa bekleme süresi ikiye katlanarak (üst sınıra
+    kadar) devre yeniden açılır. Böylece kısa kesintilerden hızlı dönülür,
+    uzun kesintilerde API'ye giden deneme sayısı azalır.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+                 max_recovery_timeout: float = MAX_RECOVERY_TIMEOUT):
+        """
+        Args:
+            name: Uç nokta adı
+            failure_threshold: Devreyi açan ardışık geçici hata sayısı
+            recovery_timeout: Açıldıktan sonra ilk deneme öncesi bekleme (saniye)
+            max_recovery_timeout: Art arda başarısız denemelerde beklemenin üst sınırı
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.current_timeout = recovery_timeout
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        self.rejected_calls = 0
+        self.open_count = 0
+
+    def before_call(self):
+        """
+        Çağrıdan önce devre durumunu kontrol eder
+
+        Raises:
+            CircuitOpenError: Devre açıksa veya yarı açık denemesi sürüyorsa
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == STATE_OPEN and now - self.opened_at >= self.current_timeout:
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Devre yarı açık, deneme çağrısına izin veriliyor: {self.name}")
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.rejected_calls += 1
+            retry_after = max(0.0, self.opened_at + self.current_timeout - now)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state == STATE_CLOSED:
+                return
+            logger.info(f"Devre kapandı, {self.name} yeniden erişilebilir")
+            self.state = STATE_CLOSED
+            self.current_timeout = self.recovery_timeout
+            self._probe_in_flight = False
+        _notify_circuit_listeners(self.name, STATE_CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            was_closed = self.state == STATE_CLOSED
+            if self.state == STATE_HALF_OPEN:
+                self.current_timeout = min(self.current_timeout * 2, self.max_recovery_timeout)
+                self._open()
+            elif was_closed and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+            else:
+                return
+        # Dinleyiciler yalnızca kapalıdan açığa geçişte uyarılır (yarı açık denemeleri değil)
+        if was_closed:
+            _notify_circuit_listeners(self.name, STATE_OPEN)
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.open_count += 1
+        logger.warning(f"Devre açıldı: {self.name} - {self.consecutive_failures} ardışık hata, "
+                       f"{self.current_timeout:.1f}s boyunca istek gönderilmeyecek")
+
+    def record_result(self, error: BaseException = None):
+        """
+        Çağrı sonucunu kaydeder; yalnızca geçici hatalar başarısızlık sayılır
+        """
+        if error is not None and is_transient_error(error):
+            self.record_failure()
+        elif not isinstance(error, CircuitOpenError):
+            self.record_success()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Fonksiyonu devre kesici denetiminde çağırır
+        """
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_result(e)
+            raise
+        self.record_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self.current_timeout = self.recovery_timeout
+            self._probe_in_flight = False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_after = 0.0
+            if self.state == STATE_OPEN:
+                retry_after = max(0.0, self.opened_at + self.current_timeout - time.monotonic())
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'open_count': self.open_count,
+                'rejected_calls': self.rejected_calls,
+                'retry_after': retry_after
+            }
+
+class RetryPolicy:
+    """
+    Üstel geri çekilme ve tam jitter ile sınırlı yeniden deneme politikası
+
+    n. denemeden önceki bekleme [0, min(max_delay, base_delay * multiplier^n)]
+    aralığından rastgele seçilir (full jitter). Aynı anda hata alan çok sayıda
+    bot böylece API'ye aynı anda geri dönmez. Devre açık hataları yeniden
+    denenmez; çağıran hemen vazgeçer.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                 multiplier: float = 2.0, jitter: bool = True,
+                 retry_on: Callable[[BaseException], bool] = is_transient_error,
+                 max_elapsed: float = None):
+        """
+        Args:
+            max_retries: İlk denemeden sonraki en fazla tekrar sayısı
+            base_delay: İlk bekleme üst sınırı (saniye)
+            max_delay: Tek bekleme için üst sınır (saniye)
+            multiplier: Her denemede üst sınırın çarpanı
+            jitter: False ise bekleme rastgele değil üst sınırın kendisidir
+            retry_on: Hatanın yeniden denenip denenmeyeceğine karar veren fonksiyon
+            max_elapsed: Tüm denemeler için toplam süre sınırı (saniye)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.max_elapsed = max_elapsed
+
+    def backoff(self, attempt: int) -> float:
+        """
+        attempt numaralı (0'dan başlar) yeniden denemeden önceki bekleme süresi
+        """
+        ceiling = min(self.max_delay, self.base_delay * (self.multiplier ** attempt))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        if attempt >= self.max_retries or isinstance(error, CircuitOpenError):
+            return False
+        return self.retry_on(error)
+
+    def execute(self, func: Callable, *args, sleep: Callable[[float], Any] = time.sleep,
+                description: str = None, **kwargs):
+        """
+        Fonksiyonu politika ile çağırır
+
+        Args:
+            func: Çağrılacak fonksiyon
+            *args, **kwargs: Fonksiyon argümanları
+            sleep: Bekleme fonksiyonu; True dönerse (örn: durdurma olayı)
+                denemeler kesilir ve son hata fırlatılır
+            description: Log mesajları için ad
+
+        Raises:
+            Exception: Son denemenin hatası
+        """
+        name = description or getattr(func, '__name__', 'çağrı')
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not self.should_retry(e, attempt):
+                    raise
+                delay = self.backoff(attempt)
+                if self.max_elapsed is not None and time.monotonic() - started + delay > self.max_elapsed:
+                    raise
+                attempt += 1
+                logger.warning(f"{name} başarısız (deneme {attempt}/{self.max_retries + 1}): {e} - "
+                               f"{delay:.2f}s sonra tekrar denenecek")
+                if sleep(delay):
+                    raise
+
+# Global değişkenler
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+_circuit_listeners: List[Callable[[str, str], None]] = []
+
+def add_circuit_listener(callback: Callable[[str, str], None]):
+    """
+    Devre açılıp kapandığında (uç nokta adı, yeni durum) ile çağrılacak fonksiyon ekler
+
+    Fonksiyon hatayı alan çağrının thread'inde çalışır; uzun iş yapmamalıdır.
+    """
+    with _circuit_breakers_lock:
+        if callback not in _circuit_listeners:
+            _circuit_listeners.append(callback)
+
+def remove_circuit_listener(callback: Callable[[str, str], None]):
+    with _circuit_breakers_lock:
+        if callback in _circuit_listeners:
+            _circuit_listeners.remove(callback)
+
+def _notify_circuit_listeners(name: str, state: str):
+    with _circuit_breakers_lock:
+        listeners = list(_circuit_listeners)
+    for callback in listeners:
+        try:
+            callback(name, state)
+        except Exception as e:
+            logger.error(f"Devre kesici dinleyici hatası: {e}")
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Uç nokta için process genelinde paylaşılan devre kesiciyi döner (yoksa oluşturur)
+
+    Args:
+        name: Uç nokta adı
+        **kwargs: İlk oluşturmada CircuitBreaker parametreleri
+    """
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        with _circuit_breakers_lock:
+            breaker = _circuit_breakers.get(name)
+            if breaker is None:
+                breaker = _circuit_breakers[name] = CircuitBreaker(name, **kwargs)
+    return breaker
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Tüm devre kesicilerin durumunu döndürür
+    """
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return {breaker.name: breaker.get_statistics() for breaker in breakers}
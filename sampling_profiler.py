@@ -0,0 +1,306 @@
+import os
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from loguru import logger
+
+DEFAULT_INTERVAL = 0.01  # 100 Hz
+DEFAULT_DURATION = 30.0
+DEFAULT_OUTPUT_DIR = "profiles"
+MAX_STACK_DEPTH = 128
+
+# Yaprağı bu fonksiyonlardan biri olan yığınlar bekleyen (boşta) thread'lerdir
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+    ('socketserver.py', 'serve_forever'),
+    ('connection.py', '_poll'),
+    ('connection.py', '_recv_bytes'),
+}
+
+def _frame_label(code) -> str:
+    """
+    Kod nesnesini flame graph çerçeve adına çevirir
+
+    Satır numarası olarak fonksiyonun ilk satırı kullanılır; böylece aynı
+    fonksiyonun farklı satırlarındaki örnekler tek çerçevede birleşir.
+    """
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    Çalışan uygulamadaki tüm thread'lerin yığınlarını periyodik olarak örnekleyen profilci
+
+    Ayrı bir thread sys._current_frames() ile belirli aralıklarla yığınları
+    okur ve aynı yığınları sayarak biriktirir. Yorumlayıcıya iz fonksiyonu
+    kurulmadığı için ölçülen koda ek yük getirmez; maliyet yalnızca örnekleme
+    thread'inin kendi çalışma süresidir. Sonuç, flamegraph.pl, speedscope ve
+    benzeri araçların okuduğu 'folded stack' formatında yazılır:
+
+        thread;dış_fonksiyon;...;iç_fonksiyon örnek_sayısı
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 include_idle: bool = False):
+        """
+        Args:
+            interval: Örnekleme aralığı (saniye)
+            output_dir: Profil dosyalarının yazılacağı dizin
+            include_idle: Kilit/kuyruk/soket bekleyen thread'ler de sayılsın mı
+        """
+        self.interval = interval
+        self.output_dir = output_dir
+        self.include_idle = include_idle
+
+        self._stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._on_complete = None
+
+        self.samples = 0
+        self.idle_samples = 0
+        self.started_at = None
+        self.stopped_at = None
+        self.last_output = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = DEFAULT_DURATION,
+              on_complete: Callable[[Optional[str]], None] = None) -> bool:
+        """
+        Örneklemeyi başlatır
+
+        Args:
+            duration: Süre (saniye); dolunca profil otomatik yazılır.
+                None verilirse stop() çağrılana kadar sürer
+            on_complete: Süre dolup dosya yazıldığında örnekleme thread'inden
+                dosya yolu ile çağrılır
+
+        Returns:
+            bool: Başlatıldıysa True (zaten çalışıyorsa False)
+        """
+        with self._lock:
+            if self.is_running:
+                logger.warning("Örnekleme profilcisi zaten çalışıyor")
+                return False
+            self._stacks.clear()
+            self.samples = 0
+            self.idle_samples = 0
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._on_complete = on_complete
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, args=(duration,),
+                                            name="SamplingProfiler", daemon=True)
+            self._thread.start()
+
+        limit = f"{duration:g}s" if duration else "süresiz"
+        logger.info(f"Örnekleme profilcisi başlatıldı - Aralık: {self.interval * 1000:.0f}ms, Süre: {limit}")
+        return True
+
+    def stop(self, write: bool = True) -> Optional[str]:
+        """
+        Örneklemeyi durdurur
+
+        Args:
+            write: Toplanan örnekler dosyaya yazılsın mı
+
+        Returns:
+            str: Yazılan dosyanın yolu (yazılmadıysa None)
+        """
+        thread = self._thread
+        if thread is None:
+            return None
+        self._stop_event.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.interval * 10))
+        self._thread = None
+        return self.write() if write else None
+
+    def _run(self, duration: Optional[float]):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + duration if duration else None
+        next_sample = time.monotonic()
+
+        while not self._stop_event.is_set():
+            self._sample(own_ident)
+
+            next_sample += self.interval
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            if next_sample < now:
+                # Geride kalındıysa kaçırılan örnekler telafi edilmez
+                next_sample = now
+            self._stop_event.wait(next_sample - now)
+
+        if not self._stop_event.is_set():
+            # Süre doldu: dosyayı bu thread'de yaz
+            self._thread = None
+            path = self.write()
+            if self._on_complete:
+                try:
+                    self._on_complete(path)
+                except Exception as e:
+                    logger.error(f"Profil tamamlama geri çağrısı hatası: {e}")
+
+    def _sample(self, own_ident: int):
+        """
+        Tüm thread'lerin o anki yığınını bir kez örnekler
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames = sys._current_frames()
+        stacks: List[Tuple[str, ...]] = []
+        idle = 0
+
+        for ident, frame in frames.items():
+            if ident == own_ident:
+                continue
+            leaf = frame.f_code
+            if not self.include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                idle += 1
+                continue
+
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            thread_name = names.get(ident, f"thread-{ident}").replace(";", ",")
+            labels.append(thread_name)
+            labels.reverse()
+            stacks.append(tuple(labels))
+        del frames
+
+        with self._lock:
+            self._stacks.update(stacks)
+            self.samples += 1
+            self.idle_samples += idle
+
+    def write(self, path: str = None) -> Optional[str]:
+        """
+        Toplanan yığınları folded stack formatında dosyaya yazar
+
+        Args:
+            path: Hedef dosya (verilmezse output_dir altında zaman damgalı ad)
+
+        Returns:
+            str: Dosya yolu (hiç yığın yoksa None)
+        """
+        self.stopped_at = time.time()
+        with self._lock:
+            stacks = list(self._stacks.items())
+        if not stacks:
+            logger.warning("Profil yazılmadı: örneklenen aktif yığın yok")
+            return None
+
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.output_dir, f"profile_{timestamp}.folded")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+        self.last_output = path
+        logger.info(f"Profil yazıldı: {path} ({self.samples} örnek, {len(stacks)} farklı yığın)")
+        for label, count in self.top_functions(5):
+            logger.info(f"  {count:>6} örnek  {label}")
+        return path
+
+    def top_functions(self, count: int = 10) -> List[Tuple[str, int]]:
+        """
+        Yığının en üstünde (kendi süresiyle) en çok görülen fonksiyonlar
+
+        Args:
+            count: Döndürülecek fonksiyon sayısı
+
+        Returns:
+            list: [(çerçeve adı, örnek sayısı)]
+        """
+        leaves: Counter = Counter()
+        with self._lock:
+            for stack, samples in self._stacks.items():
+                leaves[stack[-1]] += samples
+        return leaves.most_common(count)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        end = self.stopped_at if self.stopped_at and not self.is_running else time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        with self._lock:
+            unique = len(self._stacks)
+        return {
+            'running': self.is_running,
+            'samples': self.samples,
+            'idle_samples': self.idle_samples,
+            'unique_stacks': unique,
+            'elapsed': elapsed,
+            'effective_rate': self.samples / elapsed if elapsed > 0 else 0.0,
+            'last_output': self.last_output
+        }
+
+# Global değişkenler
+_sampling_profiler = None
+_sampling_profiler_lock = threading.Lock()
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """
+    Global örnekleme profilcisini döner (yoksa oluşturur)
+    """
+    global _sampling_profiler
+
+    with _sampling_profiler_lock:
+        if _sampling_profiler is None:
+            _sampling_profiler = SamplingProfiler()
+        return _sampling_profiler
+
+def toggle_profiling(duration: float = DEFAULT_DURATION,
+                     on_complete: Callable[[Optional[str]], None] = None) -> Optional[str]:
+    """
+    Profilci çalışıyorsa durdurup dosyayı yazar, çalışmıyorsa başlatır
+
+    Returns:
+        str: Durdurulduysa yazılan dosyanın yolu, başlatıldıysa None
+    """
+    profiler = get_sampling_profiler()
+    if profiler.is_running:
+        return profiler.stop()
+    profiler.start(duration, on_complete)
+    return None
+
+def install_signal_handler(duration: float = DEFAULT_DURATION) -> bool:
+    """
+    SIGUSR1 ile profilciyi açıp kapatan sinyal işleyicisini kurar
+
+    Örnek: kill -USR1 <pid>  (ilk sinyal başlatır, ikincisi erken durdurur)
+    Ana thread'den çağrılmalıdır.
+
+    Returns:
+        bool: Kurulduysa True (Windows'ta SIGUSR1 yoktur)
+    """
+    if not hasattr(signal, 'SIGUSR1'):
+        return False
+
+    def handler(signum, frame):
+        # Dosya yazımı sinyal işleyicisini bekletmesin diye ayrı thread'de yapılır
+        threading.Thread(target=toggle_profiling, args=(duration,), name="ProfilerToggle", daemon=True).start()
+
+    try:
+        signal.signal(signal.SIGUSR1, handler)
+    except ValueError as e:
+        logger.warning(f"Profil sinyal işleyicisi kurulamadı: {e}")
+        return False
+    logger.info(f"Örnekleme profilcisi SIGUSR1 ile açılıp kapatılabilir (pid: {os.getpid()}, süre: {duration:g}s)")
+    return True
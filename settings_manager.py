@@ -31,6 +31,15 @@ class BotSettings:
     price_check_interval: int = 1  # saniye
     trend_analysis_minutes: int = 5
     volatility_threshold: float = 3.0
+    enable_websocket: bool = False  # Fiyatları REST yerine WebSocket akışından al
+    websocket_url: str = "wss://ws-feed-pro.btcturk.com/"
+    enable_market_recording: bool = False  # Görülen tick/trade verilerini diske kaydet
+    market_data_dir: str = "market_data"
+    worker_processes: int = 0  # Botları dağıtacak worker process sayısı (0: tek process)
+    metrics_port: int = 0  # Prometheus /metrics HTTP portu (0: kapalı)
+    metrics_host: str = "127.0.0.1"
+    enable_memory_tracking: bool = False  # tracemalloc ile periyodik bellek ölçümü (ek maliyetlidir)
+    memory_snapshot_interval: int = 300  # Bellek ölçüm aralığı (saniye)
     
     # GUI Ayarları
     theme: str = "dark"
@@ -255,6 +264,11 @@ class SettingsWindow:
         self.price_interval_var = ctk.IntVar()
         self.trend_minutes_var = ctk.IntVar()
         self.volatility_threshold_var = ctk.DoubleVar()
+        self.websocket_var = ctk.BooleanVar()
+        self.recording_var = ctk.BooleanVar()
+        self.worker_processes_var = ctk.IntVar()
+        self.metrics_port_var = ctk.IntVar()
+        self.memory_tracking_var = ctk.BooleanVar()
         
         # GUI Ayarları
         self.theme_var = ctk.StringVar()
@@ -371,7 +385,22 @@ class SettingsWindow:
         ctk.CTkEntry(frame, textvariable=self.trend_minutes_var).pack(fill="x", padx=10, pady=2)
         
         ctk.CTkLabel(frame, text="Volatilite Eşiği (%):").pack(anchor="w", padx=10)
-        ctk.CTkEntry(frame, textvariable=self.volatility_threshold_var).pack(fill="x", padx=10, pady=(2, 15))
+        ctk.CTkEntry(frame, textvariable=self.volatility_threshold_var).pack(fill="x", padx=10, pady=2)
+        
+        ctk.CTkCheckBox(frame, text="WebSocket Fiyat Akışı (yeniden başlatma gerekir)", 
+                       variable=self.websocket_var).pack(anchor="w", padx=10, pady=2)
+        
+        ctk.CTkCheckBox(frame, text="Piyasa Verisi Kaydı (yeniden başlatma gerekir)", 
+                       variable=self.recording_var).pack(anchor="w", padx=10, pady=2)
+        
+        ctk.CTkLabel(frame, text="Worker Process Sayısı (0: tek process, yeniden başlatma gerekir):").pack(anchor="w", padx=10)
+        ctk.CTkEntry(frame, textvariable=self.worker_processes_var).pack(fill="x", padx=10, pady=2)
+        
+        ctk.CTkLabel(frame, text="Metrik Portu (Prometheus /metrics, 0: kapalı, yeniden başlatma gerekir):").pack(anchor="w", padx=10)
+        ctk.CTkEntry(frame, textvariable=self.metrics_port_var).pack(fill="x", padx=10, pady=2)
+        
+        ctk.CTkCheckBox(frame, text="Bellek İzleme (tracemalloc, yeniden başlatma gerekir)", 
+                       variable=self.memory_tracking_var).pack(anchor="w", padx=10, pady=(2, 15))
     
     def create_gui_section(self, parent):
         """
@@ -460,6 +489,11 @@ class SettingsWindow:
         self.price_interval_var.set(settings.price_check_interval)
         self.trend_minutes_var.set(settings.trend_analysis_minutes)
         self.volatility_threshold_var.set(settings.volatility_threshold)
+        self.websocket_var.set(settings.enable_websocket)
+        self.recording_var.set(settings.enable_market_recording)
+        self.worker_processes_var.set(settings.worker_processes)
+        self.metrics_port_var.set(settings.metrics_port)
+        self.memory_tracking_var.set(settings.enable_memory_tracking)
         self.theme_var.set(settings.theme)
         self.color_theme_var.set(settings.color_theme)
         self.sound_alerts_var.set(settings.enable_sound_alerts)
@@ -484,6 +518,11 @@ class SettingsWindow:
             settings.price_check_interval = self.price_interval_var.get()
             settings.trend_analysis_minutes = self.trend_minutes_var.get()
             settings.volatility_threshold = self.volatility_threshold_var.get()
+            settings.enable_websocket = self.websocket_var.get()
+            settings.enable_market_recording = self.recording_var.get()
+            settings.worker_processes = self.worker_processes_var.get()
+            settings.metrics_port = self.metrics_port_var.get()
+            settings.enable_memory_tracking = self.memory_tracking_var.get()
             settings.theme = self.theme_var.get()
             settings.color_theme = self.color_theme_var.get()
             settings.enable_sound_alerts = self.sound_alerts_var.get()
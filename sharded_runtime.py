@@ -0,0 +1,434 @@
+import os
+import time
+import queue
+import bisect
+import hashlib
+import threading
+import multiprocessing
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from loguru import logger
+from price_board import PriceBoard, PriceBoardFeeder
+
+class ConsistentHashRing:
+    """
+    Coin çiftlerini worker'lara dağıtan tutarlı hash halkası
+
+    Worker eklenip çıkarıldığında yalnızca o worker'ın payına düşen coinler
+    yer değiştirir; diğer botlar olduğu yerde kalır.
+    """
+
+    def __init__(self, nodes: List[int] = None, replicas: int = 100):
+        """
+        Args:
+            nodes: Başlangıç worker kimlikleri
+            replicas: Worker başına halkadaki sanal düğüm sayısı
+        """
+        self.replicas = replicas
+        self._keys: List[int] = []
+        self._ring: Dict[int, int] = {}
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int(hashlib.md5(value.encode()).hexdigest()[:16], 16)
+
+    def add_node(self, node: int):
+        for i in range(self.replicas):
+            key = self._hash(f"{node}:{i}")
+            self._ring[key] = node
+            bisect.insort(self._keys, key)
+
+    def remove_node(self, node: int):
+        for i in range(self.replicas):
+            key = self._hash(f"{node}:{i}")
+            if self._ring.pop(key, None) is not None:
+                index = bisect.bisect_left(self._keys, key)
+                del self._keys[index]
+
+    def get_node(self, symbol: str) -> Optional[int]:
+        """
+        Coin çiftinin atanacağı worker'ı döndürür
+        """
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, self._hash(symbol)) % len(self._keys)
+        return self._ring[self._keys[index]]
+
+def _worker_main(worker_id: int, api_key: str, api_secret: str,
+                 command_queue: multiprocessing.Queue, event_queue: multiprocessing.Queue,
+                 status_interval: float = 1.0, price_board_name: str = None):
+    """
+    Worker process ana döngüsü
+
+    Kendisine atanan coin botlarını çalıştırır, supervisor'dan gelen komutları
+    uygular ve bot olaylarını/durumlarını event kuyruğuna yazar.
+    """
+    from trading_bot import BTCTurkTradingBot
+
+    bots: Dict[str, BTCTurkTradingBot] = {}
+    price_board = PriceBoard(price_board_name) if price_board_name else None
+
+    def emit(kind: str, symbol: str, payload: Any):
+        try:
+            event_queue.put_nowait((kind, worker_id, symbol, payload))
+        except queue.Full:
+            pass
+
+    def create_bot(symbol: str) -> BTCTurkTradingBot:
+        bot = BTCTurkTradingBot(api_key, api_secret)
+        bot.set_callbacks(
+            price_callback=lambda price, profit_pct=0: emit('price', symbol, (price, profit_pct)),
+            status_callback=lambda status: emit('status', symbol, status),
+            trade_callback=lambda trade_info: emit('trade', symbol, trade_info),
+            balance_callback=lambda: emit('balance', symbol, None)
+        )
+        if price_board:
+            bot.attach_price_board(price_board)
+        return bot
+
+    logger.info(f"Worker {worker_id} başlatıldı (PID: {os.getpid()})")
+    last_status = 0.0
+
+    while True:
+        try:
+            command = command_queue.get(timeout=status_interval)
+        except queue.Empty:
+            command = None
+
+        if command is not None:
+            action, symbol, params = command
+            try:
+                if action == 'shutdown':
+                    break
+
+                elif action == 'start':
+                    bot = bots.get(symbol)
+                    if bot is None:
+                        bot = create_bot(symbol)
+                        bots[symbol] = bot
+                    # Bot başlangıçta ilk emri verdiği için komut döngüsünü bekletmesin
+                    threading.Thread(
+                        target=bot.start_trading,
+                        args=(symbol, params['target_percentage'], params['trade_amount']),
+                        daemon=True
+                    ).start()
+
+                elif action == 'stop':
+                    bot = bots.pop(symbol, None)
+                    if bot:
+                        bot.stop_trading()
+                        bot.join(timeout=2)
+                    emit('stopped', symbol, None)
+
+                elif action == 'reconfigure':
+                    bot = bots.get(symbol)
+                    if bot:
+                        if 'target_percentage' in params:
+                            bot.target_profit_percentage = params['target_percentage']
+                        if 'trade_amount' in params:
+                            bot.amount_to_trade = params['trade_amount']
+
+            except Exception as e:
+                logger.error(f"Worker {worker_id} komut hatası ({action} {symbol}): {e}")
+                emit('error', symbol, str(e))
+
+        now = time.time()
+        if now - last_status >= status_interval:
+            last_status = now
+            for symbol, bot in list(bots.items()):
+                emit('snapshot', symbol, bot.get_status())
+
+    for bot in bots.values():
+        bot.stop_trading()
+    for bot in bots.values():
+        bot.join(timeout=1)
+    if price_board:
+        price_board.close()
+    logger.info(f"Worker {worker_id} durduruldu")
+
+class RemoteBotHandle:
+    """
+    Worker process'te çalışan bota GUI tarafından erişim için vekil nesne
+
+    BTCTurkTradingBot'un GUI'nin kullandığı arayüzünü (stop_trading,
+    get_status) taklit eder.
+    """
+
+    def __init__(self, runtime: "ShardedBotRuntime", symbol: str):
+        self.runtime = runtime
+        self.symbol = symbol
+
+    def stop_trading(self):
+        self.runtime.stop_bot(self.symbol)
+
+    def get_status(self) -> Dict[str, Any]:
+        return self.runtime.get_status().get(self.symbol, {})
+
+class ShardedBotRuntime:
+    """
+    Coin botlarını birden fazla worker process'e dağıtan supervisor
+
+    Her coin çifti tutarlı hash ile bir worker'a atanır; böylece CPU yoğun
+    gösterge hesaplamaları tek GIL'de sıralanmaz. Supervisor komutları
+    (başlat/durdur/yeniden yapılandır) ilgili worker'a iletir, worker'lardan
+    gelen olayları callback'lere dağıtır ve son durumları toplar. Çöken
+    worker yeniden başlatılır ve botları tekrar gönderilir.
+
+    Fiyatlar supervisor'da tek noktadan alınıp paylaşımlı fiyat tablosuna
+    yazılır; worker'lardaki botlar fiyatı tablodan okur.
+
+    Callback'ler supervisor'ın toplayıcı thread'inde çağrılır.
+    """
+
+    def __init__(self, api_key: str = None, api_secret: str = None, num_workers: int = None,
+                 status_interval: float = 1.0, client=None, price_board_capacity: int = 1024):
+        """
+        Args:
+            api_key: BTCTurk API anahtarı
+            api_secret: BTCTurk API gizli anahtarı
+            num_workers: Worker process sayısı (varsayılan: CPU çekirdek sayısı)
+            status_interval: Worker'ların durum gönderme aralığı (saniye)
+            client: Fiyat tablosunu REST ile besleyecek API client'ı
+            price_board_capacity: Paylaşımlı fiyat tablosundaki yuva sayısı
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.status_interval = status_interval
+        self.client = client
+        self.price_board_capacity = price_board_capacity
+        self.price_board: Optional[PriceBoard] = None
+        self.price_feeder: Optional[PriceBoardFeeder] = None
+
+        # Thread'li süreçte fork güvenli olmadığı için spawn kullanılır
+        self._context = multiprocessing.get_context('spawn')
+        self._event_queue = self._context.Queue(maxsize=10000)
+        self._workers: Dict[int, Tuple[Any, Any]] = {}  # {worker_id: (process, command_queue)}
+        self._ring = ConsistentHashRing()
+
+        self._assignments: Dict[str, int] = {}  # {symbol: worker_id}
+        self._bot_params: Dict[str, Dict[str, Any]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        self._collector_thread = None
+        self._stop_event = threading.Event()
+
+        # Callback fonksiyonları
+        self.price_callback: Optional[Callable] = None   # (symbol, price, profit_pct)
+        self.status_callback: Optional[Callable] = None  # (symbol, status)
+        self.trade_callback: Optional[Callable] = None   # (symbol, trade_info)
+        self.balance_callback: Optional[Callable] = None  # ()
+
+    def start(self):
+        """
+        Fiyat tablosunu, worker process'lerini ve olay toplayıcıyı başlatır
+        """
+        self.price_board = PriceBoard(capacity=self.price_board_capacity, create=True)
+        self.price_feeder = PriceBoardFeeder(self.price_board, self.client)
+        self.price_feeder.start()
+
+        for worker_id in range(self.num_workers):
+            self._spawn_worker(worker_id)
+            self._ring.add_node(worker_id)
+
+        self._stop_event.clear()
+        self._collector_thread = threading.Thread(target=self._collect_events, daemon=True)
+        self._collector_thread.start()
+        logger.info(f"Parçalı bot çalışma ortamı başlatıldı - {self.num_workers} worker")
+
+    def _spawn_worker(self, worker_id: int):
+        command_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self.api_key, self.api_secret, command_queue,
+                  self._event_queue, self.status_interval, self.price_board.name),
+            name=f"bot-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = (process, command_queue)
+
+    def _send(self, worker_id: int, action: str, symbol: str = None, params: Dict[str, Any] = None):
+        process, command_queue = self._workers[worker_id]
+        command_queue.put((action, symbol, params or {}))
+
+    def start_bot(self, symbol: str, target_percentage: float, trade_amount: float) -> RemoteBotHandle:
+        """
+        Coin botunu atandığı worker'da başlatır
+
+        Returns:
+            RemoteBotHandle: Bot vekil nesnesi
+        """
+        params = {'target_percentage': target_percentage, 'trade_amount': trade_amount}
+        with self._lock:
+            worker_id = self._ring.get_node(symbol)
+            self._assignments[symbol] = worker_id
+            self._bot_params[symbol] = params
+            self.price_feeder.symbols.add(symbol)
+
+        self._send(worker_id, 'start', symbol, params)
+        logger.info(f"{symbol} botu worker {worker_id}'e gönderildi")
+        return RemoteBotHandle(self, symbol)
+
+    def stop_bot(self, symbol: str):
+        """
+        Coin botunu durdurur
+        """
+        with self._lock:
+            worker_id = self._assignments.pop(symbol, None)
+            self._bot_params.pop(symbol, None)
+            self.price_feeder.symbols.discard(symbol)
+        if worker_id is not None:
+            self._send(worker_id, 'stop', symbol)
+
+    def reconfigure_bot(self, symbol: str, **params):
+        """
+        Çalışan botun parametrelerini günceller (target_percentage, trade_amount)
+        """
+        with self._lock:
+            worker_id = self._assignments.get(symbol)
+            if worker_id is None:
+                return
+            self._bot_params[symbol].update(params)
+        self._send(worker_id, 'reconfigure', symbol, params)
+
+    def attach_market_stream(self, stream):
+        """
+        WebSocket akışını fiyat tablosu beslemesine bağlar
+        """
+        self.price_feeder.attach_stream(stream)
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm botların son bilinen durumunu döndürür
+
+        Returns:
+            dict: {symbol: durum sözlüğü (worker_id dahil)}
+        """
+        with self._lock:
+            return {symbol: dict(status) for symbol, status in self._status.items()}
+
+    def get_worker_summary(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Worker başına bot sayısı ve canlılık bilgisini döndürür
+        """
+        with self._lock:
+            summary = {worker_id: {'alive': process.is_alive(), 'pid': process.pid, 'bots': 0}
+                       for worker_id, (process, _) in self._workers.items()}
+            for worker_id in self._assignments.values():
+                summary[worker_id]['bots'] += 1
+        return summary
+
+    def collect_metrics(self) -> List[Any]:
+        """
+        Worker'lardaki botların son durum bilgilerini metrik ailelerine çevirir
+
+        Değerler worker'ların periyodik gönderdiği durum özetlerinden gelir;
+        bu nedenle en fazla status_interval kadar gecikmelidir.
+        """
+        from metrics_server import MetricFamily, build_bot_families
+
+        alive = MetricFamily("worker_alive", "gauge", "Worker process çalışıyor mu (1/0)")
+        bots = MetricFamily("worker_bots", "gauge", "Worker'a atanmış bot sayısı")
+
+        summaries = self.get_worker_summary()
+        for worker_id, summary in summaries.items():
+            alive.add(summary['alive'], worker=str(worker_id))
+            bots.add(summary['bots'], worker=str(worker_id))
+
+        statuses = [(symbol, status, str(status.get('worker_id')))
+                    for symbol, status in self.get_status().items()]
+        families = build_bot_families(statuses, workers=[str(worker_id) for worker_id in summaries])
+        families.extend([alive, bots])
+        try:
+            depth = self._event_queue.qsize()
+            families.append(MetricFamily("queue_depth", "gauge", "İç kuyruklarda bekleyen öğe sayısı")
+                            .add(depth, queue="worker_events"))
+        except NotImplementedError:  # macOS
+            pass
+        return families
+
+    def _collect_events(self):
+        """
+        Worker olaylarını toplar ve callback'lere dağıtır (ayrı thread'de çalışır)
+        """
+        last_health_check = time.time()
+
+        while not self._stop_event.is_set():
+            try:
+                kind, worker_id, symbol, payload = self._event_queue.get(timeout=0.5)
+                self._dispatch(kind, worker_id, symbol, payload)
+            except queue.Empty:
+                pass
+            except Exception as e:
+                logger.error(f"Worker olayı işlenirken hata: {e}")
+
+            if time.time() - last_health_check >= 2.0:
+                last_health_check = time.time()
+                self._check_workers()
+
+    def _dispatch(self, kind: str, worker_id: int, symbol: str, payload: Any):
+        if kind == 'snapshot':
+            with self._lock:
+                if symbol in self._assignments:
+                    self._status[symbol] = dict(payload, worker_id=worker_id)
+        elif kind == 'stopped':
+            with self._lock:
+                self._status.pop(symbol, None)
+        elif kind == 'price' and self.price_callback:
+            self.price_callback(symbol, payload[0], payload[1])
+        elif kind == 'status' and self.status_callback:
+            self.status_callback(symbol, payload)
+        elif kind == 'trade' and self.trade_callback:
+            self.trade_callback(symbol, payload)
+        elif kind == 'balance' and self.balance_callback:
+            self.balance_callback()
+        elif kind == 'error':
+            logger.error(f"Worker {worker_id} - {symbol}: {payload}")
+
+    def _check_workers(self):
+        """
+        Çöken worker'ları yeniden başlatır ve botlarını tekrar gönderir
+        """
+        for worker_id, (process, _) in list(self._workers.items()):
+            if process.is_alive() or self._stop_event.is_set():
+                continue
+
+            logger.error(f"Worker {worker_id} beklenmedik şekilde sonlandı (kod: {process.exitcode}), yeniden başlatılıyor")
+            self._spawn_worker(worker_id)
+
+            with self._lock:
+                orphaned = [(symbol, dict(self._bot_params[symbol]))
+                            for symbol, assigned in self._assignments.items() if assigned == worker_id]
+            for symbol, params in orphaned:
+                self._send(worker_id, 'start', symbol, params)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Tüm worker'ları durdurur
+
+        Args:
+            timeout: Worker'ların kapanması için toplam süre sınırı (saniye)
+        """
+        self._stop_event.set()
+        for worker_id in list(self._workers):
+            try:
+                self._send(worker_id, 'shutdown')
+            except Exception:
+                pass
+
+        deadline = time.time() + timeout
+        for worker_id, (process, _) in self._workers.items():
+            process.join(timeout=max(0.0, deadline - time.time()))
+            if process.is_alive():
+                logger.warning(f"Worker {worker_id} süre sınırında kapanmadı, sonlandırılıyor")
+                process.terminate()
+
+        if self._collector_thread:
+            self._collector_thread.join(timeout=1)
+
+        self.price_feeder.stop()
+        self.price_board.close()
+        logger.info("Parçalı bot çalışma ortamı durduruldu")
@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Any
+from loguru import logger
+
+# Bot pozisyon aşamaları
+PHASE_IDLE = 'idle'
+PHASE_BUY_PENDING = 'buy_pending'
+PHASE_BOUGHT = 'bought'  # Alış gerçekleşti, satış emri henüz açılmadı
+PHASE_SELL_PENDING = 'sell_pending'
+
+class BotStateStore:
+    """
+    Bot pozisyon durumunu çökmeye dayanıklı saklayan sınıf
+
+    Her durum geçişi önce write-ahead log'a (WAL) eklenir ve diske
+    senkronlanır. Periyodik olarak tüm durum atomik bir snapshot dosyasına
+    yazılır ve WAL kısaltılır. Kurtarmada snapshot okunur, ardından
+    snapshot'tan sonraki WAL kayıtları sırayla uygulanır; yarım yazılmış
+    son satır yok sayılır.
+
+    Dosyalar: base_dir/KEY.snapshot.json ve base_dir/KEY.wal
+    """
+
+    def __init__(self, base_dir: str = "bot_state", snapshot_interval: float = 60.0):
+        """
+        Args:
+            base_dir: Durum dosyalarının dizini
+            snapshot_interval: Periyodik snapshot aralığı (saniye)
+        """
+        self.base_dir = base_dir
+        self.snapshot_interval = snapshot_interval
+
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._seq: Dict[str, int] = {}
+        self._dirty = set()
+        self._lock = threading.RLock()
+        self._timer = None
+
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _paths(self, key: str):
+        return (os.path.join(self.base_dir, f"{key}.snapshot.json"),
+                os.path.join(self.base_dir, f"{key}.wal"))
+
+    def start_periodic_snapshots(self, timer_wheel):
+        """
+        Periyodik snapshot görevini zamanlayıcı çarkına ekler
+        """
+        if self._timer is None:
+            self._timer = timer_wheel.schedule(
+                self.snapshot_interval, self.snapshot_all,
+                interval=self.snapshot_interval, blocking=True, name="state_snapshot"
+            )
+
+    def record(self, key: str, event: str, changes: Dict[str, Any]):
+        """
+        Durum geçişini WAL'a yazar (diske senkronlandıktan sonra döner)
+
+        Args:
+            key: Bot anahtarı (coin çifti)
+            event: Geçiş adı (örn: buy_submitted)
+            changes: Değişen alanlar
+        """
+        with self._lock:
+            state = self._load(key)
+            seq = self._seq.get(key, 0) + 1
+            entry = {'seq': seq, 't': time.time(), 'event': event, 'changes': changes}
+
+            _, wal_path = self._paths(key)
+            with open(wal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            state.update(changes)
+            state['last_event'] = event
+            state['updated_at'] = entry['t']
+            self._seq[key] = seq
+            self._dirty.add(key)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """
+        Botun son kaydedilen durumunu döndürür
+
+        Returns:
+            dict: Durum alanları (kayıt yoksa boş)
+        """
+        with self._lock:
+            return dict(self._load(key))
+
+    def _load(self, key: str) -> Dict[str, Any]:
+        """
+        Snapshot + WAL'dan durumu kurar (kilit altında çağrılır, sonuç önbelleklenir)
+        """
+        state = self._states.get(key)
+        if state is not None:
+            return state
+
+        snapshot_path, wal_path = self._paths(key)
+        state, seq = {}, 0
+
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                state, seq = snapshot['state'], snapshot['seq']
+            except Exception as e:
+                logger.error(f"Durum snapshot'ı okunamadı, yalnızca WAL kullanılacak ({key}): {e}")
+
+        replayed = 0
+        for entry in self._read_wal(wal_path):
+            if entry['seq'] <= seq:
+                continue
+            state.update(entry['changes'])
+            state['last_event'] = entry['event']
+            state['updated_at'] = entry['t']
+            seq = entry['seq']
+            replayed += 1
+
+        if replayed:
+            logger.info(f"Bot durumu kurtarıldı ({key}): {replayed} WAL kaydı uygulandı")
+
+        self._states[key] = state
+        self._seq[key] = seq
+        return state
+
+    @staticmethod
+    def _read_wal(wal_path: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(wal_path):
+            return []
+
+        entries = []
+        with open(wal_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Çökme anında yarım kalmış son satır
+                    logger.warning(f"WAL'da bozuk kayıt atlandı: {wal_path}:{line_no}")
+        return entries
+
+    def snapshot(self, key: str):
+        """
+        Durumu atomik olarak snapshot dosyasına yazar ve WAL'ı kısaltır
+        """
+        with self._lock:
+            state = self._load(key)
+            if not state:
+                return
+            snapshot_path, wal_path = self._paths(key)
+
+            temp_path = snapshot_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'seq': self._seq[key], 'state': state}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+
+            # Snapshot diskte olduğu için eski WAL kayıtları artık gereksiz
+            with open(wal_path, 'w', encoding='utf-8'):
+                pass
+            self._dirty.discard(key)
+
+    def snapshot_all(self):
+        """
+        Değişen tüm botların snapshot'ını alır
+        """
+        with self._lock:
+            dirty = list(self._dirty)
+        for key in dirty:
+            try:
+                self.snapshot(key)
+            except Exception as e:
+                logger.error(f"Durum snapshot'ı yazılamadı ({key}): {e}")
+
+    def list_keys(self) -> List[str]:
+        """
+        Diskte durumu bulunan bot anahtarlarını döndürür
+        """
+        keys = set()
+        for file_name in os.listdir(self.base_dir):
+            if file_name.endswith(".snapshot.json"):
+                keys.add(file_name[:-len(".snapshot.json")])
+            elif file_name.endswith(".wal"):
+                keys.add(file_name[:-len(".wal")])
+        return sorted(keys)
+
+    def list_open_positions(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Açık pozisyonu veya bekleyen emri olan botları döndürür
+        """
+        positions = {}
+        for key in self.list_keys():
+            state = self.load(key)
+            if state.get('phase', PHASE_IDLE) != PHASE_IDLE:
+                positions[key] = state
+        return positions
+
+# Global değişkenler
+_state_store = None
+_state_store_lock = threading.Lock()
+
+def get_state_store() -> BotStateStore:
+    """
+    Global durum deposunu döner (yoksa oluşturur ve periyodik snapshot'ı başlatır)
+    """
+    global _state_store
+
+    with _state_store_lock:
+        if _state_store is None:
+            from timer_wheel import get_timer_wheel
+            _state_store = BotStateStore()
+            _state_store.start_periodic_snapshots(get_timer_wheel())
+            logger.info(f"Bot durum deposu başlatıldı: {_state_store.base_dir}")
+        return _state_store
@@ -0,0 +1,239 @@
+import os
+import json
+import numpy as np
+from typing import Dict, Optional, Any, Tuple
+from loguru import logger
+from market_recorder import KIND_TICK, load_index, load_chunk
+
+# Sabit genişlikli kayıt formatı (24 byte)
+TICK_DTYPE = np.dtype([('timestamp', '<f8'), ('price', '<f8'), ('volume', '<f8')])
+
+ARCHIVE_MAGIC = b"BTTICK01"
+HEADER_SIZE = 16  # magic (8) + kayıt boyutu (8)
+INDEX_STRIDE = 4096  # Seyrek index'te kaç kayıtta bir zaman damgası tutulur
+
+def archive_paths(base_dir: str, symbol: str, kind: str = KIND_TICK) -> Tuple[str, str]:
+    """
+    Arşiv ve durum dosyalarının yollarını döndürür
+
+    Returns:
+        tuple: (arşiv dosyası, durum dosyası)
+    """
+    symbol_dir = os.path.join(base_dir, symbol)
+    return (os.path.join(symbol_dir, f"{kind}.ticks"),
+            os.path.join(symbol_dir, f"{kind}.archive.json"))
+
+def build_archive(base_dir: str, symbol: str, kind: str = KIND_TICK) -> Optional[str]:
+    """
+    Kaydedicinin .npz parçalarını tek bir sabit genişlikli arşiv dosyasında birleştirir
+
+    Yalnızca henüz arşivlenmemiş parçalar sona eklenir. Yeni parça arşivin
+    son zaman damgasından önce başlıyorsa sıralamayı korumak için arşiv
+    baştan oluşturulur.
+
+    Args:
+        base_dir: Kaydedici dizini
+        symbol: Coin çifti
+        kind: Veri türü ('tick' veya 'trade')
+
+    Returns:
+        str: Arşiv dosyasının yolu, parça yoksa None
+    """
+    symbol_dir = os.path.join(base_dir, symbol)
+    archive_path, state_path = archive_paths(base_dir, symbol, kind)
+
+    chunks = sorted((entry for entry in load_index(symbol_dir) if entry['kind'] == kind),
+                    key=lambda entry: entry['start'])
+    if not chunks:
+        return None
+
+    state = {'chunks': [], 'last_timestamp': None, 'count': 0}
+    if os.path.exists(state_path) and os.path.exists(archive_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    archived = set(state['chunks'])
+    pending = [entry for entry in chunks if entry['file'] not in archived]
+    if not pending:
+        return archive_path
+
+    rebuild = (state['last_timestamp'] is not None
+               and pending[0]['start'] < state['last_timestamp'])
+    if rebuild:
+        logger.info(f"Sıra dışı parça bulundu, arşiv yeniden oluşturuluyor: {archive_path}")
+        pending = chunks
+        state = {'chunks': [], 'last_timestamp': None, 'count': 0}
+
+    records = [_chunk_records(os.path.join(symbol_dir, entry['file'])) for entry in pending]
+    merged = np.concatenate(records)
+    merged.sort(order='timestamp', kind='stable')
+
+    mode = 'wb' if rebuild or not state['chunks'] else 'ab'
+    with open(archive_path, mode) as f:
+        if mode == 'wb':
+            f.write(ARCHIVE_MAGIC + np.uint64(TICK_DTYPE.itemsize).tobytes())
+        f.write(merged.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    state['chunks'].extend(entry['file'] for entry in pending)
+    state['last_timestamp'] = float(merged['timestamp'][-1])
+    state['count'] += int(len(merged))
+
+    temp_path = state_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_path, state_path)
+
+    logger.info(f"Tick arşivi güncellendi: {archive_path} (+{len(merged)} kayıt, toplam {state['count']})")
+    return archive_path
+
+def _chunk_records(path: str) -> np.ndarray:
+    columns = load_chunk(path)
+    records = np.empty(len(columns['timestamp']), dtype=TICK_DTYPE)
+    for name in TICK_DTYPE.names:
+        records[name] = columns[name]
+    return records
+
+class TickArchiveReader:
+    """
+    Sabit genişlikli tick arşivini bellek eşlemeli (memmap) okuyan sınıf
+
+    Dosya belleğe okunmaz; işletim sistemi yalnızca erişilen sayfaları
+    yükler. Her INDEX_STRIDE kayıtta bir zaman damgası tutan seyrek index
+    ile zaman aralığı araması O(log n) yapılır ve sonuçlar kopyasız NumPy
+    görünümleri (view) olarak döner.
+    """
+
+    def __init__(self, path: str, index_stride: int = INDEX_STRIDE):
+        """
+        Args:
+            path: .ticks arşiv dosyası
+            index_stride: Seyrek index aralığı (kayıt)
+        """
+        self.path = path
+        self.index_stride = index_stride
+        self._data = None
+        self._index = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Dosyayı yeniden eşler (arşive yeni kayıt eklendikten sonra çağrılır)
+        """
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+
+        if len(header) < HEADER_SIZE or header[:8] != ARCHIVE_MAGIC:
+            raise ValueError(f"Geçersiz tick arşivi: {self.path}")
+
+        record_size = int(np.frombuffer(header[8:16], dtype=np.uint64)[0])
+        if record_size != TICK_DTYPE.itemsize:
+            raise ValueError(f"Desteklenmeyen kayıt boyutu: {record_size}")
+
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // record_size
+        if count == 0:
+            self._data = np.empty(0, dtype=TICK_DTYPE)
+        else:
+            self._data = np.memmap(self.path, dtype=TICK_DTYPE, mode='r',
+                                   offset=HEADER_SIZE, shape=(count,))
+
+        # Seyrek index: yalnızca her stride'daki zaman damgası kopyalanır
+        self._index = np.array(self._data['timestamp'][::self.index_stride])
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def first_timestamp(self) -> Optional[float]:
+        return float(self._data['timestamp'][0]) if len(self._data) else None
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return float(self._data['timestamp'][-1]) if len(self._data) else None
+
+    def _seek(self, timestamp: float, side: str = 'left') -> int:
+        """
+        Zaman damgasının arşivdeki konumunu bulur
+
+        Önce seyrek index'te blok bulunur, sonra yalnızca o blok içinde
+        ikili arama yapılır; böylece dosyanın küçük bir kısmına dokunulur.
+        """
+        if len(self._data) == 0:
+            return 0
+
+        block = int(np.searchsorted(self._index, timestamp, side=side))
+        start = max(0, (block - 1) * self.index_stride)
+        end = min(len(self._data), (block + 1) * self.index_stride)
+
+        timestamps = self._data['timestamp'][start:end]
+        return start + int(np.searchsorted(timestamps, timestamp, side=side))
+
+    def range(self, start: float = None, end: float = None) -> np.ndarray:
+        """
+        Zaman aralığındaki kayıtları döndürür
+
+        Args:
+            start: Başlangıç zamanı (dahil)
+            end: Bitiş zamanı (dahil)
+
+        Returns:
+            np.ndarray: TICK_DTYPE kayıtlarının kopyasız görünümü
+        """
+        i = 0 if start is None else self._seek(start, 'left')
+        j = len(self._data) if end is None else self._seek(end, 'right')
+        return self._data[i:j]
+
+    def columns(self, start: float = None, end: float = None) -> Dict[str, np.ndarray]:
+        """
+        Zaman aralığını sütun görünümleri olarak döndürür
+
+        Returns:
+            dict: {'timestamp', 'price', 'volume'} görünümleri
+        """
+        records = self.range(start, end)
+        return {name: records[name] for name in TICK_DTYPE.names}
+
+    def price_at(self, timestamp: float) -> Optional[float]:
+        """
+        Belirtilen anda geçerli olan son fiyatı döndürür
+        """
+        position = self._seek(timestamp, 'right')
+        if position == 0:
+            return None
+        return float(self._data['price'][position - 1])
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        Arşiv özet bilgilerini döndürür
+        """
+        return {
+            'path': self.path,
+            'records': len(self._data),
+            'size_mb': os.path.getsize(self.path) / (1024 * 1024),
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'index_entries': len(self._index)
+        }
+
+def open_tick_archive(base_dir: str, symbol: str, kind: str = KIND_TICK) -> Optional[TickArchiveReader]:
+    """
+    Arşivi kaydedici parçalarından günceller ve okuyucuyu döndürür
+
+    Args:
+        base_dir: Kaydedici dizini
+        symbol: Coin çifti
+        kind: Veri türü
+
+    Returns:
+        TickArchiveReader: Okuyucu, veri yoksa None
+    """
+    try:
+        path = build_archive(base_dir, symbol, kind)
+        if path is None:
+            logger.warning(f"Arşivlenecek veri bulunamadı: {symbol}/{kind}")
+            return None
+        return TickArchiveReader(path)
+    except Exception as e:
+        logger.error(f"Tick arşivi açılamadı ({symbol}/{kind}): {e}")
+        return None
@@ -0,0 +1,284 @@
+import time
+import random
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
+from loguru import logger
+
+class TimerHandle:
+    """
+    Zamanlanmış görev tanıtıcısı
+
+    cancel() O(1) çalışır: görev bulunduğu yuvadan doğrudan silinir.
+    """
+
+    def __init__(self, wheel: "TimerWheel", timer_id: int, callback: Callable, args: tuple,
+                 interval: Optional[float], jitter: float, blocking: bool, name: str):
+        self.wheel = wheel
+        self.timer_id = timer_id
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.jitter = jitter
+        self.blocking = blocking
+        self.name = name or getattr(callback, '__name__', 'timer')
+
+        self.expire_tick = 0
+        self.cancelled = False
+        self.run_count = 0
+        self.skipped_count = 0
+        self._slot: Optional[Dict[int, "TimerHandle"]] = None
+        self._future = None
+
+    def cancel(self):
+        """
+        Görevi iptal eder
+        """
+        self.cancelled = True
+        self.wheel._remove(self)
+
+    @property
+    def is_recurring(self) -> bool:
+        return self.interval is not None
+
+class TimerWheel:
+    """
+    Hiyerarşik zamanlayıcı çarkı (hierarchical timing wheel)
+
+    Periyodik bakım görevleri (bakiye yenileme, durum snapshot'ı, günlük risk
+    sıfırlama, log temizleme, bellek ölçümü) tek bir thread tarafından
+    yönetilir. Fiyat yoklamaları ve emir durumu kontrolleri çarkta değildir;
+    bunların sıklığını botların kendi takip döngülerinde PollScheduler
+    belirler. GUI güncellemesi Tk thread'inde root.after ile kalır.
+
+    Her seviye wheel_size yuvadan oluşur; 0. seviyenin her yuvası bir tick,
+    üst seviyelerin yuvaları alt seviyenin tam turudur. Ekleme ve iptal O(1),
+    her tick'te yalnızca süresi dolan yuva işlenir. Uzun süren görevler
+    blocking=True ile işçi havuzunda çalıştırılır ki çark gecikmesin.
+    """
+
+    def __init__(self, tick: float = 0.1, wheel_size: int = 256, levels: int = 4, max_workers: int = 4):
+        """
+        Args:
+            tick: Çark çözünürlüğü (saniye)
+            wheel_size: Seviye başına yuva sayısı
+            levels: Seviye sayısı (tick * wheel_size^levels süreye kadar)
+            max_workers: Bloklayan görevler için işçi thread sayısı
+        """
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self.max_workers = max_workers
+
+        self._slots: List[List[Dict[int, TimerHandle]]] = [
+            [{} for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._overflow: Dict[int, TimerHandle] = {}  # En üst seviyeyi aşan görevler
+        self._current_tick = 0
+        self._start_time = time.monotonic()
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._executor = None
+
+        self.fired_count = 0
+        self.timer_count = 0
+
+    def start(self):
+        """
+        Çark thread'ini başlatır
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="timer")
+        self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+        self._thread.start()
+        logger.info(f"Zamanlayıcı çarkı başlatıldı - Tick: {self.tick}s")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Çarkı durdurur, çalışan bloklayan görevlerin bitmesini bekler
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Zamanlayıcı çarkı durduruldu")
+
+    def schedule(self, delay: float, callback: Callable, *args, interval: float = None,
+                 jitter: float = 0.0, blocking: bool = False, name: str = "") -> TimerHandle:
+        """
+        Görev zamanlar
+
+        Args:
+            delay: İlk çalışmaya kadar süre (saniye)
+            callback: Çağrılacak fonksiyon
+            *args: Fonksiyon argümanları
+            interval: Verilirse görev bu aralıkla tekrarlanır (saniye)
+            jitter: Her çalışmaya eklenecek rastgele gecikmenin üst sınırı (saniye);
+                aynı aralıklı görevlerin aynı anda tetiklenmesini önler
+            blocking: True ise işçi havuzunda çalışır; önceki çalışma bitmediyse
+                tekrar eden görevin o turu atlanır
+            name: Log ve istatistikler için görev adı
+
+        Returns:
+            TimerHandle: İptal için tanıtıcı
+        """
+        handle = TimerHandle(self, next(self._ids), callback, args, interval, jitter, blocking, name)
+        with self._lock:
+            handle.expire_tick = self._current_tick + self._delay_to_ticks(delay, jitter)
+            self._insert(handle)
+            self.timer_count += 1
+        return handle
+
+    def schedule_at(self, when: float, callback: Callable, *args, **kwargs) -> TimerHandle:
+        """
+        Görevi belirli bir Unix zamanında çalışacak şekilde zamanlar
+        """
+        return self.schedule(max(0.0, when - time.time()), callback, *args, **kwargs)
+
+    def _delay_to_ticks(self, delay: float, jitter: float) -> int:
+        if jitter > 0:
+            delay += random.uniform(0, jitter)
+        return max(1, int(round(delay / self.tick)))
+
+    def _insert(self, handle: TimerHandle):
+        """
+        Görevi süresine uygun seviye ve yuvaya yerleştirir (kilit altında çağrılır)
+        """
+        delta = handle.expire_tick - self._current_tick
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.wheel_size:
+                index = (handle.expire_tick // span) % self.wheel_size
+                slot = self._slots[level][index]
+                break
+            span *= self.wheel_size
+        else:
+            slot = self._overflow
+
+        slot[handle.timer_id] = handle
+        handle._slot = slot
+
+    def _remove(self, handle: TimerHandle):
+        with self._lock:
+            if handle._slot is not None:
+                handle._slot.pop(handle.timer_id, None)
+                handle._slot = None
+                self.timer_count -= 1
+
+    def _run(self):
+        """
+        Tick'leri ilerletir ve süresi dolan görevleri çalıştırır (ayrı thread'de çalışır)
+        """
+        while not self._stop_event.is_set():
+            target_tick = int((time.monotonic() - self._start_time) / self.tick)
+
+            while self._current_tick < target_tick and not self._stop_event.is_set():
+                self._advance()
+
+            next_tick_time = self._start_time + (self._current_tick + 1) * self.tick
+            self._wakeup.wait(max(0.0, next_tick_time - time.monotonic()))
+            self._wakeup.clear()
+
+    def _advance(self):
+        """
+        Çarkı bir tick ilerletir
+        """
+        with self._lock:
+            self._current_tick += 1
+            tick = self._current_tick
+
+            # Alt seviye tam tur attıysa üst seviyedeki yuvayı aşağı dağıt
+            span = self.wheel_size
+            for level in range(1, self.levels):
+                if tick % span:
+                    break
+                index = (tick // span) % self.wheel_size
+                self._cascade(self._slots[level][index])
+                span *= self.wheel_size
+            else:
+                if tick % span == 0:
+                    self._cascade(self._overflow)
+
+            slot = self._slots[0][tick % self.wheel_size]
+            due = list(slot.values())
+            slot.clear()
+
+        for handle in due:
+            handle._slot = None
+            if handle.cancelled:
+                continue
+            if handle.expire_tick > tick:
+                # Savunma amaçlı: erken düşen görevi tekrar yerleştir
+                with self._lock:
+                    self._insert(handle)
+                continue
+            self._fire(handle)
+
+    def _cascade(self, slot: Dict[int, TimerHandle]):
+        handles = list(slot.values())
+        slot.clear()
+        for handle in handles:
+            self._insert(handle)
+
+    def _fire(self, handle: TimerHandle):
+        with self._lock:
+            self.timer_count -= 1
+
+        if handle.blocking:
+            if handle._future is not None and not handle._future.done():
+                handle.skipped_count += 1
+                logger.debug(f"Zamanlayıcı görevi hâlâ çalışıyor, tur atlandı: {handle.name}")
+            else:
+                handle._future = self._executor.submit(self._execute, handle)
+        else:
+            self._execute(handle)
+
+        if handle.is_recurring and not handle.cancelled:
+            with self._lock:
+                handle.expire_tick = self._current_tick + self._delay_to_ticks(handle.interval, handle.jitter)
+                self._insert(handle)
+                self.timer_count += 1
+
+    def _execute(self, handle: TimerHandle):
+        try:
+            handle.run_count += 1
+            self.fired_count += 1
+            handle.callback(*handle.args)
+        except Exception as e:
+            logger.error(f"Zamanlayıcı görevi hatası ({handle.name}): {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Çark istatistiklerini döndürür
+        """
+        return {
+            'active_timers': self.timer_count,
+            'fired': self.fired_count,
+            'current_tick': self._current_tick,
+            'lag_ticks': int((time.monotonic() - self._start_time) / self.tick) - self._current_tick
+        }
+
+# Global değişkenler
+_timer_wheel = None
+_timer_wheel_lock = threading.Lock()
+
+def get_timer_wheel() -> TimerWheel:
+    """
+    Global zamanlayıcı çarkını döner (yoksa oluşturup başlatır)
+    """
+    global _timer_wheel
+
+    with _timer_wheel_lock:
+        if _timer_wheel is None:
+            _timer_wheel = TimerWheel()
+            _timer_wheel.start()
+        return _timer_wheel
@@ -1,34 +1,113 @@
 import time
 import threading
 import json
+import weakref
 from datetime import datetime
 from typing import Optional, Dict, Any
 from loguru import logger
 from btcturk_api.client import Client
 import os
 from dotenv import load_dotenv
+from order_normalizer import OrderNormalizer
+from order_book import OrderBookManager
+from balance_cache import get_shared_balance_cache
+from market_recorder import get_market_recorder
+from poll_scheduler import get_poll_scheduler
+from state_store import get_state_store, PHASE_IDLE, PHASE_BUY_PENDING, PHASE_BOUGHT, PHASE_SELL_PENDING
+from exchange_simulator import get_simulated_exchange
+from api_metrics import instrument_client
+from retry_policy import RetryPolicy, CircuitOpenError
+from latency_tracing import (
+    get_trace_recorder, STAGE_PRICE_FETCH, STAGE_STRATEGY, STAGE_RISK_CHECK, STAGE_LIMIT_PRICE,
+    STAGE_NORMALIZE, STAGE_CANCEL_OPEN, STAGE_SUBMIT, STAGE_FILL_DETECTION, STATUS_FILLED,
+    STATUS_SUBMITTED, STATUS_REJECTED, STATUS_FAILED, STATUS_ABANDONED
+)
 
 # Load environment variables
 load_dotenv()
 
+# Log dosyası sink'i süreç başına bir kez eklenir (her bot eklerse her mesaj bot sayısı kadar yazılır)
+_log_sink_id = None
+_log_sink_lock = threading.Lock()
+
+def _ensure_log_sink():
+    global _log_sink_id
+    
+    with _log_sink_lock:
+        if _log_sink_id is None:
+            _log_sink_id = logger.add("trading_bot.log", rotation="1 day", retention="30 days")
+
+# Fiyat gibi tekrarlanabilir okumalar için kısa, jitter'lı yeniden deneme
+READ_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=0.25, max_delay=2.0)
+# Açık emir nedeniyle reddedilen alımın tekrarı, toplam iki deneme (emir gönderimi geçici
+# hatada tekrarlanmaz: zaman aşımına uğrayan emir borsada oluşmuş olabilir)
+OPEN_ORDERS_RETRY_POLICY = RetryPolicy(max_retries=1, base_delay=1.0, max_delay=5.0)
+
+# Fiyat hedefin altındayken satış emrinin açık emirlerden kontrol aralığı (saniye);
+# hedefe ulaşıldığında her fiyat güncellemesinde kontrol edilir
+SELL_ORDER_CHECK_INTERVAL = 30.0
+
+# Metrik toplama için bu process'teki botlar (bot silinince kendiliğinden düşer)
+_active_bots = weakref.WeakSet()
+_active_bots_lock = threading.Lock()
+
+def get_active_bots() -> list:
+    """
+    Bu process'te oluşturulmuş ve hâlâ kullanılan botları döndürür
+    """
+    with _active_bots_lock:
+        return list(_active_bots)
+
+# Çökme sonrası devam için kaydedilen pozisyon alanları
+PERSISTED_FIELDS = (
+    'target_profit_percentage', 'amount_to_trade', 'buy_price', 'coin_quantity',
+    'bought_amount', 'initial_coin_balance', 'target_sell_price', 'sell_order_active',
+    'sell_order_id', 'is_position_open'
+)
+
 class BTCTurkTradingBot:
     """
     BTCTurk API ile otomatik alım-satım botu
     """
     
-    def __init__(self, api_key: str = None, api_secret: str = None):
+    def __init__(self, api_key: str = None, api_secret: str = None, client=None):
         """
         Bot'u başlatır
         
         Args:
             api_key: BTCTurk API anahtarı
             api_secret: BTCTurk API gizli anahtarı
+            client: Hazır API client'ı (örn: SimulatedExchange). Verilmezse ve API
+                anahtarları yoksa ortak borsa simülatörü kullanılır (demo mod).
         """
         self.api_key = api_key or os.getenv('BTCTURK_API_KEY')
         self.api_secret = api_secret or os.getenv('BTCTURK_API_SECRET')
         
         # BTCTurk client'ını başlat
-        self.client = Client(api_key=self.api_key, api_secret=self.api_secret)
+        self.is_simulated = client is None and not (self.api_key and self.api_secret)
+        if client is None:
+            if self.is_simulated:
+                logger.info("API anahtarları ayarlanmamış, borsa simülatörü ile demo modda çalışacak")
+                client = get_simulated_exchange()
+            else:
+                client = Client(api_key=self.api_key, api_secret=self.api_secret)
+        
+        # Tüm API çağrıları uç nokta başına gecikme/hata metrikleriyle ölçülür
+        self.client = instrument_client(client)
+        
+        # Emir fiyat/miktar hassasiyet düzeltici
+        self.order_normalizer = OrderNormalizer(self.client)
+        
+        # Volatilite ve tetikleyici uzaklığına göre yoklama aralığı belirleyen ortak zamanlayıcı
+        self.poll_scheduler = get_poll_scheduler()
+        self._poll_symbol = None
+        
+        # Limit fiyatlandırma için emir defteri önbelleği
+        self.order_book_manager = OrderBookManager(self.client)
+        
+        # Aynı hesabı kullanan tüm botlar için ortak bakiye önbelleği
+        account_key = self.api_key if self.api_key and self.api_secret else f"client-{id(client)}"
+        self.balance_cache = get_shared_balance_cache(account_key, self._fetch_account_balance)
         
         # Bot ayarları
         self.selected_coin = None
@@ -39,23 +118,52 @@ class BTCTurkTradingBot:
         self.bought_amount = 0.0  # Gerçek satın alınan coin miktarı (bakiye kontrolünden)
         self.is_running = False
         self.is_position_open = False
+        self._stop_event = threading.Event()  # Durdurulunca tüm beklemeleri anında keser
         
         # Satış emri takibi
         self.sell_order_active = False
         self.target_sell_price = 0.0
+        self.sell_order_id = None  # Hedef satış emrinin borsa id'si (gerçekleşme tespiti için)
+        self._sell_order_seen_at = 0.0  # Satış emrinin en son açık görüldüğü zaman
+        self.initial_coin_balance = None  # Alış öncesi coin bakiyesi (gerçekleşme tespiti için)
+        
+        # Alım öncesi risk limitleri (uygulama tarafından atanır, yoksa kontrol yapılmaz)
+        self.risk_manager = None
+        
+        # Pozisyon durumu her geçişte diske yazılır, yeniden başlatmada kaldığı yerden devam eder
+        self.state_store = get_state_store()
+        
+        # Fiyat alımından emir gerçekleşmesine kadar gecikme izleri
+        self.tracer = get_trace_recorder()
+        self._order_trace = None  # Gerçekleşmesi beklenen emrin izi
+        
+        # Metrik sayaçları (yalnızca botun kendi thread'lerinde artırılır, sorguda okunur)
+        self.ticks_processed = 0
+        self.last_tick_at = 0.0
+        self.order_counts = {STATUS_SUBMITTED: 0, STATUS_FILLED: 0, STATUS_REJECTED: 0, STATUS_FAILED: 0}
+        self.realized_pnl = 0.0  # TRY
         
         # Fiyat takibi
         self.current_price = 0.0
         self.price_history = []
         self.monitoring_thread = None
         
+        # WebSocket fiyat akışı (bağlanırsa REST yoklamasının yerine geçer)
+        self.market_stream = None
+        self.stream_max_age = 5.0  # Akış fiyatının geçerli sayılacağı süre (saniye)
+        self.price_board = None  # Çoklu process modunda paylaşımlı fiyat tablosu
+        self._price_update_event = threading.Event()
+        
         # Callback fonksiyonları (GUI için)
         self.price_update_callback = None
         self.status_update_callback = None
         self.trade_callback = None
         
         # Logger ayarları
-        logger.add("trading_bot.log", rotation="1 day", retention="30 days")
+        _ensure_log_sink()
+        
+        with _active_bots_lock:
+            _active_bots.add(self)
         
         logger.info("BTCTurk Trading Bot başlatıldı")
     
@@ -67,14 +175,8 @@ class BTCTurkTradingBot:
             bool: Bağlantı başarılı ise True
         """
         try:
-            # API anahtarları yoksa demo modda çalışıyor
-            if not self.api_key or not self.api_secret:
-                logger.info("API anahtarları ayarlanmamış, demo modda çalışacak")
-                return True
-            
-            # API bağlantısını test et
-            balance = self.client.get_account_balance()
-            if balance:
+            # API bağlantısını test et (başarılı yanıt ortak bakiye önbelleğini de günceller)
+            if self.balance_cache.refresh():
                 logger.info("API bağlantısı başarılı")
                 return True
             else:
@@ -120,19 +222,15 @@ class BTCTurkTradingBot:
         Returns:
             float: Güncel fiyat
         """
+        # WebSocket akışından veya paylaşımlı tablodan taze fiyat varsa REST çağrısına gerek yok
+        price = self._get_pushed_price(symbol)
+        if price:
+            self._count_tick()
+            return price
+        
         try:
-            # API anahtarları kontrolü
-            if not self.api_key or not self.api_secret:
-                logger.warning(f"API anahtarları ayarlanmamış, {symbol} için demo fiyat döndürülüyor")
-                # Demo fiyat döndür (ASRTRY için örnek)
-                if symbol == "ASRTRY":
-                    return 0.85  # Demo fiyat
-                elif symbol == "BTCTRY":
-                    return 2500000.0  # Demo fiyat
-                else:
-                    return 1.0  # Genel demo fiyat
-            
-            ticker = self.client.tick(symbol)
+            ticker = READ_RETRY_POLICY.execute(self.client.tick, symbol, sleep=self._wait,
+                                               description=f"Fiyat sorgusu ({symbol})")
             if ticker:
                 # API'den gelen veri liste formatında olabilir
                 if isinstance(ticker, list) and len(ticker) > 0:
@@ -143,6 +241,12 @@ class BTCTurkTradingBot:
                 if 'last' in ticker_data:
                     price = float(ticker_data['last'])
                     logger.info(f"{symbol} güncel fiyat: {price}")
+                    self.poll_scheduler.update_price(symbol, price)
+                    
+                    recorder = get_market_recorder()
+                    if recorder:
+                        recorder.record_tick(symbol, price)
+                    self._count_tick()
                     return price
                 else:
                     logger.error(f"Ticker verisinde 'last' alanı bulunamadı ({symbol}): {ticker_data}")
@@ -150,66 +254,151 @@ class BTCTurkTradingBot:
             else:
                 logger.error(f"Ticker verisi alınamadı ({symbol}): {ticker}")
                 return 0.0
+        except CircuitOpenError as e:
+            # Devre açıkken her döngüde hata loglanmaz; devre kesici durumu zaten loglar
+            logger.debug(f"Fiyat alınamadı ({symbol}): {e}")
+            return 0.0
         except Exception as e:
             logger.error(f"Fiyat alınırken hata ({symbol}): {e}")
-            # API hatası durumunda demo fiyat döndür
-            if symbol == "ASRTRY":
-                return 0.85
-            elif symbol == "BTCTRY":
-                return 2500000.0
-            else:
-                return 1.0
+            return 0.0
     
-    def get_account_balance(self) -> Dict[str, Any]:
+    def _get_pushed_price(self, symbol: str) -> float:
         """
-        Hesap bakiyesini getirir
+        REST isteği yapmadan akış veya paylaşımlı tablodaki taze fiyatı döndürür
         
         Returns:
-            dict: Hesap bakiye bilgileri
+            float: Fiyat (hazır fiyat yoksa 0.0)
+        """
+        if self.market_stream:
+            stream_price = self.market_stream.get_latest_price(symbol, self.stream_max_age)
+            if stream_price:
+                # Akış fiyatı zamanlayıcıya ticker geri çağrısında zaten iletilir
+                return stream_price
+        
+        # Paylaşımlı fiyat tablosu supervisor tarafından beslenir
+        if self.price_board:
+            board_price = self.price_board.get_price(symbol, self.stream_max_age)
+            if board_price:
+                self.poll_scheduler.update_price(symbol, board_price)
+                return board_price
+        return 0.0
+    
+    def _count_tick(self):
+        self.ticks_processed += 1
+        self.last_tick_at = time.time()
+    
+    def attach_market_stream(self, stream):
+        """
+        WebSocket piyasa verisi akışını bota bağlar
+        
+        Args:
+            stream: MarketDataStream örneği
+        """
+        self.market_stream = stream
+        self.order_book_manager.attach_stream(stream)
+        if self.is_running and self.selected_coin:
+            stream.subscribe_ticker(self.selected_coin, self._on_stream_ticker)
+            self.order_book_manager.subscribe(self.selected_coin)
+        logger.info("WebSocket fiyat akışı bota bağlandı")
+    
+    def attach_price_board(self, board):
+        """
+        Paylaşımlı fiyat tablosunu bota bağlar
+        
+        Args:
+            board: PriceBoard örneği (okuyucu modunda)
+        """
+        self.price_board = board
+        logger.info(f"Paylaşımlı fiyat tablosu bota bağlandı: {board.name}")
+    
+    def _on_stream_ticker(self, symbol: str, price: float, data: Dict[str, Any]):
+        """
+        Akıştan gelen ticker güncellemesini işler ve bekleyen takip döngülerini uyandırır
+        """
+        if symbol != self.selected_coin:
+            return
+        self.current_price = price
+        self.poll_scheduler.update_price(symbol, price)
+        self._price_update_event.set()
+    
+    def _wait(self, seconds: float) -> bool:
+        """
+        Durdurma isteğiyle kesilebilen bekleme
+        
+        Args:
+            seconds: Bekleme süresi (saniye)
+            
+        Returns:
+            bool: Bot durdurulduysa True
+        """
+        return self._stop_event.wait(seconds)
+    
+    def _wait_for_price_update(self, timeout: float):
+        """
+        Yeni fiyat gelene kadar bekler
+        
+        Akış bağlıysa en fazla timeout kadar fiyat olayı beklenir; aksi halde
+        bir sonraki REST yoklamasının zamanını ortak zamanlayıcı belirler.
+        
+        Args:
+            timeout: Akış modunda maksimum bekleme süresi (saniye)
+        """
+        if self.market_stream:
+            self._price_update_event.wait(timeout)
+            self._price_update_event.clear()
+            # Akış eskirse fiyat REST'ten alınır; bağlantı kurtarılırken istek gönderilmesin
+            if self.poll_scheduler.is_paused:
+                self.poll_scheduler.wait_resumed(self._stop_event)
+        else:
+            self.poll_scheduler.wait(self.selected_coin, self._stop_event)
+    
+    def get_account_balance(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Hesap bakiyesini getirir (ortak bakiye önbelleğinden)
+        
+        Args:
+            max_age: Kabul edilebilir maksimum veri yaşı (saniye). Verilmezse
+                önbellekteki son bakiye döndürülür.
+        
+        Returns:
+            dict: Hesap bakiye bilgileri (alınamazsa boş)
         """
         try:
-            # API anahtarları kontrolü
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, demo bakiye döndürülüyor")
-                # Demo bakiye döndür
-                return {
-                    'TRY': {'asset': 'TRY', 'free': '10000.00', 'locked': '0.00'},
-                    'BTC': {'asset': 'BTC', 'free': '0.001', 'locked': '0.00'},
-                    'ASR': {'asset': 'ASR', 'free': '100.0', 'locked': '0.00'}
-                }
-            
-            balance = self.client.get_account_balance()
-            logger.info("Hesap bakiyesi başarıyla alındı")
-            
-            # API'den gelen veriyi kontrol et
-            if isinstance(balance, str):
-                logger.error(f"API'den beklenmeyen string response: {balance}")
-                # Hata durumunda demo bakiye döndür
-                return {
-                    'TRY': {'asset': 'TRY', 'free': '10000.00', 'locked': '0.00'},
-                    'BTC': {'asset': 'BTC', 'free': '0.001', 'locked': '0.00'},
-                    'ASR': {'asset': 'ASR', 'free': '100.0', 'locked': '0.00'}
-                }
-            
-            # API'den gelen veriyi GUI'nin beklediği formata çevir
-            formatted_balance = {}
-            if isinstance(balance, list):
-                for item in balance:
-                    if isinstance(item, dict):
-                        formatted_balance[item['asset']] = {
-                            'asset': item['asset'],
-                            'free': item.get('balance', '0'),  # 'balance' -> 'free'
-                            'locked': item.get('locked', '0')
-                        }
-            return formatted_balance
+            return self.balance_cache.get(max_age=max_age) or {}
         except Exception as e:
             logger.error(f"Hesap bakiyesi alınırken hata: {e}")
-            # Hata durumunda demo bakiye döndür
-            return {
-                'TRY': {'asset': 'TRY', 'free': '10000.00', 'locked': '0.00'},
-                'BTC': {'asset': 'BTC', 'free': '0.001', 'locked': '0.00'},
-                'ASR': {'asset': 'ASR', 'free': '100.0', 'locked': '0.00'}
-            }
+            return {}
+    
+    def _fetch_account_balance(self) -> Dict[str, Any]:
+        """
+        Hesap bakiyesini doğrudan API'den alır (bakiye önbelleği kullanır)
+        
+        Returns:
+            dict: GUI'nin beklediği formatta bakiye bilgileri
+            
+        Raises:
+            ValueError: API'den beklenmeyen yanıt gelirse
+        """
+        balance = self.client.get_account_balance()
+        
+        # API'den gelen veriyi kontrol et
+        if isinstance(balance, str):
+            logger.error(f"API'den beklenmeyen string response: {balance}")
+            raise ValueError(f"Beklenmeyen bakiye yanıtı: {balance}")
+        
+        logger.info("Hesap bakiyesi başarıyla alındı")
+        
+        # API'den gelen veriyi GUI'nin beklediği formata çevir
+        formatted_balance = {}
+        if isinstance(balance, list):
+            for item in balance:
+                if isinstance(item, dict):
+                    formatted_balance[item['asset']] = {
+                        'asset': item['asset'],
+                        'free': item.get('free', '0'),  # Kullanılabilir (kilitsiz) bakiye
+                        'locked': item.get('locked', '0')
+                    }
+        return formatted_balance
     
     def get_balance(self) -> Dict[str, Any]:
         """
@@ -221,25 +410,23 @@ class BTCTurkTradingBot:
         """
         return self.get_account_balance()
     
-    def get_open_orders(self, symbol: str = None) -> list:
+    def get_open_orders(self, symbol: str = None, raise_errors: bool = False) -> list:
         """
         Açık emirleri listeler
         
         Args:
             symbol: Belirli bir coin çifti için açık emirler (opsiyonel)
+            raise_errors: True ise API hatası boş liste yerine fırlatılır
+                (boş liste "açık emir yok" ile karışmasın diye)
             
         Returns:
             list: Açık emirler listesi
         """
         try:
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, açık emir kontrolü yapılamıyor")
-                return []
-            
             # BTCTurk API'sinde açık emirleri almak için get_open_orders metodunu kullan
             if hasattr(self.client, 'get_open_orders'):
                 try:
-                    open_orders = self.client.get_open_orders(pair_symbol=symbol)
+                    open_orders = self.client.get_open_orders(pair=symbol)
                     
                     # API'den dönen veriyi kontrol et
                     if isinstance(open_orders, str):
@@ -290,6 +477,8 @@ class BTCTurkTradingBot:
                         return []
                         
                 except Exception as api_error:
+                    if raise_errors:
+                        raise
                     logger.error(f"API get_open_orders hatası: {api_error}")
                     return []
             else:
@@ -297,6 +486,8 @@ class BTCTurkTradingBot:
                 return []
                 
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Açık emirleri alma hatası: {e}")
             return []
     
@@ -311,10 +502,6 @@ class BTCTurkTradingBot:
             bool: İptal işlemi başarılı ise True
         """
         try:
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, emir iptali yapılamıyor")
-                return True  # Demo modda başarılı sayalım
-            
             # Açık emirleri al
             open_orders = self.get_open_orders(symbol)
             
@@ -356,60 +543,135 @@ class BTCTurkTradingBot:
             logger.error(f"Açık emir iptal hatası ({symbol}): {e}")
             return False
     
-    def place_buy_order(self, symbol: str, amount: float) -> bool:
+    def _get_limit_price(self, symbol: str, side: str, current_price: float) -> float:
+        """
+        Limit emir fiyatını emir defterindeki en iyi fiyatlardan hesaplar
+        
+        Alışta en iyi alış fiyatının, satışta en iyi satış fiyatının bir tick
+        önüne geçilir (spread kapanmadığı sürece). Emir defteri alınamazsa
+        son işlem fiyatına göre sabit oranla hesaplanır.
+        
+        Args:
+            symbol: Coin çifti
+            side: 'buy' veya 'sell'
+            current_price: Son işlem fiyatı
+            
+        Returns:
+            float: Limit fiyat
+        """
+        best_bid, best_ask = None, None
+        if hasattr(self.client, 'get_order_book'):
+            best_bid, best_ask = self.order_book_manager.get_best_prices(symbol)
+        
+        if best_bid and best_ask:
+            tick = self.order_normalizer.get_tick_size(symbol)
+            # Float toplama hatası tick yuvarlamasında bir adım kaybettirmesin
+            if side == 'buy':
+                price = round(best_bid + tick, 10)
+                return price if price < best_ask else best_bid
+            price = round(best_ask - tick, 10)
+            return price if price > best_bid else best_ask
+        
+        if side == 'buy':
+            return current_price * 0.9995  # %0.05 indirim
+        return current_price * 1.001  # %0.1 artış
+    
+    def _check_risk(self, amount: float) -> tuple:
+        """
+        Alım tutarını risk limitlerine göre kontrol eder
+        
+        TRY bakiyesi bilinmiyorsa varsayılan bir bakiye kabul edilmez, işlem yapılmaz.
+        
+        Args:
+            amount: Alım miktarı (TRY cinsinden)
+            
+        Returns:
+            tuple: (can_trade: bool, reason: str)
+        """
+        balance = self.get_account_balance()
+        if 'TRY' not in balance:
+            return False, "TRY bakiyesi alınamadı"
+        try_balance = float(balance['TRY'].get('free', 0) or 0)
+        if try_balance <= 0:
+            return False, "Kullanılabilir TRY bakiyesi yok"
+        return self.risk_manager.can_trade(amount, try_balance)
+    
+    def place_buy_order(self, symbol: str, amount: float, trace=None, attempt: int = 0) -> bool:
         """
         Limit order ile alım emri verir
         
         Args:
             symbol: Coin çifti (örn: BTCTRY)
             amount: Alım miktarı (TRY cinsinden)
+            trace: Karar aşamalarını içeren gecikme izi (verilmezse yeni iz açılır)
+            attempt: Açık emir nedeniyle yapılan tekrar sayısı (iç kullanım)
             
         Returns:
             bool: İşlem başarılı ise True
         """
+        trace = trace or self.tracer.new_trace(symbol, 'buy')
+        outcome = STATUS_FAILED
+        retried = False  # Tekrar denemesi sonucu kendisi sayar ve izi kapatır
         try:
             # Güncel fiyatı al
-            current_price = self.get_current_price(symbol)
+            with trace.span(STAGE_PRICE_FETCH):
+                current_price = self.get_current_price(symbol)
             if current_price <= 0:
                 logger.error(f"Geçersiz fiyat: {current_price}")
                 return False
             
-            # Limit fiyatı hesapla (güncel fiyata çok yakın - hızlı gerçekleşme için)
-            limit_price = current_price * 0.9995  # %0.05 indirim (daha az indirim)
+            # Risk kontrolü emir hazırlığından önce yapılır (tekrar denemeleri aynı kararı kullanır)
+            if self.risk_manager and attempt == 0:
+                with trace.span(STAGE_RISK_CHECK):
+                    allowed, reason = self._check_risk(amount)
+                if not allowed:
+                    outcome = STATUS_REJECTED
+                    logger.warning(f"Alım emri risk kontrolünden geçmedi, gönderilmedi: {symbol} - {reason}")
+                    return False
+            
+            # Limit fiyatı emir defterinden hesapla (defter yoksa güncel fiyatın %0.05 altı)
+            with trace.span(STAGE_LIMIT_PRICE):
+                limit_price = self._get_limit_price(symbol, 'buy', current_price)
             
             # Coin miktarını hesapla
             coin_quantity = amount / limit_price
             
-            logger.info(f"Limit alım emri hazırlanıyor: {symbol} - Miktar: {coin_quantity:.6f} - Limit Fiyat: {limit_price:.2f}")
+            # Fiyat ve miktarı borsa hassasiyetine göre düzelt (reddedilen emirleri önler)
+            with trace.span(STAGE_NORMALIZE):
+                prepared = self.order_normalizer.prepare_order(symbol, 'buy', limit_price, coin_quantity)
+            if prepared is None:
+                outcome = STATUS_REJECTED
+                logger.error(f"Alım emri borsa kurallarına uymuyor, gönderilmedi: {symbol} - {amount} TRY")
+                return False
+            limit_price, coin_quantity = prepared
             
-            # API anahtarları kontrolü
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, demo modda çalışıyor")
-                # Demo modda başarılı alım simülasyonu
-                self.buy_price = limit_price
-                self.coin_quantity = coin_quantity
-                self.is_position_open = True
-                logger.info(f"DEMO: Alım emri başarılı - {symbol} - Miktar: {coin_quantity:.6f} - Fiyat: {limit_price:.2f}")
-                return True
+            logger.info(f"Limit alım emri hazırlanıyor: {symbol} - Miktar: {coin_quantity:.6f} - Limit Fiyat: {limit_price:.2f}")
             
             # Açık emirleri kontrol et ve iptal et
             logger.info(f"Açık emirler kontrol ediliyor: {symbol}")
-            if not self.cancel_open_orders(symbol):
-                logger.warning(f"Açık emirler iptal edilemedi, yine de devam ediliyor: {symbol}")
+            with trace.span(STAGE_CANCEL_OPEN):
+                if not self.cancel_open_orders(symbol):
+                    logger.warning(f"Açık emirler iptal edilemedi, yine de devam ediliyor: {symbol}")
             
             # Gerçek API ile alım
-            order = self.client.submit_limit_order(
-                quantity=coin_quantity,
-                price=limit_price,
-                order_type='buy',
-                pair_symbol=symbol
-            )
+            with trace.span(STAGE_SUBMIT):
+                order = self.client.submit_limit_order(
+                    quantity=coin_quantity,
+                    price=limit_price,
+                    order_type='buy',
+                    pair_symbol=symbol
+                )
             
             # API yanıtını kontrol et
             if order and isinstance(order, dict):
                 self.buy_price = limit_price
                 self.coin_quantity = coin_quantity  # Satın alınan coin miktarını kaydet
                 self.is_position_open = True
+                self.bought_amount = 0.0
+                self._persist_state('buy_submitted', PHASE_BUY_PENDING)
+                self._apply_order_to_balance_cache('buy', symbol, limit_price, coin_quantity)
+                self._track_order_trace(trace)
+                outcome = None
                 logger.info(f"Limit alım emri başarılı: {symbol} - {amount} TRY - Limit Fiyat: {limit_price:.2f} - Miktar: {coin_quantity:.6f}")
                 
                 if self.trade_callback:
@@ -422,68 +684,86 @@ class BTCTurkTradingBot:
             return False
             
         except Exception as e:
-            # FAILED_ORDER_WITH_OPEN_ORDERS hatası özel olarak ele alınır
+            # FAILED_ORDER_WITH_OPEN_ORDERS hatası özel olarak ele alınır (sınırlı sayıda tekrar)
             if "FAILED_ORDER_WITH_OPEN_ORDERS" in str(e):
+                if attempt >= OPEN_ORDERS_RETRY_POLICY.max_retries:
+                    logger.error(f"Açık emirler nedeniyle alım {attempt + 1} denemede başarısız: {symbol}")
+                    return False
                 logger.warning(f"Açık emirler nedeniyle alım başarısız, emirler iptal ediliyor: {symbol}")
                 if self.cancel_open_orders(symbol):
-                    logger.info(f"Açık emirler iptal edildi, alım tekrar deneniyor: {symbol}")
-                    # Kısa bir bekleme sonrası tekrar dene
-                    time.sleep(1)
-                    return self.place_buy_order(symbol, amount)
+                    delay = OPEN_ORDERS_RETRY_POLICY.backoff(attempt)
+                    logger.info(f"Açık emirler iptal edildi, alım {delay:.1f}s sonra tekrar deneniyor: {symbol}")
+                    if self._wait(delay):
+                        return False
+                    retried = True
+                    return self.place_buy_order(symbol, amount, trace=trace, attempt=attempt + 1)
                 else:
                     logger.error(f"Açık emirler iptal edilemedi: {symbol}")
             
             logger.error(f"Limit alım emri hatası ({symbol}): {e}")
             return False
+        finally:
+            if not retried:
+                self.order_counts[outcome or STATUS_SUBMITTED] += 1
+                if outcome:
+                    self.tracer.finish(trace, outcome)
     
-    def place_sell_order(self, symbol: str, amount: float) -> bool:
+    def place_sell_order(self, symbol: str, amount: float, trace=None) -> bool:
         """
         Limit fiyatından satım emri verir (güncel fiyatın %0.1 üstünde)
         
         Args:
             symbol: Coin çifti
             amount: Satım miktarı (coin cinsinden)
+            trace: Karar aşamalarını içeren gecikme izi (verilmezse yeni iz açılır)
             
         Returns:
             bool: İşlem başarılı ise True
         """
+        trace = trace or self.tracer.new_trace(symbol, 'sell')
+        outcome = STATUS_FAILED
         try:
             # Güncel fiyatı al
-            current_price = self.get_current_price(symbol)
+            with trace.span(STAGE_PRICE_FETCH):
+                current_price = self.get_current_price(symbol)
             if current_price <= 0:
                 logger.error(f"Geçersiz fiyat: {current_price}")
                 return False
             
-            # Limit fiyatı hesapla (güncel fiyatın %0.1 üstünde)
-            limit_price = current_price * 1.001  # %0.1 artış
+            # Limit fiyatı emir defterinden hesapla (defter yoksa güncel fiyatın %0.1 üstü)
+            with trace.span(STAGE_LIMIT_PRICE):
+                limit_price = self._get_limit_price(symbol, 'sell', current_price)
             
-            logger.info(f"Limit satım emri hazırlanıyor: {symbol} - Miktar: {amount:.6f} - Limit Fiyat: {limit_price:.2f}")
+            # Fiyat ve miktarı borsa hassasiyetine göre düzelt
+            with trace.span(STAGE_NORMALIZE):
+                prepared = self.order_normalizer.prepare_order(symbol, 'sell', limit_price, amount)
+            if prepared is None:
+                outcome = STATUS_REJECTED
+                logger.error(f"Satım emri borsa kurallarına uymuyor, gönderilmedi: {symbol} - Miktar: {amount:.6f}")
+                return False
+            limit_price, amount = prepared
             
-            # API anahtarları kontrolü
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, demo modda çalışıyor")
-                # Demo modda başarılı satım simülasyonu
-                profit = ((limit_price - self.buy_price) / self.buy_price) * 100
-                self.is_position_open = False
-                self.coin_quantity = 0.0
-                logger.info(f"DEMO: Satım emri başarılı - {symbol} - Kar: %{profit:.2f} - Miktar: {amount:.6f}")
-                if self.trade_callback:
-                    self.trade_callback(f"DEMO SATIM: {symbol} - Kar: %{profit:.2f} - Limit Fiyat: {limit_price:.2f} - Miktar: {amount:.6f}")
-                return True
+            logger.info(f"Limit satım emri hazırlanıyor: {symbol} - Miktar: {amount:.6f} - Limit Fiyat: {limit_price:.2f}")
             
             # Gerçek API ile satım
-            order = self.client.submit_limit_order(
-                quantity=amount,
-                price=limit_price,
-                order_type='sell',
-                pair_symbol=symbol
-            )
+            with trace.span(STAGE_SUBMIT):
+                order = self.client.submit_limit_order(
+                    quantity=amount,
+                    price=limit_price,
+                    order_type='sell',
+                    pair_symbol=symbol
+                )
             
             # API yanıtını kontrol et
             if order and isinstance(order, dict):
                 profit = ((limit_price - self.buy_price) / self.buy_price) * 100
+                self.realized_pnl += (limit_price - self.buy_price) * amount
                 self.is_position_open = False
+                self._apply_order_to_balance_cache('sell', symbol, limit_price, amount)
                 self.coin_quantity = 0.0  # Coin miktarını sıfırla
+                self._persist_state('position_closed', PHASE_IDLE)
+                # Bu yolda gerçekleşme takibi yapılmaz, iz gönderimde kapanır
+                outcome = STATUS_SUBMITTED
                 logger.info(f"Limit satım emri başarılı: {symbol} - Kar: %{profit:.2f} - Miktar: {amount:.6f}")
                 
                 if self.trade_callback:
@@ -498,8 +778,12 @@ class BTCTurkTradingBot:
         except Exception as e:
             logger.error(f"Limit satım emri hatası ({symbol}): {e}")
             return False
+        finally:
+            self.order_counts[outcome] += 1
+            self.tracer.finish(trace, outcome)
     
-    def place_sell_order_at_target_price(self, symbol: str, amount: float, target_price: float) -> bool:
+    def place_sell_order_at_target_price(self, symbol: str, amount: float, target_price: float,
+                                         trace=None) -> bool:
         """
         Hedef fiyatla limit satış emri verir
         
@@ -507,34 +791,44 @@ class BTCTurkTradingBot:
             symbol: Coin çifti (örn: BTCTRY)
             amount: Satış miktarı (coin cinsinden)
             target_price: Hedef satış fiyatı
+            trace: Gecikme izi (verilmezse yeni iz açılır)
             
         Returns:
             bool: İşlem başarılı ise True
         """
+        trace = trace or self.tracer.new_trace(symbol, 'sell', target_price=target_price)
+        outcome = STATUS_FAILED
         try:
-            logger.info(f"Hedef fiyatla satış emri hazırlanıyor: {symbol} - Miktar: {amount:.6f} - Hedef Fiyat: {target_price:.2f}")
+            # Fiyat ve miktarı borsa hassasiyetine göre düzelt (hedef fiyat yukarı yuvarlanır)
+            with trace.span(STAGE_NORMALIZE):
+                prepared = self.order_normalizer.prepare_order(symbol, 'sell', target_price, amount)
+            if prepared is None:
+                outcome = STATUS_REJECTED
+                logger.error(f"Hedef satış emri borsa kurallarına uymuyor, gönderilmedi: {symbol} - Miktar: {amount:.6f}")
+                return False
+            target_price, amount = prepared
             
-            # API anahtarları kontrolü
-            if not self.api_key or not self.api_secret:
-                logger.warning("API anahtarları ayarlanmamış, demo modda çalışıyor")
-                # Demo modda satış emri açık olarak işaretle
-                self.sell_order_active = True
-                self.target_sell_price = target_price
-                logger.info(f"DEMO: Hedef fiyatla satış emri açıldı - {symbol} - Miktar: {amount:.6f} - Hedef Fiyat: {target_price:.2f}")
-                return True
+            logger.info(f"Hedef fiyatla satış emri hazırlanıyor: {symbol} - Miktar: {amount:.6f} - Hedef Fiyat: {target_price:.2f}")
             
             # Gerçek API ile satış emri
-            order = self.client.submit_limit_order(
-                quantity=amount,
-                price=target_price,
-                order_type='sell',
-                pair_symbol=symbol
-            )
+            with trace.span(STAGE_SUBMIT):
+                order = self.client.submit_limit_order(
+                    quantity=amount,
+                    price=target_price,
+                    order_type='sell',
+                    pair_symbol=symbol
+                )
             
             # API yanıtını kontrol et
             if order and isinstance(order, dict):
                 self.sell_order_active = True
                 self.target_sell_price = target_price
+                self.sell_order_id = order.get('id')
+                self._sell_order_seen_at = time.time()
+                self._persist_state('sell_submitted', PHASE_SELL_PENDING)
+                self._apply_order_to_balance_cache('sell', symbol, target_price, amount)
+                self._track_order_trace(trace)
+                outcome = None
                 logger.info(f"Hedef fiyatla satış emri açıldı: {symbol} - Miktar: {amount:.6f} - Hedef Fiyat: {target_price:.2f}")
                 
                 if self.trade_callback:
@@ -549,6 +843,53 @@ class BTCTurkTradingBot:
         except Exception as e:
             logger.error(f"Hedef fiyatla satış emri hatası ({symbol}): {e}")
             return False
+        finally:
+            self.order_counts[outcome or STATUS_SUBMITTED] += 1
+            if outcome:
+                self.tracer.finish(trace, outcome)
+    
+    def _track_order_trace(self, trace):
+        """
+        Gönderilen emrin izini gerçekleşme tespitine kadar açık tutar
+        """
+        trace.mark('submitted')
+        previous, self._order_trace = self._order_trace, trace
+        if previous is not None:
+            # Önceki emrin gerçekleşmesi izlenmeden yeni emir gönderildi
+            self.tracer.finish(previous, STATUS_SUBMITTED)
+    
+    def _finish_order_trace(self, status: str):
+        """
+        Bekleyen emrin izini kapatır; gerçekleştiyse gönderimden tespite kadar geçen süre eklenir
+        """
+        if status == STATUS_FILLED:
+            self.order_counts[STATUS_FILLED] += 1
+        trace, self._order_trace = self._order_trace, None
+        if trace is None:
+            return
+        if status == STATUS_FILLED:
+            trace.span_since(STAGE_FILL_DETECTION, 'submitted')
+        self.tracer.finish(trace, status)
+    
+    def _apply_order_to_balance_cache(self, side: str, symbol: str, price: float, quantity: float):
+        """
+        Gönderilen emrin etkisini ortak bakiye önbelleğine yerel olarak yansıtır
+        """
+        if not self.balance_cache:
+            return
+        
+        quote_asset = 'TRY' if symbol.endswith('TRY') else symbol[-4:]
+        base_asset = symbol[:-len(quote_asset)]
+        self.balance_cache.apply_order_submitted(side, base_asset, quote_asset, price, quantity)
+    
+    def _apply_fill_to_balance_cache(self, side: str, symbol: str, price: float, quantity: float,
+                                     observed_before: float = None):
+        """
+        Gerçekleşen emrin etkisini ortak bakiye önbelleğine yerel olarak yansıtır
+        """
+        quote_asset = 'TRY' if symbol.endswith('TRY') else symbol[-4:]
+        base_asset = symbol[:-len(quote_asset)]
+        self.balance_cache.apply_fill(side, base_asset, quote_asset, price, quantity, observed_before)
     
     def calculate_profit_percentage(self) -> float:
         """
@@ -561,6 +902,15 @@ class BTCTurkTradingBot:
             return ((self.current_price - self.buy_price) / self.buy_price) * 100
         return 0.0
     
+    def get_unrealized_pnl(self) -> float:
+        """
+        Açık pozisyonun güncel fiyatla kar/zararını döndürür (TRY)
+        """
+        if not self.is_position_open or self.buy_price <= 0 or self.current_price <= 0:
+            return 0.0
+        quantity = self.bought_amount or self.coin_quantity
+        return (self.current_price - self.buy_price) * quantity
+    
     def should_sell(self) -> bool:
         """
         Satış yapılıp yapılmayacağını kontrol eder
@@ -582,8 +932,12 @@ class BTCTurkTradingBot:
         
         while self.is_running:
             try:
+                # Satış kararı çıkarsa bu fiyat kontrolü izin ilk aşaması olur
+                trace = self.tracer.new_trace(self.selected_coin, 'sell')
+                
                 # Güncel fiyatı al
-                new_price = self.get_current_price(self.selected_coin)
+                with trace.span(STAGE_PRICE_FETCH):
+                    new_price = self.get_current_price(self.selected_coin)
                 
                 if new_price > 0:
                     self.current_price = new_price
@@ -602,59 +956,64 @@ class BTCTurkTradingBot:
                         self.price_update_callback(new_price, profit_pct)
                     
                     # Satış kontrolü
-                    if self.should_sell():
+                    with trace.span(STAGE_STRATEGY):
+                        sell_signal = self.should_sell()
+                    if sell_signal:
                         logger.info(f"Hedef kar yüzdesine ulaşıldı: %{self.calculate_profit_percentage():.2f}")
                         # Otomatik satış işlemi
                         if self.coin_quantity > 0:
-                            if self.place_sell_order(self.selected_coin, self.coin_quantity):
+                            if self.place_sell_order(self.selected_coin, self.coin_quantity, trace=trace):
                                 logger.info("Otomatik satış işlemi tamamlandı")
                             else:
                                 logger.error("Otomatik satış işlemi başarısız")
                     
                     logger.debug(f"Fiyat güncellendi: {self.selected_coin} = {new_price}")
                 
-                # 1 saniye bekle
-                time.sleep(1)
+                # Yeni fiyat gelene kadar bekle (akış yoksa 1 saniye)
+                self._wait_for_price_update(1)
                 
             except Exception as e:
                 logger.error(f"Fiyat takibi hatası: {e}")
-                time.sleep(5)  # Hata durumunda biraz daha bekle
+                self._wait(5)  # Hata durumunda biraz daha bekle
     
-    def monitor_buy_order(self):
+    def monitor_buy_order(self, initial_coin_balance: float = None):
         """
         Alış emrinin gerçekleşmesini bakiye kontrolü ile takip eder ve gerçekleştikten sonra satış emrini açar
+        
+        Args:
+            initial_coin_balance: Alış öncesi coin bakiyesi (yeniden başlatmada kaydedilen değer)
         """
         logger.info("Alış emri takibi başlatıldı - Bakiye kontrolü ile")
-        
-        # Başlangıç bakiyesini al
-        initial_balance = self.get_account_balance()
         coin_asset = self.selected_coin.replace('TRY', '')  # BTCTRY -> BTC
         
-        # Balance'ın dict olduğundan emin ol
-        if isinstance(initial_balance, dict):
-            initial_coin_balance = float(initial_balance.get(coin_asset, {}).get('free', '0'))
-        else:
-            logger.warning(f"Initial balance response is not dict: {type(initial_balance)}")
-            initial_coin_balance = 0.0
+        if initial_coin_balance is None:
+            # Başlangıç bakiyesini al (taze veri)
+            initial_balance = self.get_account_balance(max_age=0)
+            
+            # Balance'ın dict olduğundan emin ol
+            if isinstance(initial_balance, dict):
+                initial_coin_balance = float(initial_balance.get(coin_asset, {}).get('free', '0'))
+            else:
+                logger.warning(f"Initial balance response is not dict: {type(initial_balance)}")
+                initial_coin_balance = 0.0
+            
+            self.initial_coin_balance = initial_coin_balance
+            self._persist_state('buy_monitoring', PHASE_BUY_PENDING)
         
         logger.info(f"Başlangıç {coin_asset} bakiyesi: {initial_coin_balance}")
         
-        # Demo modda hemen gerçekleşmiş sayalım
-        if not self.api_key or not self.api_secret:
-            logger.info("DEMO: Alış emri gerçekleşti, satış emri açılıyor...")
-            time.sleep(2)  # Kısa bekleme
-            self.open_sell_order_after_buy()
-            return
-        
-        # Gerçek API için alış emrinin gerçekleşmesini bekle
+        # Alış emrinin gerçekleşmesini bekle
         max_wait_time = 600  # 10 dakika maksimum bekleme
         wait_time = 0
-        check_interval = 2  # 2 saniyede bir kontrol et (daha hızlı)
-        consecutive_no_change = 0  # Ardışık değişiklik olmayan kontrol sayısı
+        start_time = time.time()
+        last_status_time = start_time
+        
+        # Limit alış fiyatı tetikleyicidir; fiyat uzaklaştıkça yoklama seyrekleşir
+        self.poll_scheduler.set_triggers(self.selected_coin, target_price=self.buy_price)
         
         # İlk kontrolü hemen yap (bekleme olmadan)
         try:
-            current_balance = self.get_account_balance()
+            current_balance = self.get_account_balance(max_age=0)
             # Balance'ın dict olduğundan emin ol
             if isinstance(current_balance, dict):
                 current_coin_balance = float(current_balance.get(coin_asset, {}).get('free', '0'))
@@ -663,6 +1022,8 @@ class BTCTurkTradingBot:
                 if balance_increase > 0:
                     logger.info(f"✅ Alış emri hemen gerçekleşti! {coin_asset} bakiyesi {initial_coin_balance:.8f} -> {current_coin_balance:.8f} (+{balance_increase:.8f})")
                     self.bought_amount = balance_increase
+                    self._persist_state('buy_filled', PHASE_BOUGHT)
+                    self._finish_order_trace(STATUS_FILLED)
                     
                     if self.status_update_callback:
                         self.status_update_callback(f"Alış tamamlandı! +{balance_increase:.8f} {coin_asset}")
@@ -679,11 +1040,20 @@ class BTCTurkTradingBot:
         
         while self.is_running and wait_time < max_wait_time:
             try:
-                time.sleep(check_interval)
-                wait_time += check_interval
+                check_interval = self.poll_scheduler.get_interval(self.selected_coin)
+                if self.poll_scheduler.wait(self.selected_coin, self._stop_event):
+                    break
+                wait_time = time.time() - start_time
+                
+                # Zamanlayıcının volatilite tahmini fiyatla beslenir; akış veya paylaşımlı tablo
+                # yoksa get_current_price REST'ten alıp zamanlayıcıya iletir (aksi halde aralık
+                # hep temel değerde kalırdı)
+                price = self.get_current_price(self.selected_coin)
+                if price:
+                    self.current_price = price
                 
-                # Güncel bakiyeyi kontrol et
-                current_balance = self.get_account_balance()
+                # Güncel bakiyeyi kontrol et (diğer botların yenilediği veri paylaşılır)
+                current_balance = self.get_account_balance(max_age=check_interval)
                 
                 # Balance'ın dict olduğundan emin ol
                 if not isinstance(current_balance, dict):
@@ -695,11 +1065,14 @@ class BTCTurkTradingBot:
                 # Coin bakiyesinde artış var mı kontrol et
                 balance_increase = current_coin_balance - initial_coin_balance
                 
+                # Gerçekleşme API'den okunan bakiyeden tespit edilir; önbellek zaten günceldir
                 if balance_increase > 0:
                     logger.info(f"✅ Alış emri gerçekleşti! {coin_asset} bakiyesi {initial_coin_balance:.8f} -> {current_coin_balance:.8f} (+{balance_increase:.8f})")
                     
                     # Satın alınan miktarı güncelle
                     self.bought_amount = balance_increase
+                    self._persist_state('buy_filled', PHASE_BOUGHT)
+                    self._finish_order_trace(STATUS_FILLED)
                     
                     if self.status_update_callback:
                         self.status_update_callback(f"Alış tamamlandı! +{balance_increase:.8f} {coin_asset}")
@@ -712,30 +1085,20 @@ class BTCTurkTradingBot:
                     self.open_sell_order_after_buy()
                     break
                 
-                # Değişiklik yoksa sayacı artır
-                if balance_increase == 0:
-                    consecutive_no_change += 1
-                else:
-                    consecutive_no_change = 0
-                
-                logger.debug(f"Alış emri bekleniyor - {coin_asset} bakiyesi: {current_coin_balance:.8f} (değişim: {balance_increase:.8f})")
+                logger.debug(f"Alış emri bekleniyor - {coin_asset} bakiyesi: {current_coin_balance:.8f} (değişim: {balance_increase:.8f}) - Aralık: {check_interval:.1f}s")
                 
                 # Status güncellemesini daha az sıklıkta yap
-                if wait_time % 10 == 0 and self.status_update_callback:  # Her 10 saniyede bir
-                    self.status_update_callback(f"Alış emri bekleniyor - {wait_time}s")
-                
-                # Eğer 30 saniye boyunca hiç değişiklik yoksa, kontrol aralığını artır
-                if consecutive_no_change > 15:  # 15 * 2 = 30 saniye
-                    check_interval = min(5, check_interval + 1)  # Maksimum 5 saniye
-                    consecutive_no_change = 0
-                    logger.debug(f"Kontrol aralığı {check_interval} saniyeye çıkarıldı")
+                if time.time() - last_status_time >= 10 and self.status_update_callback:  # Her 10 saniyede bir
+                    last_status_time = time.time()
+                    self.status_update_callback(f"Alış emri bekleniyor - {int(wait_time)}s")
                     
             except Exception as e:
                 logger.error(f"Alış takibi hatası: {e}")
-                time.sleep(check_interval)
+                self._wait(5)
         
         if wait_time >= max_wait_time:
             logger.error("⚠️ Alış emri zaman aşımına uğradı - Bakiyede değişiklik tespit edilmedi")
+            self._finish_order_trace(STATUS_ABANDONED)
             self.is_running = False
             if self.status_update_callback:
                 self.status_update_callback("Bot durduruldu - Alış emri zaman aşımı")
@@ -783,9 +1146,15 @@ class BTCTurkTradingBot:
     
     def monitor_sell_order(self):
         """
-        Satış emrinin gerçekleşmesini takip eder
+        Satış emrinin gerçekleşmesini açık emirler ile takip eder
+        
+        Fiyat her döngüde güncellenir; açık emir sorgusu fiyat hedefe
+        ulaştığında her güncellemede, altındayken SELL_ORDER_CHECK_INTERVAL
+        saniyede bir yapılır. Emir açık emirlerde yoksa gerçekleşmiş sayılır.
         """
         logger.info("Satış emri takibi başlatıldı")
+        self.poll_scheduler.set_triggers(self.selected_coin, target_price=self.target_sell_price)
+        last_order_check = time.time()
         
         while self.is_running and self.sell_order_active:
             try:
@@ -810,38 +1179,71 @@ class BTCTurkTradingBot:
                     if self.status_update_callback:
                         self.status_update_callback(status_msg)
                     
-                    # Demo modda: Fiyat hedef fiyata ulaştı mı kontrol et
-                    if not self.api_key or not self.api_secret:
-                        if current_price >= self.target_sell_price:
-                            logger.info(f"DEMO: Hedef fiyata ulaşıldı! Satış gerçekleşti - Fiyat: {current_price:.2f}, Hedef: {self.target_sell_price:.2f}")
-                            self.complete_sell_transaction()
-                            break
-                    else:
-                        # Gerçek API modda: Satış emrinin durumunu kontrol et
-                        # Bu kısım gerçek API entegrasyonu için geliştirilecek
-                        if current_price >= self.target_sell_price:
-                            logger.info(f"Hedef fiyata ulaşıldı! Satış muhtemelen gerçekleşti - Fiyat: {current_price:.2f}, Hedef: {self.target_sell_price:.2f}")
-                            self.complete_sell_transaction()
-                            break
-                    
                     logger.debug(f"Satış takibi - Güncel: {current_price:.2f}, Hedef: {self.target_sell_price:.2f}, Kar: %{current_profit_pct:.2f}")
                 
-                # 1 saniye bekle (hızlandırıldı)
-                time.sleep(1)
+                # Satış emrinin durumunu kontrol et
+                if current_price >= self.target_sell_price or time.time() - last_order_check >= SELL_ORDER_CHECK_INTERVAL:
+                    last_order_check = time.time()
+                    if self._is_sell_order_filled():
+                        logger.info(f"✅ Satış emri gerçekleşti - Fiyat: {current_price:.2f}, Hedef: {self.target_sell_price:.2f}")
+                        self.complete_sell_transaction(fill_observed_before=self._sell_order_seen_at)
+                        break
+                
+                # Yeni fiyat gelene kadar bekle (akış yoksa 1 saniye)
+                self._wait_for_price_update(1)
                 
             except Exception as e:
                 logger.error(f"Satış emri takibi hatası: {e}")
-                time.sleep(5)
+                self._wait(5)
     
-    def complete_sell_transaction(self):
+    def _is_sell_order_filled(self) -> bool:
+        """
+        Hedef satış emrinin açık emirlerden düşüp düşmediğini kontrol eder
+        
+        Emir id'si biliniyorsa id ile, bilinmiyorsa (eski kayıttan devam)
+        seçili coin çiftindeki herhangi bir satış emriyle eşleştirilir.
+        
+        Returns:
+            bool: Emir artık açık değilse True (sorgu başarısızsa False)
+        """
+        checked_at = time.time()
+        try:
+            orders = self.get_open_orders(self.selected_coin, raise_errors=True)
+        except CircuitOpenError as e:
+            logger.debug(f"Satış emri durumu alınamadı: {e}")
+            return False
+        except Exception as e:
+            logger.warning(f"Satış emri durumu alınamadı: {e}")
+            return False
+        
+        for order in orders:
+            if self.sell_order_id is not None:
+                is_ours = str(order.get('id')) == str(self.sell_order_id)
+            else:
+                is_ours = (order.get('pairsymbol') == self.selected_coin and
+                           str(order.get('type') or order.get('orderType') or '').lower() in ('sell', ''))
+            if is_ours:
+                self._sell_order_seen_at = checked_at
+                return False
+        return True
+    
+    def complete_sell_transaction(self, fill_observed_before: float = None):
         """
         Satış işlemini tamamlar ve 2. işleme hazırlanır
+        
+        Args:
+            fill_observed_before: Gerçekleşme açık emirlerden tespit edildiyse emrin
+                en son açık görüldüğü zaman; verilirse bakiye önbelleği API'ye
+                gitmeden yerel olarak güncellenir
         """
         try:
+            self._finish_order_trace(STATUS_FILLED)
+            
             # Satış işlemini tamamla
             sell_amount_try = self.coin_quantity * self.target_sell_price
             profit = sell_amount_try - self.amount_to_trade
             profit_pct = (profit / self.amount_to_trade) * 100
+            self.realized_pnl += profit
             
             logger.info(f"SATIŞ TAMAMLANDI!")
             logger.info(f"Alış: {self.amount_to_trade:.2f} TRY ({self.buy_price:.2f} fiyatından)")
@@ -849,9 +1251,24 @@ class BTCTurkTradingBot:
             logger.info(f"Kar: {profit:.2f} TRY (%{profit_pct:.2f})")
             
             # Pozisyonu kapat
+            sold_amount = self.bought_amount or self.coin_quantity
             self.is_position_open = False
             self.coin_quantity = 0
             self.sell_order_active = False
+            self.sell_order_id = None
+            self.bought_amount = 0.0
+            self.initial_coin_balance = None
+            self._persist_state('sell_filled', PHASE_IDLE)
+            self.poll_scheduler.set_triggers(self.selected_coin)
+            
+            # Gerçekleşme bakiye okumadan tespit edildiyse önbellek yerel güncellenir,
+            # aksi halde bir sonraki okumada API'den yenilenir
+            if self.balance_cache:
+                if fill_observed_before is not None:
+                    self._apply_fill_to_balance_cache('sell', self.selected_coin, self.target_sell_price,
+                                                      sold_amount, fill_observed_before)
+                else:
+                    self.balance_cache.invalidate()
             
             # Trade callback'i çağır
             if self.trade_callback:
@@ -867,7 +1284,9 @@ class BTCTurkTradingBot:
             
             # 5 saniye bekle ve 2. işleme geç
             logger.info("5 saniye sonra 2. işleme geçiliyor...")
-            time.sleep(5)
+            if self._wait(5):
+                logger.info("Bot durduruldu, 2. işleme geçilmiyor")
+                return
             
             # 2. işlemi başlat
             self.start_second_trade()
@@ -887,24 +1306,13 @@ class BTCTurkTradingBot:
             
             # 2. alım işlemi
             if self.place_buy_order(self.selected_coin, self.amount_to_trade):
-                logger.info("2. alım işlemi başarılı, satış emri açılıyor...")
+                logger.info("2. alım emri verildi, gerçekleşmesi bekleniyor...")
                 
-                # Hedef satış fiyatını hesapla
-                target_sell_price = self.buy_price * (1 + self.target_profit_percentage / 100)
-                logger.info(f"2. işlem hedef satış fiyatı: {target_sell_price:.2f}")
+                if self.status_update_callback:
+                    self.status_update_callback("2. işlem - Alış emri bekleniyor")
                 
-                # Satış emrini aç
-                if self.place_sell_order_at_target_price(self.selected_coin, self.coin_quantity, target_sell_price):
-                    logger.info("2. işlem satış emri açıldı")
-                    
-                    if self.status_update_callback:
-                        self.status_update_callback("2. işlem - Satış emri açık")
-                    
-                    # Satış takibini devam ettir (aynı thread içinde)
-                    self.monitor_sell_order()
-                else:
-                    logger.error("2. işlem satış emri açılamadı")
-                    self.is_running = False
+                # İlk işlemdeki gibi alış gerçekleşince satış emri açılır (aynı thread içinde)
+                self.monitor_buy_order()
             else:
                 logger.error("2. alım işlemi başarısız")
                 self.is_running = False
@@ -913,6 +1321,105 @@ class BTCTurkTradingBot:
             logger.error(f"2. işlem başlatma hatası: {e}")
             self.is_running = False
     
+    def _persist_state(self, event: str, phase: str):
+        """
+        Pozisyon durum geçişini write-ahead log'a yazar
+        
+        Args:
+            event: Geçiş adı
+            phase: Geçişten sonraki aşama
+        """
+        if not self.selected_coin:
+            return
+        
+        changes = {field: getattr(self, field) for field in PERSISTED_FIELDS}
+        changes['phase'] = phase
+        try:
+            self.state_store.record(self.selected_coin, event, changes)
+        except Exception as e:
+            logger.error(f"Bot durumu kaydedilemedi ({event}): {e}")
+    
+    def resume_from_state(self, coin_symbol: str) -> bool:
+        """
+        Kaydedilen pozisyonu açık emirler ve bakiyeyle karşılaştırıp takibe devam eder
+        
+        Args:
+            coin_symbol: Coin çifti
+            
+        Returns:
+            bool: Devam edilecek pozisyon bulunduysa True (yeni alım yapılmaz)
+        """
+        state = self.state_store.load(coin_symbol)
+        phase = state.get('phase', PHASE_IDLE)
+        if phase == PHASE_IDLE:
+            return False
+        
+        # Açık pozisyonun alış fiyatı ve hedefi değişmez; yeni ayarlar sonraki işlemlerde geçerli
+        for field in ('buy_price', 'coin_quantity', 'bought_amount', 'initial_coin_balance',
+                      'target_sell_price', 'sell_order_active', 'sell_order_id', 'is_position_open'):
+            if field in state:
+                setattr(self, field, state[field])
+        
+        open_sides = set()
+        for order in self.get_open_orders(coin_symbol):
+            side = str(order.get('type') or order.get('orderType') or '').lower()
+            open_sides.add(side if side in ('buy', 'sell') else 'unknown')
+        
+        coin_asset = coin_symbol.replace('TRY', '')
+        balance = self.get_account_balance(max_age=0)
+        coin_info = balance.get(coin_asset, {}) if isinstance(balance, dict) else {}
+        # 'free' kilitsiz bakiyedir; initial_coin_balance da bu alandan alındığı için karşılaştırma tutarlıdır
+        coin_balance = float(coin_info.get('free', '0') or 0)
+        
+        logger.info(f"Kaydedilen pozisyon bulundu: {coin_symbol} - Aşama: {phase} - Açık emirler: {sorted(open_sides) or 'yok'} - {coin_asset} bakiyesi: {coin_balance:.8f}")
+        
+        if phase == PHASE_BUY_PENDING:
+            if open_sides & {'buy', 'unknown'}:
+                logger.info("Alış emri hâlâ açık, takibe devam ediliyor")
+                self._start_monitor(self.monitor_buy_order, self.initial_coin_balance)
+                return True
+            
+            if self.initial_coin_balance is not None:
+                filled_amount = coin_balance - self.initial_coin_balance
+            else:
+                filled_amount = self.coin_quantity if coin_balance >= self.coin_quantity * 0.99 else 0.0
+            
+            if filled_amount <= 0:
+                logger.warning("Alış emri açık değil ve bakiye artmamış, emir iptal edilmiş sayılıyor")
+                self.is_position_open = False
+                self.coin_quantity = 0.0
+                self._persist_state('buy_cancelled', PHASE_IDLE)
+                return False
+            
+            logger.info(f"Alış emri kapalıyken gerçekleşmiş: +{filled_amount:.8f} {coin_asset}")
+            self.bought_amount = filled_amount
+            self._persist_state('buy_filled', PHASE_BOUGHT)
+            phase = PHASE_BOUGHT
+        
+        if phase == PHASE_BOUGHT and not (open_sides & {'sell', 'unknown'}):
+            self.open_sell_order_after_buy()
+            return True
+        
+        # Satış emri aşaması (veya kayıt öncesi açılmış satış emri)
+        if open_sides & {'sell', 'unknown'}:
+            logger.info(f"Satış emri hâlâ açık, takibe devam ediliyor - Hedef: {self.target_sell_price:.2f}")
+            self.sell_order_active = True
+            self._start_monitor(self.monitor_sell_order)
+        elif coin_balance >= (self.bought_amount or self.coin_quantity) * 0.5:
+            logger.warning("Satış emri bulunamadı fakat coinler hesapta, satış emri yeniden açılıyor")
+            self.open_sell_order_after_buy()
+        else:
+            logger.info("Satış emri kapalıyken gerçekleşmiş, işlem tamamlanıyor")
+            self._start_monitor(self.complete_sell_transaction)
+        
+        if self.status_update_callback:
+            self.status_update_callback("Bot önceki pozisyondan devam ediyor")
+        return True
+    
+    def _start_monitor(self, target, *args):
+        self.monitoring_thread = threading.Thread(target=target, args=args, daemon=True)
+        self.monitoring_thread.start()
+    
     def start_trading(self, coin_symbol: str, target_percentage: float, trade_amount: float):
         """
         Trading'i başlatır - Düzeltilmiş strateji: Alış emrinin gerçekleşmesini bekle sonra satış emri aç
@@ -930,9 +1437,24 @@ class BTCTurkTradingBot:
         self.target_profit_percentage = target_percentage
         self.amount_to_trade = trade_amount
         self.is_running = True
+        self._stop_event.clear()
+        
+        if self.market_stream:
+            self.market_stream.subscribe_ticker(coin_symbol, self._on_stream_ticker)
+            self.order_book_manager.subscribe(coin_symbol)
+        
+        if self._poll_symbol != coin_symbol:
+            if self._poll_symbol:
+                self.poll_scheduler.unregister(self._poll_symbol)
+            self.poll_scheduler.register(coin_symbol)
+            self._poll_symbol = coin_symbol
         
         logger.info(f"Trading başlatıldı: {coin_symbol} - Hedef: %{target_percentage} - Miktar: {trade_amount} TRY")
         
+        # Önceki çalıştırmadan kalan açık pozisyon varsa yeni alım yapmadan devam et
+        if self.resume_from_state(coin_symbol):
+            return
+        
         # İlk alım işlemi
         if self.place_buy_order(coin_symbol, trade_amount):
             logger.info("Alım emri verildi, gerçekleşmesi bekleniyor...")
@@ -955,11 +1477,40 @@ class BTCTurkTradingBot:
         Trading'i durdurur
         """
         self.is_running = False
+        self._stop_event.set()
+        self._finish_order_trace(STATUS_ABANDONED)
+        if self.selected_coin:
+            try:
+                self.state_store.snapshot(self.selected_coin)
+            except Exception as e:
+                logger.error(f"Bot durumu kaydedilemedi: {e}")
+        if self.market_stream and self.selected_coin:
+            self.market_stream.remove_callbacks(self.selected_coin, self._on_stream_ticker)
+        self._price_update_event.set()
+        if self._poll_symbol:
+            self.poll_scheduler.unregister(self._poll_symbol)
+            self._poll_symbol = None
         logger.info("Trading durduruldu")
         
         if self.status_update_callback:
             self.status_update_callback("Bot durduruldu")
     
+    def join(self, timeout: float = 2.0) -> bool:
+        """
+        Takip thread'inin bitmesini bekler
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+            
+        Returns:
+            bool: Thread bittiyse True
+        """
+        thread = self.monitoring_thread
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(timeout=timeout)
+        return not thread.is_alive()
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Bot durumunu döndürür
@@ -976,7 +1527,12 @@ class BTCTurkTradingBot:
             'current_profit': self.calculate_profit_percentage(),
             'is_position_open': self.is_position_open,
             'trade_amount': self.amount_to_trade,
-            'coin_quantity': self.coin_quantity
+            'coin_quantity': self.coin_quantity,
+            'ticks_processed': self.ticks_processed,
+            'last_tick_at': self.last_tick_at,
+            'order_counts': dict(self.order_counts),
+            'realized_pnl': self.realized_pnl,
+            'unrealized_pnl': self.get_unrealized_pnl()
         }
 
 if __name__ == "__main__":
@@ -3,24 +3,30 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from loguru import logger
 import statistics
+from candle_aggregator import CandleAggregator
 
 class TradingStrategy:
     """
     Alım-satım stratejilerini yöneten sınıf
     """
     
-    def __init__(self):
+    def __init__(self, symbol: str = "DEFAULT"):
+        self.symbol = symbol
         self.price_history = []
         self.trade_history = []
         self.min_price_points = 10  # Minimum fiyat noktası sayısı
         
-    def add_price_point(self, price: float, timestamp: datetime = None):
+        # Tick'lerden artımlı üretilen çoklu zaman dilimli mumlar
+        self.candle_aggregator = CandleAggregator()
+        
+    def add_price_point(self, price: float, timestamp: datetime = None, volume: float = 0.0):
         """
         Yeni fiyat noktası ekler
         
         Args:
             price: Fiyat değeri
             timestamp: Zaman damgası
+            volume: İşlem miktarı (trade akışından geliyorsa)
         """
         if timestamp is None:
             timestamp = datetime.now()
@@ -29,6 +35,7 @@ class TradingStrategy:
             'price': price,
             'timestamp': timestamp
         })
+        self.candle_aggregator.add_tick(self.symbol, price, volume, timestamp.timestamp())
         
         # Son 1000 kayıdı tut
         if len(self.price_history) > 1000:
@@ -89,6 +96,44 @@ class TradingStrategy:
         recent_prices = [point['price'] for point in self.price_history[-periods:]]
         return statistics.mean(recent_prices)
     
+    def get_candles(self, timeframe: str = '1m', count: int = None) -> List[Dict[str, float]]:
+        """
+        Belirtilen zaman dilimindeki OHLCV mumlarını döndürür
+        
+        Args:
+            timeframe: Zaman dilimi ('1s', '1m', '5m', '15m', '1h')
+            count: Son kaç mum (verilmezse tamamı)
+            
+        Returns:
+            list: Eskiden yeniye mum listesi
+        """
+        return self.candle_aggregator.get_candles(self.symbol, timeframe, count)
+    
+    def get_candle_closes(self, timeframe: str = '1m', count: int = None):
+        """
+        Mum kapanış fiyatlarını numpy dizisi olarak döndürür
+        """
+        series = self.candle_aggregator.get_series(self.symbol, timeframe)
+        if series is None:
+            return []
+        return series.column('close', count)
+    
+    def calculate_candle_moving_average(self, timeframe: str = '1m', periods: int = 20) -> float:
+        """
+        Mum kapanışları üzerinden hareketli ortalama hesaplar
+        
+        Args:
+            timeframe: Zaman dilimi
+            periods: Periyot sayısı
+            
+        Returns:
+            float: Hareketli ortalama, yeterli mum yoksa 0.0
+        """
+        closes = self.get_candle_closes(timeframe, periods)
+        if len(closes) < periods:
+            return 0.0
+        return float(closes.mean())
+    
     def get_volatility(self, minutes: int = 10) -> float:
         """
         Fiyat volatilitesini hesaplar
@@ -295,6 +340,7 @@ class TradingStrategy:
         """
         self.price_history.clear()
         self.trade_history.clear()
+        self.candle_aggregator.reset()
         logger.info("Strateji geçmişi temizlendi")
 
 class RiskManager: